@@ -0,0 +1,111 @@
+"""
+Ring buffer carrying audio from its source (a PyAudio callback thread or client
+frames) to the Speechmatics recognizer; shared by stt_service and session_engine.
+"""
+import asyncio
+import threading
+
+# Audio the recognizer may fall behind by (e.g. while its connection opens) before frames are dropped
+AUDIO_BUFFER_SECONDS = 10
+
+
+def _wake_reader(waiter):
+    if not waiter.done():
+        waiter.set_result(None)
+
+
+class AudioProcessor:
+    """
+    Fixed-capacity ring buffer between the audio source (PyAudio callback thread
+    or client frames) and the recognizer, which reads fixed-size chunks.
+    The reader sleeps until a full chunk is buffered and the writer wakes it;
+    chunks are memoryviews into the ring, valid until the next read. Audio that
+    arrives while the ring is full is dropped whole and counted as an overrun.
+    """
+
+    def __init__(self, capacity=16000 * 4 * AUDIO_BUFFER_SECONDS):
+        self.capacity = capacity
+        self._buffer = bytearray(capacity)
+        self._view = memoryview(self._buffer)
+        self._scratch = bytearray()  # a chunk that wraps past the end of the ring is copied here
+        self._written = 0  # total bytes accepted
+        self._read = 0     # total bytes handed to the reader
+        self._held = 0     # start of the chunk the reader may still be using
+        self._lock = threading.Lock()
+        self._waiter = None
+        self._want = 0
+        self.finished = False
+        self.overruns = 0
+        self.dropped_bytes = 0
+        self.peak_fill = 0
+
+    def finish(self):
+        with self._lock:
+            self.finished = True
+            self._wake()
+
+    def _wake(self):
+        # Lock held. The reader's loop may live on another thread (microphone mode)
+        waiter, self._waiter = self._waiter, None
+        if waiter is not None:
+            waiter.get_loop().call_soon_threadsafe(_wake_reader, waiter)
+
+    async def read(self, chunk_size):
+        while True:
+            with self._lock:
+                available = self._written - self._read
+                if available >= chunk_size or (self.finished and available):
+                    size = min(chunk_size, available)
+                    start = self._read % self.capacity
+                    self._held = self._read
+                    self._read += size
+                    break
+                if self.finished:
+                    return b""  # Signal end-of-audio
+                self._want = chunk_size
+                self._waiter = waiter = asyncio.get_running_loop().create_future()
+            await waiter
+
+        end = start + size
+        if end <= self.capacity:
+            return self._view[start:end]
+        first = self.capacity - start
+        if len(self._scratch) < size:
+            self._scratch = bytearray(size)
+        self._scratch[:first] = self._view[start:]
+        self._scratch[first:size] = self._view[:size - first]
+        return memoryview(self._scratch)[:size]
+
+    def write_audio(self, data):
+        """Copy `data` into the ring; returns False if it was dropped because the reader has fallen behind."""
+        data = memoryview(data).cast("B")
+        size = len(data)
+        with self._lock:
+            if size > self.capacity - (self._written - self._held):
+                # Whole frames only, so the stream never loses sample alignment
+                self.overruns += 1
+                self.dropped_bytes += size
+                if self.overruns == 1 or self.overruns % 100 == 0:
+                    print(f"⚠️ Audio buffer full: {self.overruns} overrun(s), {self.dropped_bytes} bytes dropped")
+                return False
+
+            start = self._written % self.capacity
+            first = min(size, self.capacity - start)
+            self._view[start:start + first] = data[:first]
+            if first < size:
+                self._view[:size - first] = data[first:]
+            self._written += size
+            self.peak_fill = max(self.peak_fill, self._written - self._read)
+            if self._waiter is not None and (self._written - self._read) >= self._want:
+                self._wake()
+        return True
+
+    def stats(self):
+        with self._lock:
+            return {
+                "capacity": self.capacity,
+                "buffered": self._written - self._read,
+                "peak_fill": self.peak_fill,
+                "overruns": self.overruns,
+                "dropped_bytes": self.dropped_bytes,
+            }
@@ -0,0 +1,206 @@
+"""
+Deadlines, hedging, jittered retries and a circuit breaker for upstream LLM
+calls. Stdlib only; shared by the follow-up, moderation and report services
+(each service's app package puts backend/ on the import path).
+"""
+import asyncio
+import logging
+import random
+import time
+from collections import deque
+
+
+class CircuitOpenError(Exception):
+    """Raised without calling upstream while the breaker is open; callers switch to their local fallback."""
+
+
+class LatencyTracker:
+    def __init__(self, window=200, min_samples=20):
+        self._samples = deque(maxlen=window)
+        self.min_samples = min_samples
+
+    def add(self, seconds):
+        self._samples.append(seconds)
+
+    def p95(self):
+        if len(self._samples) < self.min_samples:
+            return None
+        ordered = sorted(self._samples)
+        return ordered[min(len(ordered) - 1, len(ordered) * 95 // 100)]
+
+
+class CircuitBreaker:
+    """
+    Trips open when at least `failure_rate` of the last `window` calls (and at
+    least `min_calls`) failed or took longer than `slow_call`. After `cooldown`
+    seconds one probe call is let through; its outcome closes or reopens it.
+    """
+
+    def __init__(self, failure_rate=0.5, min_calls=10, window=50, slow_call=10.0, cooldown=30.0):
+        self.failure_rate = failure_rate
+        self.min_calls = min_calls
+        self.slow_call = slow_call
+        self.cooldown = cooldown
+        self._outcomes = deque(maxlen=window)  # True = bad call
+        self.state = "closed"
+        self._opened_at = 0.0
+        self._probing = False
+        self.trips = 0
+        self.rejected = 0
+
+    def allow(self):
+        if self.state == "open":
+            if time.monotonic() - self._opened_at < self.cooldown:
+                self.rejected += 1
+                return False
+            self.state = "half_open"
+        if self.state == "half_open":
+            if self._probing:
+                self.rejected += 1
+                return False
+            self._probing = True
+        return True
+
+    def release(self):
+        """Call was abandoned by its caller: free the probe slot without judging upstream."""
+        self._probing = False
+
+    def record(self, ok, seconds=0.0):
+        bad = not ok or seconds > self.slow_call
+        if self.state == "half_open":
+            self._probing = False
+            if bad:
+                self._open()
+            else:
+                self.state = "closed"
+                self._outcomes.clear()
+            return
+        self._outcomes.append(bad)
+        if len(self._outcomes) >= self.min_calls and sum(self._outcomes) / len(self._outcomes) >= self.failure_rate:
+            self._open()
+
+    def _open(self):
+        if self.state != "open":
+            self.trips += 1
+            logging.warning(f"Circuit breaker opened ({self.trips} trip(s)); rejecting calls for {self.cooldown}s")
+        self.state = "open"
+        self._opened_at = time.monotonic()
+        self._outcomes.clear()
+
+
+class ResilientCaller:
+    """
+    Wraps one kind of upstream call. Every call gets an overall `deadline`;
+    inside it, a duplicate request is fired if the first has not answered by
+    the recent p95 latency (first success wins), and failed attempts are retried
+    up to `retries` times with jittered exponential backoff. With
+    `retry_timeouts` off, an attempt that raised TimeoutError is not retried:
+    for attempts that cannot be cancelled (blocking calls in a thread), a retry
+    would run next to the one still going.
+    """
+
+    def __init__(self, name, deadline=15.0, retries=1, backoff=0.25, hedge=True, hedge_delay=2.0,
+                 min_hedge_delay=0.3, breaker=None, retry_timeouts=True):
+        self.name = name
+        self.deadline = deadline
+        self.retries = retries
+        self.retry_timeouts = retry_timeouts
+        self.backoff = backoff
+        self.hedge = hedge
+        self.hedge_delay = hedge_delay  # used until enough latencies are known for a p95
+        self.min_hedge_delay = min_hedge_delay
+        self.breaker = breaker or CircuitBreaker(slow_call=deadline * 0.8)
+        self.latency = LatencyTracker()
+        self.calls = 0
+        self.failures = 0
+        self.retried = 0
+        self.hedges = 0
+        self.hedge_wins = 0
+
+    async def call(self, make_call):
+        """`make_call` returns a fresh awaitable per attempt, e.g. lambda: client.aio.models.generate_content(...)."""
+        if not self.breaker.allow():
+            raise CircuitOpenError(f"{self.name}: circuit open")
+        self.calls += 1
+        start = time.monotonic()
+        try:
+            async with asyncio.timeout(self.deadline):
+                result = await self._with_retries(make_call)
+        except Exception:
+            self.failures += 1
+            self.breaker.record(False)
+            raise
+        except asyncio.CancelledError:
+            self.breaker.release()  # caller went away; says nothing about upstream health
+            raise
+        elapsed = time.monotonic() - start
+        self.latency.add(elapsed)
+        self.breaker.record(True, elapsed)
+        return result
+
+    async def _with_retries(self, make_call):
+        for attempt in range(self.retries + 1):
+            try:
+                return await (self._hedged(make_call) if self.hedge else make_call())
+            except Exception as e:
+                if attempt == self.retries or (isinstance(e, TimeoutError) and not self.retry_timeouts):
+                    raise
+                self.retried += 1
+                delay = self.backoff * (2 ** attempt) * random.uniform(0.5, 1.5)
+                logging.warning(f"{self.name} call failed ({type(e).__name__}: {e}); retry {attempt + 1} in {delay:.2f}s")
+                await asyncio.sleep(delay)
+
+    async def _hedged(self, make_call):
+        primary = asyncio.ensure_future(make_call())
+        tasks = [primary]
+        try:
+            delay = max(self.latency.p95() or self.hedge_delay, self.min_hedge_delay)
+            done, _ = await asyncio.wait(tasks, timeout=delay)
+            if done:
+                return primary.result()
+
+            self.hedges += 1
+            hedge = asyncio.ensure_future(make_call())
+            tasks.append(hedge)
+            pending, error = set(tasks), None
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        if task is hedge:
+                            self.hedge_wins += 1
+                        return task.result()
+                    error = task.exception()
+            raise error
+        finally:
+            # The loser (or both, on deadline or cancellation) is not needed any more
+            for task in tasks:
+                if not task.done():
+                    task.cancel()
+
+    def stats(self):
+        p95 = self.latency.p95()
+        return {
+            "state": self.breaker.state,
+            "calls": self.calls,
+            "failures": self.failures,
+            "retries": self.retried,
+            "rejected": self.breaker.rejected,
+            "trips": self.breaker.trips,
+            "hedges": self.hedges,
+            "hedge_wins": self.hedge_wins,
+            "hedge_win_rate": round(self.hedge_wins / self.hedges, 4) if self.hedges else 0.0,
+            "p95_seconds": round(p95, 3) if p95 is not None else None,
+        }
+
+
+_callers = {}
+
+def get_caller(name, **kwargs) -> ResilientCaller:
+    """Process-wide caller per call kind, so breaker state and latencies are shared."""
+    if name not in _callers:
+        _callers[name] = ResilientCaller(name, **kwargs)
+    return _callers[name]
+
+def resilience_stats():
+    return {name: caller.stats() for name, caller in _callers.items()}
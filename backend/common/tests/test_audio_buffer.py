@@ -0,0 +1,62 @@
+import asyncio
+import threading
+from common.audio_buffer import AudioProcessor
+
+
+def test_chunks_come_out_in_order_across_the_wrap():
+    async def run():
+        buffer = AudioProcessor(capacity=10)
+        out = []
+        for i in range(6):
+            assert buffer.write_audio(bytes([i]) * 4)
+            out.append(bytes(await buffer.read(4)))
+        return out
+
+    assert asyncio.run(run()) == [bytes([i]) * 4 for i in range(6)]
+
+
+def test_reader_sleeps_until_writer_thread_fills_a_chunk():
+    async def run():
+        buffer = AudioProcessor(capacity=64)
+        reading = asyncio.ensure_future(buffer.read(8))
+        await asyncio.sleep(0.01)
+        assert not reading.done()  # half a chunk is not enough
+
+        writer = threading.Thread(target=lambda: (buffer.write_audio(b"a" * 4), buffer.write_audio(b"b" * 4)))
+        writer.start()
+        chunk = await asyncio.wait_for(reading, timeout=1)
+        writer.join()
+        return bytes(chunk)
+
+    assert asyncio.run(run()) == b"aaaabbbb"
+
+
+def test_full_ring_drops_whole_frames():
+    async def run():
+        buffer = AudioProcessor(capacity=8)
+        assert buffer.write_audio(b"a" * 6)
+        assert not buffer.write_audio(b"b" * 4)  # would overwrite unread audio
+        first = bytes(await buffer.read(4))
+        # The chunk just read stays reserved until the next read
+        assert not buffer.write_audio(b"c" * 4)
+        assert buffer.write_audio(b"c" * 2)
+        buffer.finish()
+        rest = bytes(await buffer.read(8))
+        return first, rest, buffer.stats()
+
+    first, rest, stats = asyncio.run(run())
+    assert (first, rest) == (b"aaaa", b"aacc")
+    assert stats["overruns"] == 2 and stats["dropped_bytes"] == 8
+    assert stats["peak_fill"] == 6
+
+
+def test_finish_returns_the_tail_then_end_of_audio():
+    async def run():
+        buffer = AudioProcessor(capacity=16)
+        buffer.write_audio(b"xyz")
+        waiting = asyncio.ensure_future(buffer.read(8))
+        await asyncio.sleep(0)
+        buffer.finish()
+        return bytes(await waiting), await buffer.read(8)
+
+    assert asyncio.run(run()) == (b"xyz", b"")
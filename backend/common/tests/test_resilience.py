@@ -0,0 +1,126 @@
+"""
+Run from backend/:
+    python -m pytest common/tests
+"""
+import asyncio
+import time
+import pytest
+from common.resilience import CircuitBreaker, CircuitOpenError, ResilientCaller
+
+
+def test_breaker_opens_on_failure_rate_and_probes_after_cooldown():
+    breaker = CircuitBreaker(failure_rate=0.5, min_calls=4, cooldown=0.05)
+    for ok in (True, False, True, False):
+        assert breaker.allow()
+        breaker.record(ok)
+    assert breaker.state == "open" and breaker.trips == 1
+    assert not breaker.allow()
+
+    time.sleep(0.06)
+    assert breaker.allow()          # the single probe
+    assert not breaker.allow()      # nothing else while it runs
+    breaker.record(True, 0.1)
+    assert breaker.state == "closed"
+    assert breaker.allow()
+
+
+def test_breaker_failed_probe_reopens_and_slow_calls_count_as_bad():
+    breaker = CircuitBreaker(failure_rate=0.5, min_calls=2, slow_call=1.0, cooldown=0.05)
+    breaker.record(True, 5.0)
+    breaker.record(True, 5.0)
+    assert breaker.state == "open"
+
+    time.sleep(0.06)
+    assert breaker.allow()
+    breaker.record(False)
+    assert breaker.state == "open" and breaker.trips == 2
+
+
+def test_breaker_release_frees_the_probe():
+    breaker = CircuitBreaker(failure_rate=0.5, min_calls=1, cooldown=0.0)
+    breaker.record(False)
+    assert breaker.allow()
+    breaker.release()
+    assert breaker.allow()
+
+
+class Flaky:
+    """Fails the first `failures` attempts with `error`, then returns 'ok' after `delay` seconds."""
+
+    def __init__(self, failures=0, error=ValueError, delay=0.0):
+        self.failures = failures
+        self.error = error
+        self.delay = delay
+        self.attempts = 0
+
+    async def __call__(self):
+        self.attempts += 1
+        if self.attempts <= self.failures:
+            raise self.error("upstream failed")
+        await asyncio.sleep(self.delay)
+        return "ok"
+
+
+def caller(**kwargs):
+    kwargs.setdefault("backoff", 0.001)
+    kwargs.setdefault("hedge", False)
+    return ResilientCaller("test", **kwargs)
+
+
+def test_retries_then_succeeds():
+    call = caller(retries=2)
+    upstream = Flaky(failures=2)
+    assert asyncio.run(call.call(upstream)) == "ok"
+    assert upstream.attempts == 3
+    assert call.stats()["retries"] == 2 and call.stats()["failures"] == 0
+
+
+def test_gives_up_after_retries():
+    call = caller(retries=1)
+    upstream = Flaky(failures=5)
+    with pytest.raises(ValueError):
+        asyncio.run(call.call(upstream))
+    assert upstream.attempts == 2
+    assert call.stats()["failures"] == 1
+
+
+def test_timeouts_not_retried_when_disabled():
+    call = caller(retries=2, retry_timeouts=False)
+    upstream = Flaky(failures=5, error=TimeoutError)
+    with pytest.raises(TimeoutError):
+        asyncio.run(call.call(upstream))
+    assert upstream.attempts == 1
+
+
+def test_deadline_covers_all_attempts():
+    call = caller(deadline=0.05, retries=3)
+    upstream = Flaky(delay=1.0)
+    start = time.monotonic()
+    with pytest.raises(TimeoutError):
+        asyncio.run(call.call(upstream))
+    assert time.monotonic() - start < 0.5
+    assert upstream.attempts == 1
+
+
+def test_hedge_fires_after_delay_and_first_success_wins():
+    call = caller(hedge=True, hedge_delay=0.02, min_hedge_delay=0.01)
+    delays = iter([1.0, 0.0])
+
+    async def upstream():
+        await asyncio.sleep(next(delays))
+        return "ok"
+
+    start = time.monotonic()
+    assert asyncio.run(call.call(upstream)) == "ok"
+    assert time.monotonic() - start < 0.5
+    assert call.stats()["hedges"] == 1 and call.stats()["hedge_wins"] == 1
+
+
+def test_open_circuit_rejects_without_calling_upstream():
+    call = caller(retries=0, breaker=CircuitBreaker(failure_rate=0.5, min_calls=1, cooldown=60))
+    with pytest.raises(ValueError):
+        asyncio.run(call.call(Flaky(failures=1)))
+    upstream = Flaky()
+    with pytest.raises(CircuitOpenError):
+        asyncio.run(call.call(upstream))
+    assert upstream.attempts == 0
@@ -1,50 +1,135 @@
+from contextlib import contextmanager
 from fastapi import APIRouter, HTTPException
 from fastapi.responses import StreamingResponse
-from app.schemas.requests import FollowupRequest, ShouldGenerateRequest
-from app.db.session_memory import SessionMemoryManager
+from app.schemas.requests import FollowupRequest, ShouldGenerateRequest, NextTurnRequest, RecordTurnRequest
+from app.schemas.responses import NextTurnResponse
+from app.db.memory_store import create_session_memory_store
+from app.db.session_memory import with_turn
 from app.services.followup_generator import FollowupGenerator
 from app.services.followup_decider import FollowupDecider
+from app.services.next_turn_planner import NextTurnPlanner
+from app.services.history_compactor import HistoryCompactor, prompt_token_stats
+from app.services.clients.cached_client import llm_cache
+from common.resilience import CircuitOpenError, resilience_stats
 
 router = APIRouter()
-memory_manager = SessionMemoryManager()
+memory_manager = create_session_memory_store()
 generator = FollowupGenerator()
 decider = FollowupDecider()
+planner = NextTurnPlanner(model=decider.model)
+compactor = HistoryCompactor()
 
-@router.post("/generate-followup")
-async def generate_followup(data: FollowupRequest):
+@contextmanager
+def _llm_errors():
+    """Maps a failed LLM call to the HTTP status the session engine acts on."""
     try:
-        session_id, principle, question, user_input = data.session_id, data.principle, data.question, data.user_input
-
-        if not memory_manager.has_session(session_id, principle):
-            memory_manager.start_lp(session_id, principle, question, user_input)
-        else:
-            memory_manager.add_followup(session_id, principle, question, user_input)
-
-        history = memory_manager.get_history(session_id, principle)
-        stream = generator.generate(principle, history)
-        # return StreamingResponse(stream, media_type="text/plain")
-        return {"followup": stream}
-
+        yield
+    except CircuitOpenError as e:
+        # Fail fast so the session engine serves its local fallback
+        raise HTTPException(status_code=503, detail=str(e))
+    except TimeoutError:
+        raise HTTPException(status_code=504, detail="LLM call timed out")
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+async def _history(data):
+    """
+    Compacted history ending with this request's turn. The turn is stored only
+    when `data.record` is set; speculative requests on a partial answer see it
+    without storing it, so a run that is later dropped leaves no trace.
+    """
+    if data.record:
+        await memory_manager.record_turn_async(data.session_id, data.principle, data.question, data.user_input)
+        history = await memory_manager.get_history_async(data.session_id, data.principle)
+    else:
+        history = with_turn(await memory_manager.get_history_async(data.session_id, data.principle), data.question, data.user_input)
+    return await compactor.compact(data.session_id, data.principle, history)
+
+@router.post("/generate-followup")
+async def generate_followup(data: FollowupRequest):
+    with _llm_errors():
+        principle = data.principle
+        history = await _history(data)
+        if data.stream:
+            # Chunks are forwarded as Gemini produces them
+            return StreamingResponse(generator.stream(principle, history.turns, history.summary), media_type="text/plain")
+        return {"followup": await generator.generate(principle, history.turns, history.summary)}
+
 @router.post("/should-followup")
 async def should_followup(data: ShouldGenerateRequest):
-    try:
-        if not memory_manager.has_session(data.session_id, data.principle):
-            memory_manager.start_lp(data.session_id, data.principle, data.question, data.user_input)
-        else:
-            memory_manager.add_followup(data.session_id, data.principle, data.question, data.user_input)
-
-        history = memory_manager.get_history(data.session_id, data.principle)
-        result = decider.decide(
+    with _llm_errors():
+        history = await _history(data)
+        result = await decider.decide(
             data.principle,
             data.time_remaining,
             data.num_lp_questions,
-            history,
+            history.turns,
             data.time_spent,
-            data.num_followups
+            data.num_followups,
+            summary=history.summary
         )
         return {"followup": result}
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+
+@router.post("/next-turn", response_model=NextTurnResponse)
+async def next_turn(data: NextTurnRequest):
+    """
+    Record the turn once (unless record=false), then decide and (if needed) generate the follow-up in a single LLM call.
+    With stream=true the decision is made first (locally when confident) and the
+    follow-up is streamed as text/plain only when one is wanted; otherwise the
+    response is JSON with followup=false.
+    """
+    with _llm_errors():
+        history = await _history(data)
+        if data.stream:
+            wanted = await decider.decide(
+                data.principle,
+                data.time_remaining,
+                data.num_lp_questions,
+                history.turns,
+                data.time_spent,
+                data.num_followups,
+                summary=history.summary
+            )
+            if not wanted:
+                return NextTurnResponse(followup=False)
+            return StreamingResponse(generator.stream(data.principle, history.turns, history.summary), media_type="text/plain")
+        return await planner.plan(
+            data.principle,
+            data.time_remaining,
+            data.num_lp_questions,
+            history.turns,
+            data.time_spent,
+            data.num_followups,
+            summary=history.summary
+        )
+
+@router.post("/record-turn")
+async def record_turn(data: RecordTurnRequest):
+    """Store a turn whose follow-up was already worked out speculatively (record=false) on the same answer."""
+    await memory_manager.record_turn_async(data.session_id, data.principle, data.question, data.user_input)
+    return {"recorded": True}
+
+@router.get("/memory/stats")
+async def memory_stats():
+    """Live sessions/bytes held in conversation memory and eviction counters."""
+    return memory_manager.stats()
+
+@router.get("/prompt/stats")
+async def prompt_stats():
+    """Estimated prompt tokens per LLM call kind (last, p50, p95, max over recent calls)."""
+    return prompt_token_stats.snapshot()
+
+@router.get("/llm-cache/stats")
+async def llm_cache_stats():
+    """Hit/miss/coalesced counts of the shared LLM response cache."""
+    return llm_cache.stats()
+
+@router.get("/decider/stats")
+async def decider_stats():
+    """How many follow-up decisions were made locally vs by the LLM (next_turn: the non-streamed /next-turn)."""
+    return {**decider.stats(), "next_turn": planner.stats()}
+
+@router.get("/resilience/stats")
+async def llm_resilience_stats():
+    """Circuit breaker state, retries, hedges and hedge win rate per LLM call kind."""
+    return resilience_stats()
@@ -6,4 +6,43 @@ load_dotenv()
 class Settings:
     GEMINI_API_KEY: str = os.getenv("GEMINI_API_KEY")
 
-settings = Settings()
\ No newline at end of file
+    # Session memory bounds
+    MEMORY_IDLE_TTL_SECONDS: float = float(os.getenv("MEMORY_IDLE_TTL_SECONDS", "3600"))
+    MEMORY_MAX_SESSIONS: int = int(os.getenv("MEMORY_MAX_SESSIONS", "10000"))
+    MEMORY_MAX_BYTES_PER_SESSION: int = int(os.getenv("MEMORY_MAX_BYTES_PER_SESSION", "65536"))
+
+    # Session memory storage: "memory" (single worker), "sqlite" (workers on one host) or "redis"
+    MEMORY_BACKEND: str = os.getenv("MEMORY_BACKEND", "memory")
+    MEMORY_SQLITE_PATH: str = os.getenv("MEMORY_SQLITE_PATH", "session_memory.db")
+    MEMORY_REDIS_URL: str = os.getenv("MEMORY_REDIS_URL", "redis://localhost:6379/1")
+
+    # Prompt history compaction (token counts are estimates, ~4 characters per token)
+    HISTORY_TOKEN_BUDGET: int = int(os.getenv("HISTORY_TOKEN_BUDGET", "1200"))
+    HISTORY_KEEP_TURNS: int = int(os.getenv("HISTORY_KEEP_TURNS", "3"))
+    HISTORY_SUMMARY_TOKENS: int = int(os.getenv("HISTORY_SUMMARY_TOKENS", "250"))
+    HISTORY_SUMMARY_CACHE_SIZE: int = int(os.getenv("HISTORY_SUMMARY_CACHE_SIZE", "10000"))
+
+    # Gemini calls: in-flight limit per worker and per-call timeout
+    LLM_MAX_CONCURRENCY: int = int(os.getenv("LLM_MAX_CONCURRENCY", "32"))
+    LLM_TIMEOUT_SECONDS: float = float(os.getenv("LLM_TIMEOUT_SECONDS", "15"))
+
+    # Resilience for Gemini calls: retries and hedging run inside LLM_TIMEOUT_SECONDS
+    LLM_RETRIES: int = int(os.getenv("LLM_RETRIES", "1"))
+    LLM_HEDGE: bool = os.getenv("LLM_HEDGE", "true").lower() == "true"
+    LLM_HEDGE_DELAY: float = float(os.getenv("LLM_HEDGE_DELAY", "2.0"))  # until a p95 is known
+    BREAKER_FAILURE_RATE: float = float(os.getenv("BREAKER_FAILURE_RATE", "0.5"))
+    BREAKER_MIN_CALLS: int = int(os.getenv("BREAKER_MIN_CALLS", "10"))
+    BREAKER_COOLDOWN_SECONDS: float = float(os.getenv("BREAKER_COOLDOWN_SECONDS", "30"))
+
+    # LLM response cache; LLM_CACHE_PATH set to a file also persists entries locally
+    LLM_CACHE_TTL_SECONDS: float = float(os.getenv("LLM_CACHE_TTL_SECONDS", "600"))
+    LLM_CACHE_MAX_ENTRIES: int = int(os.getenv("LLM_CACHE_MAX_ENTRIES", "5000"))
+    LLM_CACHE_PATH: str = os.getenv("LLM_CACHE_PATH", "")
+
+    # Local follow-up decider: probabilities between LOW and HIGH go to the LLM
+    DECIDER_LOW: float = float(os.getenv("DECIDER_LOW", "0.2"))
+    DECIDER_HIGH: float = float(os.getenv("DECIDER_HIGH", "0.8"))
+    DECIDER_WEIGHTS_PATH: str = os.getenv("DECIDER_WEIGHTS_PATH", "")
+    DECIDER_LOG_PATH: str = os.getenv("DECIDER_LOG_PATH", "")
+
+settings = Settings()
@@ -0,0 +1,235 @@
+import asyncio
+import json
+import sqlite3
+import time
+from abc import ABC, abstractmethod
+from contextlib import contextmanager
+from typing import List
+from app.core.config import settings
+from app.db.session_memory import SessionMemoryManager, Turn
+
+
+class SessionMemoryStore(ABC):
+    """
+    Storage for per-(session, principle) interview history. Shared backends let
+    any worker serve any request of a session, so the follow-up engine can run
+    with several workers and no sticky routing.
+    """
+
+    @abstractmethod
+    def record_turn(self, session_id: str, principle: str, question: str, user_input: str) -> None:
+        """Atomically append a turn, or replace the answer if `question` is already the last turn."""
+
+    @abstractmethod
+    def get_history(self, session_id: str, principle: str) -> List[Turn]:
+        """Full history for the (session, principle) pair, read in one operation."""
+
+    @abstractmethod
+    def stats(self) -> dict:
+        """Counters for the /memory/stats route."""
+
+    async def record_turn_async(self, session_id: str, principle: str, question: str, user_input: str) -> None:
+        """record_turn on a worker thread, so blocking storage I/O does not stall the event loop."""
+        await asyncio.to_thread(self.record_turn, session_id, principle, question, user_input)
+
+    async def get_history_async(self, session_id: str, principle: str) -> List[Turn]:
+        return await asyncio.to_thread(self.get_history, session_id, principle)
+
+
+class InMemorySessionMemoryStore(SessionMemoryManager, SessionMemoryStore):
+    """Per-process memory; only correct with one worker."""
+
+    # No I/O, and the manager is not thread-safe: stay on the event loop
+    async def record_turn_async(self, session_id, principle, question, user_input):
+        self.record_turn(session_id, principle, question, user_input)
+
+    async def get_history_async(self, session_id, principle):
+        return self.get_history(session_id, principle)
+
+
+class SQLiteSessionMemoryStore(SessionMemoryStore):
+    """History shared by workers on one host through a SQLite file."""
+
+    def __init__(self, path: str = settings.MEMORY_SQLITE_PATH, idle_ttl=settings.MEMORY_IDLE_TTL_SECONDS,
+                 max_sessions=settings.MEMORY_MAX_SESSIONS, max_bytes_per_session=settings.MEMORY_MAX_BYTES_PER_SESSION):
+        self.path = path
+        self.idle_ttl = idle_ttl
+        self.max_sessions = max_sessions
+        self.max_bytes_per_session = max_bytes_per_session
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("CREATE TABLE IF NOT EXISTS sessions (session_id TEXT PRIMARY KEY, last_access REAL NOT NULL)")
+            conn.execute("CREATE INDEX IF NOT EXISTS sessions_last_access ON sessions (last_access)")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS turns ("
+                "session_id TEXT NOT NULL, principle TEXT NOT NULL, seq INTEGER NOT NULL, kind TEXT NOT NULL, "
+                "question TEXT NOT NULL, answer TEXT NOT NULL, nbytes INTEGER NOT NULL, "
+                "PRIMARY KEY (session_id, principle, seq))"
+            )
+
+    @contextmanager
+    def _connect(self):
+        conn = sqlite3.connect(self.path, timeout=5, isolation_level=None)
+        try:
+            yield conn
+        finally:
+            conn.close()
+
+    def _evict(self, conn, now):
+        expired = "SELECT session_id FROM sessions WHERE last_access <= ?"
+        conn.execute(f"DELETE FROM turns WHERE session_id IN ({expired})", (now - self.idle_ttl,))
+        conn.execute("DELETE FROM sessions WHERE last_access <= ?", (now - self.idle_ttl,))
+        overflow = "SELECT session_id FROM sessions ORDER BY last_access DESC LIMIT -1 OFFSET ?"
+        conn.execute(f"DELETE FROM turns WHERE session_id IN ({overflow})", (self.max_sessions,))
+        conn.execute(f"DELETE FROM sessions WHERE session_id IN ({overflow})", (self.max_sessions,))
+
+    def _enforce_cap(self, conn, session_id, principle):
+        total, = conn.execute("SELECT COALESCE(SUM(nbytes), 0) FROM turns WHERE session_id = ?", (session_id,)).fetchone()
+        if total <= self.max_bytes_per_session:
+            return
+        # Whole histories of older principles go first, so no follow-up loses its main question
+        others = conn.execute(
+            "SELECT principle, SUM(nbytes) FROM turns WHERE session_id = ? AND principle != ? "
+            "GROUP BY principle ORDER BY MAX(rowid)",
+            (session_id, principle)
+        ).fetchall()
+        for other, nbytes in others:
+            if total <= self.max_bytes_per_session:
+                return
+            conn.execute("DELETE FROM turns WHERE session_id = ? AND principle = ?", (session_id, other))
+            total -= nbytes
+        # Then the oldest follow-ups of the current one, keeping its main question and latest turn
+        followups = conn.execute(
+            "SELECT seq, nbytes FROM turns WHERE session_id = ? AND principle = ? AND kind = 'followup' "
+            "AND seq < (SELECT MAX(seq) FROM turns WHERE session_id = ? AND principle = ?) ORDER BY seq",
+            (session_id, principle, session_id, principle)
+        ).fetchall()
+        for seq, nbytes in followups:
+            if total <= self.max_bytes_per_session:
+                return
+            conn.execute("DELETE FROM turns WHERE session_id = ? AND principle = ? AND seq = ?", (session_id, principle, seq))
+            total -= nbytes
+
+    def record_turn(self, session_id, principle, question, user_input):
+        now = time.time()
+        with self._connect() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            self._evict(conn, now)
+            last = conn.execute(
+                "SELECT seq, question FROM turns WHERE session_id = ? AND principle = ? ORDER BY seq DESC LIMIT 1",
+                (session_id, principle)
+            ).fetchone()
+            nbytes = Turn("", question, user_input).nbytes
+            if last is None:
+                conn.execute("INSERT INTO turns VALUES (?, ?, 0, 'main', ?, ?, ?)", (session_id, principle, question, user_input, nbytes))
+            elif last[1] == question:
+                conn.execute(
+                    "UPDATE turns SET answer = ?, nbytes = ? WHERE session_id = ? AND principle = ? AND seq = ?",
+                    (user_input, nbytes, session_id, principle, last[0])
+                )
+            else:
+                conn.execute(
+                    "INSERT INTO turns VALUES (?, ?, ?, 'followup', ?, ?, ?)",
+                    (session_id, principle, last[0] + 1, question, user_input, nbytes)
+                )
+            conn.execute("INSERT OR REPLACE INTO sessions VALUES (?, ?)", (session_id, now))
+            self._enforce_cap(conn, session_id, principle)
+            conn.execute("COMMIT")
+
+    def get_history(self, session_id, principle):
+        with self._connect() as conn:
+            rows = conn.execute(
+                "SELECT kind, question, answer FROM turns WHERE session_id = ? AND principle = ? "
+                "AND session_id IN (SELECT session_id FROM sessions WHERE last_access > ?) ORDER BY seq",
+                (session_id, principle, time.time() - self.idle_ttl)
+            ).fetchall()
+        return [Turn(*row) for row in rows]
+
+    def stats(self):
+        with self._connect() as conn:
+            live_sessions, = conn.execute(
+                "SELECT COUNT(*) FROM sessions WHERE last_access > ?", (time.time() - self.idle_ttl,)
+            ).fetchone()
+            live_principles, nbytes = conn.execute(
+                "SELECT COUNT(DISTINCT session_id || char(0) || principle), COALESCE(SUM(nbytes), 0) FROM turns"
+            ).fetchone()
+        return {"live_sessions": live_sessions, "live_principles": live_principles, "bytes": nbytes}
+
+
+# Append-or-replace plus byte-cap trimming in one round trip. Turns are JSON
+# arrays [kind, question, answer]; index 1 (the main question) and the latest
+# turn are never trimmed.
+_RECORD_SCRIPT = """
+local key = KEYS[1]
+local question, answer = ARGV[1], ARGV[2]
+local cap, ttl_ms = tonumber(ARGV[3]), tonumber(ARGV[4])
+local last = redis.call('LINDEX', key, -1)
+if not last then
+    redis.call('RPUSH', key, cjson.encode({'main', question, answer}))
+else
+    local turn = cjson.decode(last)
+    if turn[2] == question then
+        redis.call('LSET', key, -1, cjson.encode({turn[1], question, answer}))
+    else
+        redis.call('RPUSH', key, cjson.encode({'followup', question, answer}))
+    end
+end
+local turns = redis.call('LRANGE', key, 0, -1)
+local total = 0
+for _, raw in ipairs(turns) do
+    local turn = cjson.decode(raw)
+    total = total + #turn[2] + #turn[3]
+end
+for i = 2, #turns - 1 do
+    if total <= cap then break end
+    local turn = cjson.decode(turns[i])
+    if turn[1] == 'followup' then
+        redis.call('LREM', key, 1, turns[i])
+        total = total - #turn[2] - #turn[3]
+    end
+end
+redis.call('PEXPIRE', key, ttl_ms)
+return total
+"""
+
+class RedisSessionMemoryStore(SessionMemoryStore):
+    """
+    History for several hosts, backed by any Redis-protocol store. `client` is a
+    redis.Redis (or a compatible fake such as fakeredis for local runs). Each
+    (session, principle) is one list that expires after `idle_ttl` without
+    writes; the byte cap applies per principle.
+    """
+
+    def __init__(self, client, idle_ttl=settings.MEMORY_IDLE_TTL_SECONDS,
+                 max_bytes_per_session=settings.MEMORY_MAX_BYTES_PER_SESSION, prefix: str = "followup:memory:"):
+        self.client = client
+        self.idle_ttl = idle_ttl
+        self.max_bytes_per_session = max_bytes_per_session
+        self.prefix = prefix
+
+    def _key(self, session_id, principle):
+        return f"{self.prefix}{session_id}:{principle}"
+
+    def record_turn(self, session_id, principle, question, user_input):
+        self.client.eval(
+            _RECORD_SCRIPT, 1, self._key(session_id, principle),
+            question, user_input, self.max_bytes_per_session, int(self.idle_ttl * 1000)
+        )
+
+    def get_history(self, session_id, principle):
+        return [Turn(*json.loads(raw)) for raw in self.client.lrange(self._key(session_id, principle), 0, -1)]
+
+    def stats(self):
+        # Counting keys would need a SCAN over the whole keyspace
+        return {"backend": "redis", "prefix": self.prefix}
+
+
+def create_session_memory_store(backend: str = settings.MEMORY_BACKEND) -> SessionMemoryStore:
+    if backend == "memory":
+        return InMemorySessionMemoryStore()
+    if backend == "sqlite":
+        return SQLiteSessionMemoryStore()
+    if backend == "redis":
+        import redis
+        return RedisSessionMemoryStore(redis.from_url(settings.MEMORY_REDIS_URL))
+    raise ValueError(f"Unknown session memory backend: {backend}")
@@ -1,35 +1,191 @@
-from collections import defaultdict
+import time
+from collections import OrderedDict
+from typing import NamedTuple
+from app.core.config import settings
+
+class Turn(NamedTuple):
+    """One interviewer question and the candidate's answer to it."""
+    kind: str  # "main" or "followup"
+    question: str
+    answer: str
+
+    @property
+    def nbytes(self):
+        return len(self.question.encode()) + len(self.answer.encode())
+
+def with_turn(history, question: str, user_input: str):
+    """`history` as record_turn would leave it, without storing anything (for speculative requests)."""
+    if not history:
+        return [Turn("main", question, user_input)]
+    if history[-1].question == question:
+        return history[:-1] + [history[-1]._replace(answer=user_input)]
+    return history + [Turn("followup", question, user_input)]
 
 class SessionMemory:
+    __slots__ = ("principle", "turns", "nbytes")
+
     def __init__(self, principle: str):
         self.principle = principle
-        self.history = []
+        self.turns = []
+        self.nbytes = 0
+
+    def _append(self, turn: Turn):
+        self.turns.append(turn)
+        self.nbytes += turn.nbytes
 
     def add_main_question(self, question: str, user_response: str):
-        self.history.append({"role": "interviewer", "type": "main", "content": question})
-        self.history.append({"role": "candidate", "content": user_response})
+        self._append(Turn("main", question, user_response))
 
     def add_followup_turn(self, bot_question: str, user_response: str):
-        self.history.append({"role": "interviewer", "type": "followup", "content": bot_question})
-        self.history.append({"role": "candidate", "content": user_response})
+        self._append(Turn("followup", bot_question, user_response))
+
+    def last_question(self):
+        return self.turns[-1].question if self.turns else None
+
+    def replace_last_response(self, user_response: str):
+        old = self.turns[-1]
+        self.turns[-1] = old._replace(answer=user_response)
+        self.nbytes += self.turns[-1].nbytes - old.nbytes
+
+    def drop_oldest_followup(self):
+        """Trim the oldest follow-up, keeping the main question and the latest turn. Returns bytes freed."""
+        for i, turn in enumerate(self.turns[:-1]):
+            if turn.kind == "followup":
+                del self.turns[i]
+                self.nbytes -= turn.nbytes
+                return turn.nbytes
+        return 0
 
     def get_history(self):
-        return self.history
+        return self.turns
+
+class _SessionEntry:
+    __slots__ = ("principles", "last_access", "nbytes")
 
-class SessionMemoryManager:
     def __init__(self):
-        self.sessions = defaultdict(dict)
+        self.principles = OrderedDict()  # principle -> SessionMemory, least recently used first
+        self.last_access = time.monotonic()
+        self.nbytes = 0
+
+class SessionMemoryManager:
+    """
+    In-process session memory with idle-TTL and LRU eviction. Sessions idle
+    for longer than `idle_ttl` are dropped, the least recently used session is
+    dropped beyond `max_sessions`, and each session is trimmed to
+    `max_bytes_per_session` (older principles first, then older follow-ups).
+    """
+
+    def __init__(self, idle_ttl=settings.MEMORY_IDLE_TTL_SECONDS, max_sessions=settings.MEMORY_MAX_SESSIONS,
+                 max_bytes_per_session=settings.MEMORY_MAX_BYTES_PER_SESSION):
+        self.idle_ttl = idle_ttl
+        self.max_sessions = max_sessions
+        self.max_bytes_per_session = max_bytes_per_session
+        self.sessions = OrderedDict()  # session_id -> _SessionEntry, least recently used first
+        self.nbytes = 0
+        self.idle_evictions = 0
+        self.lru_evictions = 0
+        self.trimmed_bytes = 0
+
+    def _evict(self, session_id):
+        entry = self.sessions.pop(session_id)
+        self.nbytes -= entry.nbytes
+
+    def _expire_idle(self):
+        cutoff = time.monotonic() - self.idle_ttl
+        while self.sessions:
+            session_id, entry = next(iter(self.sessions.items()))
+            if entry.last_access > cutoff:
+                break
+            self._evict(session_id)
+            self.idle_evictions += 1
+
+    def _touch(self, session_id, create=False):
+        self._expire_idle()
+        entry = self.sessions.get(session_id)
+        if entry is None:
+            if not create:
+                return None
+            entry = self.sessions[session_id] = _SessionEntry()
+            while len(self.sessions) > self.max_sessions:
+                self._evict(next(iter(self.sessions)))
+                self.lru_evictions += 1
+        self.sessions.move_to_end(session_id)
+        entry.last_access = time.monotonic()
+        return entry
+
+    def _update_size(self, entry, memory, before):
+        delta = memory.nbytes - before
+        entry.nbytes += delta
+        self.nbytes += delta
+        self._enforce_cap(entry, memory)
+
+    def _enforce_cap(self, entry, current):
+        while entry.nbytes > self.max_bytes_per_session:
+            oldest_principle, oldest = next(iter(entry.principles.items()))
+            if oldest is not current:
+                del entry.principles[oldest_principle]
+                freed = oldest.nbytes
+            else:
+                freed = current.drop_oldest_followup()
+                if not freed:
+                    break
+            entry.nbytes -= freed
+            self.nbytes -= freed
+            self.trimmed_bytes += freed
+
+    def _memory(self, session_id, principle, create=False):
+        entry = self._touch(session_id, create=create)
+        if entry is None:
+            return None, None
+        memory = entry.principles.get(principle)
+        if memory is None and create:
+            memory = entry.principles[principle] = SessionMemory(principle)
+        if memory is not None:
+            entry.principles.move_to_end(principle)
+        return entry, memory
 
     def has_session(self, session_id: str, principle: str):
-        return principle in self.sessions[session_id]
+        return self._memory(session_id, principle)[1] is not None
 
     def start_lp(self, session_id: str, principle: str, question: str, user_input: str):
-        if principle not in self.sessions[session_id]:
-            self.sessions[session_id][principle] = SessionMemory(principle)
-        self.sessions[session_id][principle].add_main_question(question, user_input)
+        entry, memory = self._memory(session_id, principle, create=True)
+        before = memory.nbytes
+        memory.add_main_question(question, user_input)
+        self._update_size(entry, memory, before)
 
     def add_followup(self, session_id: str, principle: str, bot_question: str, user_input: str):
-        self.sessions[session_id][principle].add_followup_turn(bot_question, user_input)
+        entry, memory = self._memory(session_id, principle, create=True)
+        before = memory.nbytes
+        memory.add_followup_turn(bot_question, user_input)
+        self._update_size(entry, memory, before)
+
+    def record_turn(self, session_id: str, principle: str, question: str, user_input: str):
+        """
+        Record a turn exactly once. A repeated call for the question that is
+        already last in history (retries, or decide + generate for the same
+        answer) replaces the candidate response instead of appending it again.
+        """
+        entry, memory = self._memory(session_id, principle, create=True)
+        before = memory.nbytes
+        if not memory.turns:
+            memory.add_main_question(question, user_input)
+        elif memory.last_question() == question:
+            memory.replace_last_response(user_input)
+        else:
+            memory.add_followup_turn(question, user_input)
+        self._update_size(entry, memory, before)
 
     def get_history(self, session_id: str, principle: str):
-        return self.sessions[session_id][principle].get_history()
+        memory = self._memory(session_id, principle)[1]
+        return list(memory.get_history()) if memory is not None else []
+
+    def stats(self):
+        self._expire_idle()
+        return {
+            "live_sessions": len(self.sessions),
+            "live_principles": sum(len(entry.principles) for entry in self.sessions.values()),
+            "bytes": self.nbytes,
+            "idle_evictions": self.idle_evictions,
+            "lru_evictions": self.lru_evictions,
+            "trimmed_bytes": self.trimmed_bytes,
+        }
@@ -5,6 +5,9 @@ class FollowupRequest(BaseModel):
     principle: str
     question: str
     user_input: str
+    stream: bool = False
+    # False for speculative calls on a partial answer: the turn is used but not stored
+    record: bool = True
 
 class ShouldGenerateRequest(BaseModel):
     session_id: str
@@ -15,3 +18,22 @@ class ShouldGenerateRequest(BaseModel):
     time_spent: int
     num_followups: int
     num_lp_questions: int
+    record: bool = True
+
+class NextTurnRequest(BaseModel):
+    session_id: str
+    principle: str
+    question: str
+    user_input: str
+    time_remaining: int
+    time_spent: int
+    num_followups: int
+    num_lp_questions: int
+    stream: bool = False
+    record: bool = True
+
+class RecordTurnRequest(BaseModel):
+    session_id: str
+    principle: str
+    question: str
+    user_input: str
@@ -0,0 +1,12 @@
+from pydantic import BaseModel
+
+class NextTurnResponse(BaseModel):
+    followup: bool
+    question: str = ""
+
+class BankFollowup(BaseModel):
+    question: str
+    keywords: list[str]
+
+class FollowupBankEntry(BaseModel):
+    followups: list[BankFollowup]
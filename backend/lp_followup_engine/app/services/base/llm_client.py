@@ -1,12 +1,15 @@
 from abc import ABC, abstractmethod
-from typing import Generator
+from typing import AsyncGenerator
 
 class BaseLLMClient(ABC):
     @abstractmethod
-    # def generate_stream(self, prompt: str) -> Generator[str, None, None]:
-    def generate_stream(self, prompt: str) -> str:
+    def generate_stream(self, prompt: str) -> AsyncGenerator[str, None]:
         pass
 
     @abstractmethod
-    def generate(self, prompt: str) -> str:
-        pass
\ No newline at end of file
+    async def generate(self, prompt: str) -> str:
+        pass
+
+    @abstractmethod
+    async def generate_json(self, prompt: str, schema) -> str:
+        pass
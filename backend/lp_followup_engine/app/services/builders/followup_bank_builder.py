@@ -0,0 +1,9 @@
+from jinja2 import Environment, FileSystemLoader
+from app.services.base.prompt_builder import PromptBuilder
+
+env = Environment(loader=FileSystemLoader("app/services/prompts"))
+
+class FollowupBankBuilder(PromptBuilder):
+    def build(self, principle, question, count):
+        template = env.get_template("followup_bank.j2")
+        return template.render(principle=principle, question=question, count=count)
@@ -4,7 +4,7 @@ from app.services.base.prompt_builder import PromptBuilder
 env = Environment(loader=FileSystemLoader("app/services/prompts"))
 
 class FollowupDecisionBuilder(PromptBuilder):
-    def build(self, principle, time_remaining, num_principles_covered, history, time_spent, num_follow_up):
+    def build(self, principle, time_remaining, num_principles_covered, history, time_spent, num_follow_up, summary=None):
         template = env.get_template("followup_decision.j2")
         return template.render(
             principle=principle,
@@ -12,5 +12,6 @@ class FollowupDecisionBuilder(PromptBuilder):
             num_principles_covered=num_principles_covered,
             num_follow_up=num_follow_up,
             time_spent=time_spent,
-            history=history
+            history=history,
+            summary=summary
         )
@@ -4,6 +4,6 @@ from app.services.base.prompt_builder import PromptBuilder
 env = Environment(loader=FileSystemLoader("app/services/prompts"))
 
 class FollowupQuestionBuilder(PromptBuilder):
-    def build(self, principle, history):
+    def build(self, principle, history, summary=None):
         template = env.get_template("followup_question.j2")
-        return template.render(principle=principle, history=history)
+        return template.render(principle=principle, history=history, summary=summary)
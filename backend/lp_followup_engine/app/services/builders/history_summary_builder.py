@@ -0,0 +1,9 @@
+from jinja2 import Environment, FileSystemLoader
+from app.services.base.prompt_builder import PromptBuilder
+
+env = Environment(loader=FileSystemLoader("app/services/prompts"))
+
+class HistorySummaryBuilder(PromptBuilder):
+    def build(self, principle, summary, turns, max_words):
+        template = env.get_template("history_summary.j2")
+        return template.render(principle=principle, summary=summary, turns=turns, max_words=max_words)
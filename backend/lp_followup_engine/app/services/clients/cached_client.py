@@ -0,0 +1,192 @@
+import asyncio
+import hashlib
+import logging
+import sqlite3
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import AsyncGenerator
+from app.core.config import settings
+from app.services.base.llm_client import BaseLLMClient
+
+
+class LLMResponseCache:
+    """
+    TTL + LRU cache of LLM responses keyed by a hash of (call kind, model,
+    temperature, prompt). With `path` set, entries are also written to a local
+    SQLite file and read back on a memory miss, so they survive restarts.
+    """
+
+    def __init__(self, ttl=settings.LLM_CACHE_TTL_SECONDS, max_entries=settings.LLM_CACHE_MAX_ENTRIES,
+                 path=settings.LLM_CACHE_PATH):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.path = path
+        self._entries = OrderedDict()  # key -> (expires_at, text), least recently used first
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.evictions = 0
+        if self.path:
+            with self._connect() as conn:
+                conn.execute("PRAGMA journal_mode=WAL")
+                conn.execute("CREATE TABLE IF NOT EXISTS llm_cache (key TEXT PRIMARY KEY, text TEXT NOT NULL, expires_at REAL NOT NULL)")
+
+    @staticmethod
+    def key(kind, model, temperature, prompt, extra=""):
+        raw = "\0".join((kind, model, str(temperature), extra, prompt))
+        return hashlib.sha256(raw.encode()).hexdigest()
+
+    @contextmanager
+    def _connect(self):
+        conn = sqlite3.connect(self.path, timeout=5, isolation_level=None)
+        try:
+            yield conn
+        finally:
+            conn.close()
+
+    def _load(self, key):
+        with self._connect() as conn:
+            row = conn.execute("SELECT text, expires_at FROM llm_cache WHERE key = ? AND expires_at > ?", (key, time.time())).fetchone()
+        return row
+
+    def _save(self, key, text, expires_at):
+        with self._connect() as conn:
+            conn.execute("INSERT OR REPLACE INTO llm_cache VALUES (?, ?, ?)", (key, text, expires_at))
+            conn.execute("DELETE FROM llm_cache WHERE expires_at <= ?", (time.time(),))
+
+    def _remember(self, key, text, expires_at):
+        self._entries[key] = (expires_at, text)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    async def get(self, key):
+        entry = self._entries.get(key)
+        if entry and entry[0] <= time.time():
+            del self._entries[key]
+            entry = None
+        if entry is None and self.path:
+            try:
+                row = await asyncio.to_thread(self._load, key)
+            except sqlite3.Error as e:
+                logging.warning(f"LLM cache read failed: {e}")
+                row = None
+            if row:
+                self._remember(key, row[0], row[1])
+                entry = (row[1], row[0])
+        if entry is None:
+            return None
+        self._entries.move_to_end(key)
+        return entry[1]
+
+    async def put(self, key, text):
+        expires_at = time.time() + self.ttl
+        self._remember(key, text, expires_at)
+        if self.path:
+            try:
+                await asyncio.to_thread(self._save, key, text, expires_at)
+            except sqlite3.Error as e:
+                logging.warning(f"LLM cache write failed: {e}")
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "coalesced": self.coalesced,
+            "evictions": self.evictions,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+        }
+
+llm_cache = LLMResponseCache()
+
+
+class CachingLLMClient(BaseLLMClient):
+    """
+    Wraps an LLM client with the shared response cache. Concurrent identical
+    calls are coalesced into one upstream request (single-flight); a waiter
+    being cancelled does not cancel the shared call.
+    """
+
+    _inflight = {}  # key -> asyncio.Future with the response text, shared by all wrappers
+
+    def __init__(self, inner: BaseLLMClient, cache: LLMResponseCache = llm_cache):
+        self.inner = inner
+        self.cache = cache
+
+    def _key(self, kind, prompt, extra=""):
+        return self.cache.key(kind, getattr(self.inner, "model", ""), getattr(self.inner, "temperature", ""), prompt, extra)
+
+    async def _cached(self, key, call):
+        text = await self.cache.get(key)
+        if text is not None:
+            self.cache.hits += 1
+            return text
+
+        inflight = self._inflight.get(key)
+        if inflight is not None:
+            self.cache.coalesced += 1
+            return await asyncio.shield(inflight)
+
+        async def fetch():
+            try:
+                text = await call()
+                await self.cache.put(key, text)
+                return text
+            finally:
+                self._inflight.pop(key, None)
+
+        # Runs as its own task so the result is still cached if this caller goes away
+        self.cache.misses += 1
+        task = self._inflight[key] = asyncio.ensure_future(fetch())
+        return await asyncio.shield(task)
+
+    async def generate(self, prompt: str) -> str:
+        return await self._cached(self._key("generate", prompt), lambda: self.inner.generate(prompt))
+
+    async def generate_json(self, prompt: str, schema) -> str:
+        key = self._key("generate_json", prompt, getattr(schema, "__name__", str(schema)))
+        return await self._cached(key, lambda: self.inner.generate_json(prompt, schema))
+
+    async def generate_stream(self, prompt: str) -> AsyncGenerator[str, None]:
+        key = self._key("generate_stream", prompt)
+        text = await self.cache.get(key)
+        if text is not None:
+            self.cache.hits += 1
+            yield text
+            return
+
+        inflight = self._inflight.get(key)
+        if inflight is not None:
+            self.cache.coalesced += 1
+            text = await asyncio.shield(inflight)
+            if text is not None:
+                yield text
+                return
+            # The leading stream was abandoned; fall through and stream ourselves
+
+        # Lead: forward chunks as they arrive, then publish the full text to waiters
+        self.cache.misses += 1
+        done = asyncio.get_running_loop().create_future()
+        self._inflight[key] = done
+        chunks = []
+        try:
+            async for chunk in self.inner.generate_stream(prompt):
+                chunks.append(chunk)
+                yield chunk
+        except BaseException as e:
+            if isinstance(e, Exception):
+                done.set_exception(e)
+                done.exception()  # mark retrieved when nobody was waiting
+            else:
+                done.set_result(None)
+            raise
+        finally:
+            if self._inflight.get(key) is done:
+                del self._inflight[key]
+        text = "".join(chunks)
+        done.set_result(text)
+        await self.cache.put(key, text)
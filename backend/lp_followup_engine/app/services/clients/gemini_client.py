@@ -1,38 +1,96 @@
+import asyncio
+import time
+from typing import AsyncGenerator
 from google import genai
 from google.genai import types
 from app.core.config import settings
+from common.resilience import CircuitBreaker, CircuitOpenError, get_caller
 from app.services.base.llm_client import BaseLLMClient
 
 client = genai.Client(api_key=settings.GEMINI_API_KEY)
 
+# Caps in-flight Gemini requests for this worker; callers beyond it wait for a slot
+llm_slots = asyncio.Semaphore(settings.LLM_MAX_CONCURRENCY)
+
+FOLLOWUP_SYSTEM_INSTRUCTION = "You are a senior Amazon interviewer with over 10 years of experience in evaluating candidates for behavioral interviews."\
+    "You are conducting a Bar Raiser round focused on Amazon Leadership Principles. Your role is to assess candidates by asking thoughtful, context-aware follow-up questions that uncover depth, impact, decision-making, and ownership."\
+    "Always maintain a professional tone. Avoid vague or generic questions. Go beyond surface-level answers by probing into motivations, tradeoffs, measurable outcomes, and team dynamics."\
+    "You are not here to answer questions — only to guide the candidate deeper through precise, relevant questioning."
+
 class GeminiClient(BaseLLMClient):
-    def __init__(self, model="gemini-2.0-flash", temperature=0.7):
+    def __init__(self, model="gemini-2.0-flash", temperature=0.7, timeout=settings.LLM_TIMEOUT_SECONDS, name="gemini"):
         self.model = model
         self.temperature = temperature
-
-    def generate_stream(self, prompt: str):
-        # response = client.models.generate_content_stream(
-        response = client.models.generate_content(
-            model=self.model,
-            contents=prompt,
-            config=types.GenerateContentConfig(
-                system_instruction="You are a senior Amazon interviewer with over 10 years of experience in evaluating candidates for behavioral interviews."\
-                "You are conducting a Bar Raiser round focused on Amazon Leadership Principles. Your role is to assess candidates by asking thoughtful, context-aware follow-up questions that uncover depth, impact, decision-making, and ownership."\
-                "Always maintain a professional tone. Avoid vague or generic questions. Go beyond surface-level answers by probing into motivations, tradeoffs, measurable outcomes, and team dynamics."\
-                "You are not here to answer questions — only to guide the candidate deeper through precise, relevant questioning.",
-                temperature=self.temperature,
-                max_output_tokens=250
+        self.timeout = timeout
+        # Shared per call kind: deadline, hedging, retries and circuit breaker
+        self.resilience = get_caller(
+            name,
+            deadline=timeout,
+            retries=settings.LLM_RETRIES,
+            hedge=settings.LLM_HEDGE,
+            hedge_delay=settings.LLM_HEDGE_DELAY,
+            breaker=CircuitBreaker(
+                failure_rate=settings.BREAKER_FAILURE_RATE,
+                min_calls=settings.BREAKER_MIN_CALLS,
+                slow_call=timeout * 0.8,
+                cooldown=settings.BREAKER_COOLDOWN_SECONDS
             )
         )
-        # for chunk in response:
-        #     yield chunk.text.strip()
-        return response.text.strip().lower()
-
-    def generate(self, prompt: str) -> str:
-        response = client.models.generate_content(
-            model=self.model,
-            contents=prompt,
-            config=types.GenerateContentConfig(
+
+    async def _attempt(self, prompt, config):
+        # Each attempt (including a hedge) takes its own concurrency slot
+        async with llm_slots:
+            return await client.aio.models.generate_content(model=self.model, contents=prompt, config=config)
+
+    async def _call(self, prompt, config):
+        return await self.resilience.call(lambda: self._attempt(prompt, config))
+
+    async def generate_stream(self, prompt: str) -> AsyncGenerator[str, None]:
+        # Chunks already forwarded cannot be taken back, so streams are neither
+        # hedged nor retried; they still count towards the circuit breaker.
+        # One deadline for the whole stream, and a concurrency slot, both held
+        # around each await only: a timeout scope spanning `yield` would cancel the
+        # consumer instead, and a slot held across it would stay taken while a
+        # slow or buffered consumer is not reading
+        breaker = self.resilience.breaker
+        if not breaker.allow():
+            raise CircuitOpenError(f"{self.resilience.name}: circuit open")
+        start = time.monotonic()
+        try:
+            deadline = asyncio.get_running_loop().time() + self.timeout
+            async with asyncio.timeout_at(deadline):
+                async with llm_slots:
+                    response = await client.aio.models.generate_content_stream(
+                        model=self.model,
+                        contents=prompt,
+                        config=types.GenerateContentConfig(
+                            system_instruction=FOLLOWUP_SYSTEM_INSTRUCTION,
+                            temperature=self.temperature,
+                            max_output_tokens=250
+                        )
+                    )
+            chunks = aiter(response)
+            while True:
+                try:
+                    async with asyncio.timeout_at(deadline):
+                        async with llm_slots:
+                            chunk = await anext(chunks)
+                except StopAsyncIteration:
+                    break
+                if chunk.text:
+                    yield chunk.text
+        except (GeneratorExit, asyncio.CancelledError):
+            breaker.release()  # consumer stopped reading; says nothing about upstream
+            raise
+        except Exception:
+            breaker.record(False)
+            raise
+        breaker.record(True, time.monotonic() - start)
+
+    async def generate(self, prompt: str) -> str:
+        response = await self._call(
+            prompt,
+            types.GenerateContentConfig(
                 system_instruction = 
                     "You are a senior Amazon Bar Raiser with over 10 years of experience in behavioral interviewing for Leadership Principles (LPs). "\
                     "Your goal is to collect sufficient behavioral signal on at least 2 distinct LPs within a strict 30-minute interview.\n\n"\
@@ -54,4 +112,18 @@ class GeminiClient(BaseLLMClient):
                 temperature=self.temperature
             )
         )
-        return response.text
\ No newline at end of file
+        return response.text
+
+    async def generate_json(self, prompt: str, schema) -> str:
+        """Single structured call; returns the raw JSON text matching `schema`."""
+        response = await self._call(
+            prompt,
+            types.GenerateContentConfig(
+                system_instruction=FOLLOWUP_SYSTEM_INSTRUCTION,
+                temperature=self.temperature,
+                max_output_tokens=300,
+                response_mime_type="application/json",
+                response_schema=schema
+            )
+        )
+        return response.text
@@ -0,0 +1,115 @@
+"""
+Offline job that pre-generates follow-up questions for every main question in
+session_engine/questions.json. The session engine serves them when the live
+LLM misses its latency budget.
+
+Run from lp_followup_engine/:
+    python -m app.services.followup_bank_job --workers 4
+
+Results are appended to the bank one question at a time, so an interrupted
+run picks up where it stopped; questions that failed are retried next run.
+"""
+import argparse
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from google.genai import types
+from pydantic import ValidationError
+from app.schemas.responses import FollowupBankEntry
+from app.services.builders.followup_bank_builder import FollowupBankBuilder
+
+BACKEND_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..", ".."))
+QUESTIONS_FILE = os.path.join(BACKEND_DIR, "session_engine", "questions.json")
+BANK_FILE = os.path.join(BACKEND_DIR, "session_engine", "followup_bank.jsonl")
+
+RETRIES = 3
+
+
+def generate_entry(principle, question, count, model):
+    """Runs in a worker process; returns the bank record for one main question."""
+    from app.services.clients.gemini_client import client, FOLLOWUP_SYSTEM_INSTRUCTION
+
+    prompt = FollowupBankBuilder().build(principle=principle, question=question, count=count)
+    for attempt in range(RETRIES):
+        try:
+            response = client.models.generate_content(
+                model=model,
+                contents=prompt,
+                config=types.GenerateContentConfig(
+                    system_instruction=FOLLOWUP_SYSTEM_INSTRUCTION,
+                    temperature=0.7,
+                    response_mime_type="application/json",
+                    response_schema=FollowupBankEntry
+                )
+            )
+            entry = FollowupBankEntry.model_validate_json(response.text)
+            followups = [
+                {"question": f.question.strip(), "keywords": [k.strip().lower() for k in f.keywords if k.strip()]}
+                for f in entry.followups if f.question.strip()
+            ]
+            if followups:
+                return {"principle": principle, "question": question, "followups": followups}
+        except (ValidationError, ValueError) as e:
+            print(f"⚠️ Bad bank response for '{question[:40]}...' (attempt {attempt + 1}): {e}")
+        except Exception as e:
+            print(f"⚠️ Gemini error for '{question[:40]}...' (attempt {attempt + 1}): {e}")
+        if attempt + 1 < RETRIES:
+            time.sleep(2 ** attempt)
+    raise RuntimeError(f"No follow-ups generated for: {question}")
+
+
+def load_done(path):
+    done = set()
+    if os.path.exists(path):
+        with open(path, "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    continue  # partial last line from an interrupted run
+                done.add((record["principle"], record["question"]))
+    return done
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Pre-generate the follow-up bank from questions.json")
+    parser.add_argument("--questions", default=QUESTIONS_FILE)
+    parser.add_argument("--out", default=BANK_FILE)
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--count", type=int, default=8, help="follow-ups per main question")
+    parser.add_argument("--model", default="gemini-2.0-flash")
+    args = parser.parse_args()
+
+    with open(args.questions, "r", encoding="utf-8") as f:
+        questions = json.load(f)
+
+    done = load_done(args.out)
+    todo = [(p, q) for p, qs in questions.items() for q in qs if (p, q) not in done]
+    print(f"📚 {len(done)} question(s) already in the bank, {len(todo)} to generate")
+
+    failed = 0
+    if os.path.exists(args.out) and os.path.getsize(args.out):
+        with open(args.out, "rb+") as f:
+            f.seek(-1, os.SEEK_END)
+            if f.read(1) != b"\n":
+                f.write(b"\n")  # terminate a line cut off by an interrupted run
+
+    with ProcessPoolExecutor(max_workers=args.workers) as pool, open(args.out, "a", encoding="utf-8") as out:
+        futures = {pool.submit(generate_entry, p, q, args.count, args.model): q for p, q in todo}
+        for i, future in enumerate(as_completed(futures), 1):
+            try:
+                record = future.result()
+            except Exception as e:
+                failed += 1
+                print(f"❌ {e}")
+                continue
+            out.write(json.dumps(record, ensure_ascii=False) + "\n")
+            out.flush()
+            print(f"✅ [{i}/{len(todo)}] {record['principle']}: {len(record['followups'])} follow-ups")
+
+    print(f"Done; {failed} question(s) failed and will be retried on the next run")
+
+
+if __name__ == "__main__":
+    main()
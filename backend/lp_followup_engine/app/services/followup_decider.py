@@ -1,23 +1,80 @@
+import json
+import logging
+from app.core.config import settings
+from common.resilience import CircuitOpenError
 from app.services.clients.gemini_client import GeminiClient
+from app.services.clients.cached_client import CachingLLMClient
 from app.services.builders.followup_decision_builder import FollowupDecisionBuilder
+from app.services.history_compactor import prompt_token_stats
+from app.services.local_decider import LocalFollowupModel, extract_features
 
 class FollowupDecider:
-    def __init__(self, llm_client=None, prompt_builder=None):
-        self.llm_client = llm_client or GeminiClient(temperature=0.2)
+    """
+    Decides locally when the model is confident (probability outside
+    [DECIDER_LOW, DECIDER_HIGH]) and asks Gemini only for the uncertain middle.
+    """
+
+    def __init__(self, llm_client=None, prompt_builder=None, model=None,
+                 low=settings.DECIDER_LOW, high=settings.DECIDER_HIGH, log_path=settings.DECIDER_LOG_PATH):
+        self.llm_client = llm_client or CachingLLMClient(GeminiClient(temperature=0.2, name="followup_decision"))
         self.prompt_builder = prompt_builder or FollowupDecisionBuilder()
+        self.model = model or LocalFollowupModel.load()
+        self.low = low
+        self.high = high
+        self.log_path = log_path
+        self.counts = {"local": 0, "llm": 0, "llm_unparsed": 0, "llm_unavailable": 0}
+
+    async def decide(self, principle, time_remaining, num_lp_covered, history, time_spent, num_follow_up, summary=None):
+        answer = history[-1].answer if history else ""
+        features = extract_features(answer, num_follow_up, num_lp_covered, time_remaining)
+        p = self.model.probability(features)
+
+        if p <= self.low or p >= self.high:
+            decision, source = p >= self.high, "local"
+        else:
+            decision, source = await self._ask_llm(
+                principle, time_remaining, num_lp_covered, history, time_spent, num_follow_up, summary, p
+            )
 
-    def decide(self, principle, time_remaining, num_lp_covered, history, time_spent, num_follow_up):
+        self.counts[source] += 1
+        self._log(features, p, source, decision)
+        return decision
+
+    async def _ask_llm(self, principle, time_remaining, num_lp_covered, history, time_spent, num_follow_up, summary, p):
         prompt = self.prompt_builder.build(
             principle=principle,
             time_remaining=time_remaining,
             num_principles_covered=num_lp_covered,
             history=history,
             time_spent=time_spent,
-            num_follow_up=num_follow_up
+            num_follow_up=num_follow_up,
+            summary=summary
         )
-        result = self.llm_client.generate(prompt).lower()
+        prompt_token_stats.record("followup_decision", prompt)
+        try:
+            result = (await self.llm_client.generate(prompt)).lower()
+        except (CircuitOpenError, TimeoutError) as e:
+            # Gemini is down or past its deadline: the local model decides
+            logging.warning(f"Decision LLM unavailable, using local model (p={p:.2f}): {type(e).__name__}")
+            return p >= 0.5, "llm_unavailable"
         if "true" in result:
-            return True
+            return True, "llm"
         elif "false" in result:
-            return False
-        raise ValueError(f"Unexpected response: {result}")
\ No newline at end of file
+            return False, "llm"
+        # Unusable answer: go with the local model instead of failing the turn
+        logging.warning(f"Unexpected decision response, using local model (p={p:.2f}): {result!r}")
+        return p >= 0.5, "llm_unparsed"
+
+    def _log(self, features, p, source, decision):
+        if not self.log_path:
+            return
+        record = {"features": features, "p": round(p, 4), "source": source, "decision": decision}
+        try:
+            with open(self.log_path, "a", encoding="utf-8") as f:
+                f.write(json.dumps(record) + "\n")
+        except OSError as e:
+            logging.warning(f"Could not log follow-up decision: {e}")
+
+    def stats(self):
+        total = sum(self.counts.values())
+        return {**self.counts, "local_rate": round(self.counts["local"] / total, 4) if total else 0.0}
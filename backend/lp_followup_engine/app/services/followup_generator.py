@@ -1,11 +1,17 @@
 from app.services.clients.gemini_client import GeminiClient
+from app.services.clients.cached_client import CachingLLMClient
 from app.services.builders.followup_question_builder import FollowupQuestionBuilder
+from app.services.history_compactor import prompt_token_stats
 
 class FollowupGenerator:
     def __init__(self, llm_client=None, prompt_builder=None):
-        self.llm_client = llm_client or GeminiClient()
+        self.llm_client = llm_client or CachingLLMClient(GeminiClient(name="followup_question"))
         self.prompt_builder = prompt_builder or FollowupQuestionBuilder()
 
-    def generate(self, principle, history):
-        prompt = self.prompt_builder.build(principle=principle, history=history)
-        return self.llm_client.generate_stream(prompt)
\ No newline at end of file
+    async def generate(self, principle, history, summary=None):
+        return "".join([chunk async for chunk in self.stream(principle, history, summary)]).strip().lower()
+
+    def stream(self, principle, history, summary=None):
+        prompt = self.prompt_builder.build(principle=principle, history=history, summary=summary)
+        prompt_token_stats.record("followup_question", prompt)
+        return self.llm_client.generate_stream(prompt)
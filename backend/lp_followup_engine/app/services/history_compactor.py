@@ -0,0 +1,152 @@
+import logging
+import threading
+from collections import OrderedDict, defaultdict, deque
+from typing import List, NamedTuple, Optional
+from app.core.config import settings
+from app.db.session_memory import Turn
+from app.services.clients.gemini_client import GeminiClient
+from app.services.clients.cached_client import CachingLLMClient
+from app.services.builders.history_summary_builder import HistorySummaryBuilder
+
+CHARS_PER_TOKEN = 4
+
+def estimate_tokens(text: str) -> int:
+    """Cheap local estimate (Gemini averages ~4 characters per token); avoids a count_tokens round trip."""
+    return (len(text) + CHARS_PER_TOKEN - 1) // CHARS_PER_TOKEN
+
+def turn_tokens(turn: Turn) -> int:
+    return estimate_tokens(turn.question) + estimate_tokens(turn.answer)
+
+def clip(text: str, max_tokens: int) -> str:
+    """Shorten text to about max_tokens, keeping its start and end."""
+    max_chars = max_tokens * CHARS_PER_TOKEN
+    if len(text) <= max_chars:
+        return text
+    half = max(max_chars // 2 - 2, 0)
+    return f"{text[:half]} … {text[len(text) - half:]}"
+
+
+class CompactHistory(NamedTuple):
+    summary: Optional[str]
+    turns: List[Turn]
+    tokens: int
+
+
+class _CachedSummary(NamedTuple):
+    folded: int  # number of leading turns covered by the summary
+    last_folded: Turn
+    summary: str
+
+
+class HistoryCompactor:
+    """
+    Fits a (session, principle) history into `budget` prompt tokens. The most
+    recent turns (at most `keep_turns`) stay verbatim; older turns are folded
+    into a summary cached per (session, principle), so each call only
+    summarises the turns that aged out since the previous call.
+    """
+
+    def __init__(self, llm_client=None, prompt_builder=None, budget=settings.HISTORY_TOKEN_BUDGET,
+                 keep_turns=settings.HISTORY_KEEP_TURNS, summary_tokens=settings.HISTORY_SUMMARY_TOKENS,
+                 cache_size=settings.HISTORY_SUMMARY_CACHE_SIZE):
+        self.llm_client = llm_client or CachingLLMClient(GeminiClient(temperature=0.2, name="history_summary"))
+        self.prompt_builder = prompt_builder or HistorySummaryBuilder()
+        self.budget = budget
+        self.keep_turns = keep_turns
+        self.summary_tokens = summary_tokens
+        self.cache_size = cache_size
+        self._cache = OrderedDict()  # (session_id, principle) -> _CachedSummary, least recently used first
+        self._lock = threading.Lock()
+
+    async def compact(self, session_id: str, principle: str, history: List[Turn]) -> CompactHistory:
+        total = sum(turn_tokens(turn) for turn in history)
+        if total <= self.budget:
+            return CompactHistory(None, history, total)
+
+        # Newest turns that fit next to the summary; the latest turn is always kept
+        recent_budget = self.budget - self.summary_tokens
+        split, used = len(history), 0
+        while split > 0 and len(history) - split < self.keep_turns:
+            cost = turn_tokens(history[split - 1])
+            if split < len(history) and used + cost > recent_budget:
+                break
+            split -= 1
+            used += cost
+
+        recent = list(history[split:])
+        if used > recent_budget:
+            last = recent[-1]
+            recent[-1] = last._replace(answer=clip(last.answer, max(recent_budget - estimate_tokens(last.question), 1)))
+
+        summary = await self._summary(session_id, principle, history[:split]) if split else None
+        tokens = sum(turn_tokens(turn) for turn in recent) + (estimate_tokens(summary) if summary else 0)
+        return CompactHistory(summary, recent, tokens)
+
+    async def _summary(self, session_id, principle, older):
+        key = (session_id, principle)
+        with self._lock:
+            cached = self._cache.get(key)
+        if cached and cached.folded <= len(older) and older[cached.folded - 1] == cached.last_folded:
+            new_turns, previous = older[cached.folded:], cached.summary
+        else:
+            # First compaction, or the stored history was trimmed since; start over
+            new_turns, previous = older, None
+
+        summary = previous
+        if new_turns:
+            summary = clip(await self._summarize(principle, previous, new_turns), self.summary_tokens)
+        with self._lock:
+            self._cache[key] = _CachedSummary(len(older), older[-1], summary)
+            self._cache.move_to_end(key)
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+        return summary
+
+    async def _summarize(self, principle, previous, turns):
+        prompt = self.prompt_builder.build(
+            principle=principle,
+            summary=previous,
+            turns=turns,
+            max_words=self.summary_tokens * 3 // 4
+        )
+        prompt_token_stats.record("history_summary", prompt)
+        try:
+            return "".join([chunk async for chunk in self.llm_client.generate_stream(prompt)]).strip()
+        except Exception as e:
+            # Keep serving follow-ups; fall back to the head of each answer
+            logging.error(f"History summary failed, using extractive fallback: {e}")
+            notes = [previous] if previous else []
+            notes += [f"Q: {turn.question} A: {clip(turn.answer, 40)}" for turn in turns]
+            return " ".join(notes)
+
+
+class PromptTokenStats:
+    """Estimated prompt tokens of recent LLM calls, per prompt kind."""
+
+    def __init__(self, window=1000):
+        self._samples = defaultdict(lambda: deque(maxlen=window))
+        self._lock = threading.Lock()
+
+    def record(self, kind: str, prompt: str) -> int:
+        tokens = estimate_tokens(prompt)
+        with self._lock:
+            self._samples[kind].append(tokens)
+        logging.debug(f"{kind} prompt: ~{tokens} tokens")
+        return tokens
+
+    def snapshot(self):
+        with self._lock:
+            samples = {kind: list(values) for kind, values in self._samples.items() if values}
+        stats = {}
+        for kind, values in samples.items():
+            ordered = sorted(values)
+            stats[kind] = {
+                "calls": len(values),
+                "last": values[-1],
+                "p50": ordered[len(ordered) // 2],
+                "p95": ordered[min(len(ordered) - 1, len(ordered) * 95 // 100)],
+                "max": ordered[-1],
+            }
+        return stats
+
+prompt_token_stats = PromptTokenStats()
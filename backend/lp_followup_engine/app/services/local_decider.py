@@ -0,0 +1,122 @@
+"""
+Local follow-up decision model: a logistic regression over cheap features of
+the latest answer and interview progress. Default weights are hand-tuned; they
+can be replaced by weights trained offline from logged decisions:
+
+    python -m app.services.local_decider --log decisions.jsonl --out decider_weights.json
+"""
+import argparse
+import json
+import math
+import os
+import re
+from app.core.config import settings
+
+FEATURES = (
+    "num_follow_up",      # follow-ups already asked in this LP block
+    "star_coverage",      # fraction of Situation/Task/Action/Result cues in the answer
+    "has_metric",         # answer mentions a number or percentage
+    "short_answer",       # fewer than 40 words
+    "log_words",          # log(1 + words in the answer)
+    "time_pressure",      # under 10 minutes left with fewer than 2 LPs covered
+    "low_time",           # under 5 minutes left
+    "first_person",       # share of I/my vs we/our
+)
+
+DEFAULT_WEIGHTS = {
+    "bias": 1.6,
+    "num_follow_up": -0.8,
+    "star_coverage": -1.6,
+    "has_metric": -0.6,
+    "short_answer": 1.2,
+    "log_words": 0.0,
+    "time_pressure": -2.5,
+    "low_time": -3.0,
+    "first_person": -0.4,
+}
+
+STAR_CUES = (
+    re.compile(r"\b(when i was|at the time|back in|our team|the project|working (on|at))\b"),
+    re.compile(r"\b(goal|responsible|needed to|had to|task|deadline|challenge)\b"),
+    re.compile(r"\b(i (decided|built|led|wrote|proposed|reached out|implemented|designed|took)|my approach)\b"),
+    re.compile(r"\b(result(ed)?|outcome|improved|reduced|increased|saved|launched|learned)\b"),
+)
+METRIC = re.compile(r"\d|\bpercent\b")
+FIRST_PERSON = re.compile(r"\b(i|my|me)\b")
+TEAM_PERSON = re.compile(r"\b(we|our|us)\b")
+
+
+def extract_features(answer, num_follow_up, num_lp_covered, time_remaining):
+    text = answer.lower()
+    words = len(text.split())
+    mine, ours = len(FIRST_PERSON.findall(text)), len(TEAM_PERSON.findall(text))
+    return {
+        "num_follow_up": float(num_follow_up),
+        "star_coverage": sum(1 for cue in STAR_CUES if cue.search(text)) / len(STAR_CUES),
+        "has_metric": 1.0 if METRIC.search(text) else 0.0,
+        "short_answer": 1.0 if words < 40 else 0.0,
+        "log_words": math.log1p(words),
+        "time_pressure": 1.0 if time_remaining < 10 and num_lp_covered < 2 else 0.0,
+        "low_time": 1.0 if time_remaining < 5 else 0.0,
+        "first_person": mine / (mine + ours) if mine + ours else 0.5,
+    }
+
+
+class LocalFollowupModel:
+    def __init__(self, weights=None):
+        self.weights = {**DEFAULT_WEIGHTS, **(weights or {})}
+
+    @classmethod
+    def load(cls, path=settings.DECIDER_WEIGHTS_PATH):
+        if path and os.path.exists(path):
+            with open(path, "r", encoding="utf-8") as f:
+                return cls(json.load(f))
+        return cls()
+
+    def probability(self, features):
+        """Probability that another follow-up should be asked."""
+        z = self.weights["bias"] + sum(self.weights[name] * features[name] for name in FEATURES)
+        return 1.0 / (1.0 + math.exp(-z))
+
+
+def train(rows, epochs=200, lr=0.1, l2=0.001):
+    """Plain batch gradient descent; rows are (features, label) pairs."""
+    weights = dict.fromkeys(("bias",) + FEATURES, 0.0)
+    for _ in range(epochs):
+        grads = dict.fromkeys(weights, 0.0)
+        for features, label in rows:
+            p = LocalFollowupModel(weights).probability(features)
+            grads["bias"] += p - label
+            for name in FEATURES:
+                grads[name] += (p - label) * features[name]
+        for name in weights:
+            weights[name] -= lr * (grads[name] / len(rows) + l2 * weights[name])
+    return weights
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Train the local follow-up decider from logged decisions")
+    parser.add_argument("--log", default=settings.DECIDER_LOG_PATH, help="JSONL written with DECIDER_LOG_PATH set")
+    parser.add_argument("--out", default=settings.DECIDER_WEIGHTS_PATH or "decider_weights.json")
+    parser.add_argument("--source", default="llm", help="only learn from decisions made by this source")
+    args = parser.parse_args()
+
+    rows = []
+    with open(args.log, "r", encoding="utf-8") as f:
+        for line in f:
+            record = json.loads(line)
+            if record["source"] == args.source:
+                rows.append((record["features"], 1.0 if record["decision"] else 0.0))
+    if not rows:
+        raise SystemExit(f"No '{args.source}' decisions in {args.log}")
+
+    weights = train(rows)
+    model = LocalFollowupModel(weights)
+    accuracy = sum((model.probability(f) >= 0.5) == bool(y) for f, y in rows) / len(rows)
+    with open(args.out, "w", encoding="utf-8") as f:
+        json.dump(weights, f, indent=2)
+    print(f"Trained on {len(rows)} decisions, training accuracy {accuracy:.3f}; weights written to {args.out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+from pydantic import ValidationError
+from app.core.config import settings
+from app.services.clients.gemini_client import GeminiClient
+from app.services.clients.cached_client import CachingLLMClient
+from app.services.builders.next_turn_builder import NextTurnBuilder
+from app.services.history_compactor import prompt_token_stats
+from app.services.local_decider import LocalFollowupModel, extract_features
+from app.schemas.responses import NextTurnResponse
+
+class NextTurnPlanner:
+    """
+    Decides whether to follow up and writes the follow-up in one structured LLM
+    call. When the local model is confident that no follow-up is needed
+    (probability <= DECIDER_LOW) the LLM is not called at all.
+    """
+
+    def __init__(self, llm_client=None, prompt_builder=None, model=None, low=settings.DECIDER_LOW):
+        self.llm_client = llm_client or CachingLLMClient(GeminiClient(temperature=0.4, name="next_turn"))
+        self.prompt_builder = prompt_builder or NextTurnBuilder()
+        self.model = model or LocalFollowupModel.load()
+        self.low = low
+        self.counts = {"local": 0, "llm": 0}
+
+    async def plan(self, principle, time_remaining, num_lp_covered, history, time_spent, num_follow_up, summary=None) -> NextTurnResponse:
+        answer = history[-1].answer if history else ""
+        if self.model.probability(extract_features(answer, num_follow_up, num_lp_covered, time_remaining)) <= self.low:
+            self.counts["local"] += 1
+            return NextTurnResponse(followup=False)
+
+        self.counts["llm"] += 1
+        prompt = self.prompt_builder.build(
+            principle=principle,
+            time_remaining=time_remaining,
+            num_principles_covered=num_lp_covered,
+            history=history,
+            time_spent=time_spent,
+            num_follow_up=num_follow_up,
+            summary=summary
+        )
+        prompt_token_stats.record("next_turn", prompt)
+        raw = await self.llm_client.generate_json(prompt, NextTurnResponse)
+        try:
+            result = NextTurnResponse.model_validate_json(raw)
+        except ValidationError as e:
+            raise ValueError(f"Unexpected response: {raw}") from e
+
+        result.question = result.question.strip()
+        if result.followup and not result.question:
+            raise ValueError("Follow-up requested but no question was generated")
+        if not result.followup:
+            result.question = ""
+        return result
+
+    def stats(self):
+        total = sum(self.counts.values())
+        return {**self.counts, "local_rate": round(self.counts["local"] / total, 4) if total else 0.0}
@@ -0,0 +1,120 @@
+import asyncio
+from app.services.clients.cached_client import CachingLLMClient, LLMResponseCache
+
+
+class FakeLLM:
+    model = "fake-model"
+    temperature = 0.3
+
+    def __init__(self, chunks=("What was ", "the result?"), delay=0.01):
+        self.chunks = chunks
+        self.delay = delay
+        self.calls = 0
+        self.streams = 0
+
+    async def generate(self, prompt):
+        self.calls += 1
+        await asyncio.sleep(self.delay)
+        return f"reply to {prompt}"
+
+    async def generate_stream(self, prompt):
+        self.streams += 1
+        for chunk in self.chunks:
+            await asyncio.sleep(self.delay)
+            yield chunk
+
+
+def caching(inner):
+    return CachingLLMClient(inner, LLMResponseCache(ttl=60, max_entries=10, path=None))
+
+
+async def collect(stream):
+    return [chunk async for chunk in stream]
+
+
+def test_concurrent_identical_calls_make_one_upstream_call():
+    inner = FakeLLM()
+    client = caching(inner)
+
+    async def run():
+        replies = await asyncio.gather(*(client.generate("single-flight") for _ in range(5)))
+        return replies, await client.generate("single-flight")
+
+    replies, again = asyncio.run(run())
+    assert set(replies) == {again} == {"reply to single-flight"}
+    assert inner.calls == 1
+    stats = client.cache.stats()
+    assert (stats["misses"], stats["coalesced"], stats["hits"]) == (1, 4, 1)
+
+
+def test_cancelled_caller_does_not_cancel_the_shared_call():
+    inner = FakeLLM(delay=0.05)
+    client = caching(inner)
+
+    async def run():
+        first = asyncio.create_task(client.generate("shared"))
+        second = asyncio.create_task(client.generate("shared"))
+        await asyncio.sleep(0.01)
+        first.cancel()
+        return await second
+
+    assert asyncio.run(run()) == "reply to shared"
+    assert inner.calls == 1
+
+
+def test_stream_leader_hands_its_text_to_waiters():
+    inner = FakeLLM()
+    client = caching(inner)
+
+    async def run():
+        return await asyncio.gather(collect(client.generate_stream("lead")), collect(client.generate_stream("lead")))
+
+    leader, waiter = asyncio.run(run())
+    assert leader == ["What was ", "the result?"]
+    assert waiter == ["What was the result?"]
+    assert inner.streams == 1
+    assert asyncio.run(collect(client.generate_stream("lead"))) == ["What was the result?"]
+    assert inner.streams == 1
+
+
+def test_waiter_streams_itself_when_the_leader_is_abandoned():
+    inner = FakeLLM()
+    client = caching(inner)
+
+    async def run():
+        leader = client.generate_stream("abandoned")
+        await anext(leader)
+        waiter = asyncio.create_task(collect(client.generate_stream("abandoned")))
+        await asyncio.sleep(0.001)
+        await leader.aclose()
+        return await waiter
+
+    assert asyncio.run(run()) == ["What was ", "the result?"]
+    assert inner.streams == 2
+
+
+def test_cache_expires_and_evicts_least_recently_used():
+    cache = LLMResponseCache(ttl=0.05, max_entries=2, path=None)
+
+    async def run():
+        await cache.put("a", "A")
+        await cache.put("b", "B")
+        assert await cache.get("a") == "A"
+        await cache.put("c", "C")  # evicts "b", the least recently used
+        assert await cache.get("b") is None
+        await asyncio.sleep(0.06)
+        return await cache.get("a")
+
+    assert asyncio.run(run()) is None
+    assert cache.stats()["evictions"] == 1
+
+
+def test_sqlite_entries_survive_a_restart(tmp_path):
+    path = str(tmp_path / "llm_cache.sqlite")
+    asyncio.run(LLMResponseCache(ttl=60, path=path).put("key", "persisted"))
+    asyncio.run(LLMResponseCache(ttl=-1, path=path).put("stale", "expired"))
+
+    restarted = LLMResponseCache(ttl=60, path=path)
+    assert asyncio.run(restarted.get("key")) == "persisted"
+    assert asyncio.run(restarted.get("stale")) is None
+    assert restarted.stats()["entries"] == 1
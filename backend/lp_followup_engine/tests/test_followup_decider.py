@@ -0,0 +1,84 @@
+import asyncio
+from app.db.session_memory import Turn
+from app.schemas.responses import NextTurnResponse
+from app.services.followup_decider import FollowupDecider
+from app.services.next_turn_planner import NextTurnPlanner
+from common.resilience import CircuitOpenError
+
+HISTORY = [Turn("main", "Tell me about a time you took ownership.", "I led the migration.")]
+
+
+class FixedModel:
+    def __init__(self, p):
+        self.p = p
+
+    def probability(self, features):
+        return self.p
+
+
+class FakeLLM:
+    def __init__(self, reply=None, error=None):
+        self.reply = reply
+        self.error = error
+        self.calls = 0
+
+    async def _answer(self):
+        self.calls += 1
+        if self.error is not None:
+            raise self.error
+        return self.reply
+
+    async def generate(self, prompt):
+        return await self._answer()
+
+    async def generate_json(self, prompt, schema):
+        return await self._answer()
+
+
+def decide(decider):
+    return asyncio.run(decider.decide("Ownership", 20, 1, HISTORY, 5, 0))
+
+
+def plan(planner):
+    return asyncio.run(planner.plan("Ownership", 20, 1, HISTORY, 5, 0))
+
+
+def test_confident_model_decides_without_the_llm():
+    llm = FakeLLM("true")
+    assert decide(FollowupDecider(llm_client=llm, model=FixedModel(0.9), log_path="")) is True
+    assert decide(FollowupDecider(llm_client=llm, model=FixedModel(0.1), log_path="")) is False
+    assert llm.calls == 0
+
+
+def test_uncertain_model_asks_the_llm():
+    llm = FakeLLM("False.")
+    decider = FollowupDecider(llm_client=llm, model=FixedModel(0.6), log_path="")
+    assert decide(decider) is False
+    assert llm.calls == 1
+    assert decider.stats()["llm"] == 1
+
+
+def test_llm_unavailable_or_unparsed_falls_back_to_the_model():
+    decider = FollowupDecider(llm_client=FakeLLM(error=CircuitOpenError("open")), model=FixedModel(0.6), log_path="")
+    assert decide(decider) is True
+    decider.llm_client = FakeLLM(error=TimeoutError())
+    decider.model = FixedModel(0.4)
+    assert decide(decider) is False
+    decider.llm_client = FakeLLM("maybe")
+    assert decide(decider) is False
+    assert decider.counts == {"local": 0, "llm": 0, "llm_unparsed": 1, "llm_unavailable": 2}
+
+
+def test_planner_skips_the_llm_when_no_followup_is_likely():
+    llm = FakeLLM('{"followup": true, "question": "Why?"}')
+    planner = NextTurnPlanner(llm_client=llm, model=FixedModel(0.1), low=0.2)
+    assert plan(planner) == NextTurnResponse(followup=False)
+    assert llm.calls == 0
+    assert planner.stats() == {"local": 1, "llm": 0, "local_rate": 1.0}
+
+
+def test_planner_asks_the_llm_otherwise():
+    llm = FakeLLM('{"followup": true, "question": "  What did you measure?  "}')
+    result = plan(NextTurnPlanner(llm_client=llm, model=FixedModel(0.5), low=0.2))
+    assert result == NextTurnResponse(followup=True, question="What did you measure?")
+    assert llm.calls == 1
@@ -0,0 +1,37 @@
+import asyncio
+from types import SimpleNamespace
+from app.services.clients import gemini_client
+from app.services.clients.gemini_client import GeminiClient
+
+
+class FakeModels:
+    def __init__(self, texts):
+        self.texts = texts
+
+    async def generate_content_stream(self, model, contents, config):
+        async def chunks():
+            for text in self.texts:
+                await asyncio.sleep(0)
+                yield SimpleNamespace(text=text)
+        return chunks()
+
+
+def test_stream_does_not_hold_a_slot_while_consumer_is_not_reading(monkeypatch):
+    monkeypatch.setattr(gemini_client, "client", SimpleNamespace(aio=SimpleNamespace(models=FakeModels(["What ", "was ", "the result?"]))))
+
+    async def run():
+        slots = asyncio.Semaphore(1)
+        monkeypatch.setattr(gemini_client, "llm_slots", slots)
+        stream = GeminiClient(name="test_stream_slots").generate_stream("prompt")
+        first = await anext(stream)
+        # A second call must get the only slot while the first consumer is paused
+        other = GeminiClient(name="test_stream_slots").generate_stream("prompt")
+        other_first = await asyncio.wait_for(anext(other), timeout=1)
+        rest = [chunk async for chunk in stream]
+        await other.aclose()
+        return first, other_first, rest, slots.locked()
+
+    first, other_first, rest, locked = asyncio.run(run())
+    assert (first, other_first) == ("What ", "What ")
+    assert rest == ["was ", "the result?"]
+    assert not locked
@@ -0,0 +1,98 @@
+import asyncio
+from app.db.session_memory import Turn
+from app.services.history_compactor import HistoryCompactor, estimate_tokens, turn_tokens
+
+
+def turns(count):
+    # 11 estimated tokens each
+    return [Turn("main" if i == 0 else "followup", f"q{i}", f"answer {i:02d} " + "x" * 30) for i in range(count)]
+
+
+class FakeBuilder:
+    def __init__(self):
+        self.calls = []
+
+    def build(self, principle, summary, turns, max_words):
+        self.calls.append((summary, [turn.question for turn in turns]))
+        return "summarise " + " ".join(turn.question for turn in turns)
+
+
+class FakeLLM:
+    def __init__(self, fail=False):
+        self.fail = fail
+
+    async def generate_stream(self, prompt):
+        if self.fail:
+            raise TimeoutError("LLM call timed out")
+        yield "summary of "
+        yield prompt.removeprefix("summarise ")
+
+
+def compactor(llm=None, **kwargs):
+    options = {"budget": 60, "keep_turns": 2, "summary_tokens": 20, "cache_size": 10, **kwargs}
+    builder = FakeBuilder()
+    return HistoryCompactor(llm_client=llm or FakeLLM(), prompt_builder=builder, **options), builder
+
+
+def compact(history_compactor, history, session_id="s1"):
+    return asyncio.run(history_compactor.compact(session_id, "Ownership", history))
+
+
+def test_history_within_budget_is_untouched():
+    history_compactor, builder = compactor()
+    history = turns(5)
+    result = compact(history_compactor, history)
+    assert result.summary is None and result.turns == history
+    assert result.tokens == 55 and builder.calls == []
+
+
+def test_older_turns_fold_into_a_summary_beside_the_latest_ones():
+    history_compactor, builder = compactor()
+    history = turns(6)
+    result = compact(history_compactor, history)
+    assert result.turns == history[-2:]
+    assert result.summary == "summary of q0 q1 q2 q3"
+    assert result.tokens == sum(turn_tokens(turn) for turn in history[-2:]) + estimate_tokens(result.summary)
+    assert result.tokens <= 60
+
+
+def test_recent_turns_stop_at_their_share_of_the_budget():
+    history_compactor, _ = compactor(keep_turns=5)
+    result = compact(history_compactor, turns(8))
+    assert [turn.question for turn in result.turns] == ["q5", "q6", "q7"]  # 33 of the 40 tokens left beside the summary
+
+
+def test_oversized_latest_turn_is_kept_and_clipped():
+    history_compactor, builder = compactor()
+    long_answer = "start " + "y" * 1000 + " end"
+    result = compact(history_compactor, [Turn("main", "q0", long_answer)])
+    assert result.summary is None and builder.calls == []
+    answer = result.turns[0].answer
+    assert answer.startswith("start ") and answer.endswith(" end") and " … " in answer
+    assert result.tokens <= 60 - 20
+
+
+def test_only_newly_aged_out_turns_are_summarised():
+    history_compactor, builder = compactor()
+    compact(history_compactor, turns(6))
+    result = compact(history_compactor, turns(7))
+    assert builder.calls[-1] == ("summary of q0 q1 q2 q3", ["q4"])
+
+    compact(history_compactor, turns(7))  # nothing new aged out: served from the cache
+    assert len(builder.calls) == 2
+    assert result.turns == turns(7)[-2:]
+
+
+def test_summary_starts_over_after_the_history_was_trimmed():
+    history_compactor, builder = compactor()
+    compact(history_compactor, turns(6))
+    trimmed = [turn for turn in turns(8) if turn.question != "q1"]
+    compact(history_compactor, trimmed)
+    assert builder.calls[-1] == (None, ["q0", "q2", "q3", "q4", "q5"])
+
+
+def test_failed_summary_falls_back_to_the_head_of_each_answer():
+    history_compactor, _ = compactor(FakeLLM(fail=True), summary_tokens=40, budget=80)
+    result = compact(history_compactor, turns(8))
+    assert result.summary.startswith("Q: q0 A: answer 00")
+    assert "Q: q5 A: answer 05" in result.summary
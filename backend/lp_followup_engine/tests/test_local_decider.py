@@ -0,0 +1,43 @@
+import math
+import pytest
+from app.services.local_decider import FEATURES, LocalFollowupModel, extract_features, train
+
+STAR_ANSWER = (
+    "When I was on the payments team we had to hit a hard deadline. "
+    "I decided to split the migration and I built a replay tool. "
+    "It reduced failed charges by 30 percent."
+)
+
+
+def test_extract_features_from_a_full_star_answer():
+    features = extract_features(STAR_ANSWER, num_follow_up=1, num_lp_covered=2, time_remaining=20)
+    assert set(features) == set(FEATURES)
+    assert features["star_coverage"] == 1.0
+    assert features["has_metric"] == 1.0
+    assert features["short_answer"] == 1.0
+    assert features["log_words"] == pytest.approx(math.log1p(len(STAR_ANSWER.split())))
+    assert features["num_follow_up"] == 1.0
+    assert features["time_pressure"] == features["low_time"] == 0.0
+    assert features["first_person"] == pytest.approx(3 / 4)
+
+
+def test_extract_features_time_flags_and_empty_answer():
+    features = extract_features("", num_follow_up=0, num_lp_covered=1, time_remaining=4)
+    assert features["time_pressure"] == features["low_time"] == 1.0
+    assert features["star_coverage"] == features["has_metric"] == 0.0
+    assert features["first_person"] == 0.5
+
+
+def test_default_model_prefers_a_followup_for_a_thin_answer():
+    model = LocalFollowupModel()
+    thin = model.probability(extract_features("I fixed it.", 0, 1, 25))
+    full = model.probability(extract_features(STAR_ANSWER, 2, 1, 4))
+    assert thin > 0.8 and full < 0.2
+
+
+def test_train_separates_the_labels():
+    yes = extract_features("I fixed it.", 0, 1, 25)
+    no = extract_features(STAR_ANSWER, 2, 1, 4)
+    weights = train([(yes, 1.0), (no, 0.0)] * 5, epochs=300, lr=0.5)
+    model = LocalFollowupModel(weights)
+    assert model.probability(yes) > 0.5 > model.probability(no)
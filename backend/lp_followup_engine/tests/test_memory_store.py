@@ -0,0 +1,74 @@
+import asyncio
+import threading
+import pytest
+from app.db.memory_store import InMemorySessionMemoryStore, RedisSessionMemoryStore, SQLiteSessionMemoryStore
+from app.db.session_memory import Turn
+
+
+@pytest.fixture(params=["memory", "sqlite", "redis"])
+def store(request, tmp_path):
+    if request.param == "memory":
+        return InMemorySessionMemoryStore()
+    if request.param == "sqlite":
+        return SQLiteSessionMemoryStore(path=str(tmp_path / "memory.db"))
+    fakeredis = pytest.importorskip("fakeredis")
+    pytest.importorskip("lupa")  # fakeredis needs it for EVAL
+    return RedisSessionMemoryStore(fakeredis.FakeRedis())
+
+
+def test_record_turn_appends_and_replaces(store):
+    store.record_turn("s1", "Ownership", "main question", "first try")
+    store.record_turn("s1", "Ownership", "main question", "full answer")
+    store.record_turn("s1", "Ownership", "follow-up", "more detail")
+    assert store.get_history("s1", "Ownership") == [
+        Turn("main", "main question", "full answer"),
+        Turn("followup", "follow-up", "more detail"),
+    ]
+    assert store.get_history("s1", "Bias for Action") == []
+    assert store.get_history("unknown", "Ownership") == []
+
+
+def test_async_wrappers(store):
+    async def run():
+        await store.record_turn_async("s2", "Ownership", "main question", "answer")
+        return await store.get_history_async("s2", "Ownership")
+
+    assert asyncio.run(run()) == [Turn("main", "main question", "answer")]
+
+
+def test_shared_backend_runs_off_the_event_loop(tmp_path, monkeypatch):
+    store = SQLiteSessionMemoryStore(path=str(tmp_path / "memory.db"))
+    threads = []
+    record = store.record_turn
+    monkeypatch.setattr(store, "record_turn", lambda *args: (threads.append(threading.get_ident()), record(*args)))
+
+    async def run():
+        await store.record_turn_async("s3", "Ownership", "main question", "answer")
+        return threading.get_ident()
+
+    loop_thread = asyncio.run(run())
+    assert threads and threads[0] != loop_thread
+
+
+def test_sqlite_cap_evicts_whole_older_principles(tmp_path):
+    store = SQLiteSessionMemoryStore(path=str(tmp_path / "memory.db"), max_bytes_per_session=200)
+    store.record_turn("s1", "Ownership", "main question", "a" * 40)
+    store.record_turn("s1", "Ownership", "follow-up one", "b" * 40)
+    store.record_turn("s1", "Ownership", "follow-up two", "c" * 40)
+    store.record_turn("s1", "Bias for Action", "another main question", "d" * 60)
+    store.record_turn("s1", "Bias for Action", "another follow-up", "e" * 60)
+
+    assert store.get_history("s1", "Ownership") == []
+    assert [turn.kind for turn in store.get_history("s1", "Bias for Action")] == ["main", "followup"]
+
+
+def test_sqlite_cap_keeps_main_question_of_current_principle(tmp_path):
+    store = SQLiteSessionMemoryStore(path=str(tmp_path / "memory.db"), max_bytes_per_session=150)
+    store.record_turn("s1", "Ownership", "main question", "a" * 40)
+    for i in range(3):
+        store.record_turn("s1", "Ownership", f"follow-up {i}", "b" * 40)
+
+    history = store.get_history("s1", "Ownership")
+    assert history[0].kind == "main"
+    assert history[-1].question == "follow-up 2"
+    assert sum(turn.nbytes for turn in history) <= 150
@@ -0,0 +1,91 @@
+"""
+Run from lp_followup_engine/:
+    python -m pytest tests
+"""
+from fastapi.testclient import TestClient
+from app.main import app
+from app.api import routes
+
+client = TestClient(app)
+
+
+def payload(session_id, **extra):
+    return {
+        "session_id": session_id,
+        "principle": "Ownership",
+        "question": "Tell me about a time you took ownership.",
+        "user_input": "I led the migration and cut costs by 30 percent.",
+        "time_remaining": 20,
+        "time_spent": 5,
+        "num_followups": 0,
+        "num_lp_questions": 1,
+        **extra,
+    }
+
+
+def test_streamed_next_turn_generates_only_after_yes(monkeypatch):
+    generated = []
+
+    async def decide(*args, **kwargs):
+        return True
+
+    async def stream(principle, history, summary=None):
+        generated.append(principle)
+        for chunk in ("What was ", "the result?"):
+            yield chunk
+
+    monkeypatch.setattr(routes.decider, "decide", decide)
+    monkeypatch.setattr(routes.generator, "stream", stream)
+    response = client.post("/next-turn", json=payload("route-yes", stream=True))
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain")
+    assert response.text == "What was the result?"
+    assert generated == ["Ownership"]
+    assert len(routes.memory_manager.get_history("route-yes", "Ownership")) == 1
+
+
+def test_streamed_next_turn_returns_json_on_no(monkeypatch):
+    async def decide(*args, **kwargs):
+        return False
+
+    def stream(*args, **kwargs):
+        raise AssertionError("follow-up generated although none is wanted")
+
+    monkeypatch.setattr(routes.decider, "decide", decide)
+    monkeypatch.setattr(routes.generator, "stream", stream)
+    response = client.post("/next-turn", json=payload("route-no", stream=True))
+    assert response.status_code == 200
+    assert response.json() == {"followup": False, "question": ""}
+
+
+def test_unrecorded_next_turn_leaves_history_until_record_turn(monkeypatch):
+    seen = []
+
+    async def decide(principle, time_remaining, num_lp_covered, history, *args, **kwargs):
+        seen.append(len(history))
+        return False
+
+    monkeypatch.setattr(routes.decider, "decide", decide)
+    response = client.post("/next-turn", json=payload("route-speculative", stream=True, record=False))
+    assert response.status_code == 200
+    assert seen == [1]  # the partial answer is still part of the prompt
+    assert routes.memory_manager.get_history("route-speculative", "Ownership") == []
+
+    body = {key: payload("route-speculative")[key] for key in ("session_id", "principle", "question", "user_input")}
+    response = client.post("/record-turn", json=body)
+    assert response.json() == {"recorded": True}
+    assert len(routes.memory_manager.get_history("route-speculative", "Ownership")) == 1
+
+
+def test_llm_failures_map_to_fallback_statuses(monkeypatch):
+    async def circuit_open(*args, **kwargs):
+        raise routes.CircuitOpenError("next_turn: circuit open")
+
+    async def timed_out(*args, **kwargs):
+        raise TimeoutError
+
+    monkeypatch.setattr(routes.planner, "plan", circuit_open)
+    assert client.post("/next-turn", json=payload("route-503")).status_code == 503
+    monkeypatch.setattr(routes.planner, "plan", timed_out)
+    response = client.post("/next-turn", json=payload("route-504"))
+    assert response.status_code == 504 and response.json() == {"detail": "LLM call timed out"}
@@ -0,0 +1,63 @@
+import time
+from app.db.session_memory import SessionMemoryManager, Turn, with_turn
+
+QUESTION = "Tell me about a time you took ownership."
+
+
+def manager(**kwargs):
+    options = {"idle_ttl": 60, "max_sessions": 10, "max_bytes_per_session": 10_000, **kwargs}
+    return SessionMemoryManager(**options)
+
+
+def test_record_turn_appends_replaces_and_tracks_bytes():
+    memory = manager()
+    memory.record_turn("s1", "Ownership", QUESTION, "first try")
+    memory.record_turn("s1", "Ownership", QUESTION, "the full answer")
+    memory.record_turn("s1", "Ownership", "What was the result?", "costs fell")
+    history = memory.get_history("s1", "Ownership")
+    assert history == [Turn("main", QUESTION, "the full answer"), Turn("followup", "What was the result?", "costs fell")]
+    assert memory.stats()["bytes"] == sum(turn.nbytes for turn in history)
+    assert with_turn(history, "What was the result?", "costs fell by a third")[-1].answer == "costs fell by a third"
+
+
+def test_idle_sessions_expire():
+    memory = manager(idle_ttl=0.05)
+    memory.record_turn("idle", "Ownership", QUESTION, "answer")
+    time.sleep(0.06)
+    memory.record_turn("active", "Ownership", QUESTION, "answer")
+    assert memory.get_history("idle", "Ownership") == []
+    stats = memory.stats()
+    assert stats["live_sessions"] == 1 and stats["idle_evictions"] == 1
+    assert stats["bytes"] == len(QUESTION) + len("answer")
+
+
+def test_least_recently_used_session_is_evicted():
+    memory = manager(max_sessions=2)
+    memory.record_turn("a", "Ownership", QUESTION, "answer a")
+    memory.record_turn("b", "Ownership", QUESTION, "answer b")
+    memory.get_history("a", "Ownership")  # "b" is now the least recently used
+    memory.record_turn("c", "Ownership", QUESTION, "answer c")
+    assert memory.get_history("b", "Ownership") == []
+    assert memory.get_history("a", "Ownership") != []
+    assert memory.stats()["lru_evictions"] == 1
+
+
+def test_byte_cap_drops_older_principles_then_older_followups():
+    memory = manager(max_bytes_per_session=200)
+    memory.record_turn("s1", "Bias for Action", QUESTION, "x" * 100)
+    memory.record_turn("s1", "Ownership", QUESTION, "y" * 60)
+    assert memory.get_history("s1", "Bias for Action") == []  # whole older principle dropped first
+
+    memory.record_turn("s1", "Ownership", "follow-up one", "z" * 40)
+    memory.record_turn("s1", "Ownership", "follow-up two", "w" * 40)
+    assert [turn.question for turn in memory.get_history("s1", "Ownership")] == [QUESTION, "follow-up two"]
+    stats = memory.stats()
+    assert stats["bytes"] <= 200
+    assert stats["trimmed_bytes"] == len(QUESTION) + 100 + len("follow-up one") + 40
+
+
+def test_latest_turn_is_kept_even_over_the_cap():
+    memory = manager(max_bytes_per_session=50)
+    memory.record_turn("s1", "Ownership", QUESTION, "a" * 200)
+    assert len(memory.get_history("s1", "Ownership")) == 1
+    assert memory.stats()["trimmed_bytes"] == 0
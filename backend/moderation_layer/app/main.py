@@ -1,11 +1,27 @@
 from fastapi import FastAPI
-from app.schemas.moderation import ModerationRequest, ModerationResponse
+from app.schemas.moderation import ModerationRequest, ModerationResponse, ModerationBatchRequest, ModerationBatchResponse
 from app.services.moderation_service import Moderator
+from common.resilience import resilience_stats
 
 app = FastAPI()
 moderator = Moderator()
 
 @app.post("/moderate", response_model=ModerationResponse)
-def moderate_input(req: ModerationRequest):
-    result = moderator.moderate(req.question, req.user_input)
+async def moderate_input(req: ModerationRequest):
+    result = await moderator.moderate(req.question, req.user_input)
     return ModerationResponse(status=result.status)
+
+@app.post("/moderate/batch", response_model=ModerationBatchResponse)
+async def moderate_batch(req: ModerationBatchRequest):
+    """Many (question, user_input) pairs, e.g. re-moderating stored sessions, in as few Gemini calls as possible."""
+    results = await moderator.moderate_batch(req.items)
+    return ModerationBatchResponse(results=results)
+
+@app.get("/moderate/stats")
+async def moderation_stats():
+    """Share of inputs resolved locally or from the cache vs escalated to Gemini."""
+    return moderator.stats()
+
+@app.get("/resilience/stats")
+async def moderation_resilience_stats():
+    return resilience_stats()
@@ -1,4 +1,5 @@
-from pydantic import BaseModel
+from typing import List
+from pydantic import BaseModel, Field
 
 class ModerationRequest(BaseModel):
     question: str
@@ -6,3 +7,17 @@ class ModerationRequest(BaseModel):
 
 class ModerationResponse(BaseModel):
     status: str
+
+class ModerationBatchRequest(BaseModel):
+    items: List[ModerationRequest] = Field(..., max_length=500)
+
+class ModerationBatchResponse(BaseModel):
+    results: List[ModerationResponse]
+
+# Structured output of one batched Gemini call
+class BatchLabel(BaseModel):
+    id: int
+    status: str
+
+class BatchLabels(BaseModel):
+    labels: List[BatchLabel]
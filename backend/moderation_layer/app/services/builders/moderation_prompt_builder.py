@@ -3,3 +3,5 @@ from .prompt_loader import render_prompt
 def build_moderation_prompt(question: str, user_input: str) -> str:
     return render_prompt("moderation_prompt.j2", question=question, user_input=user_input)
 
+def build_moderation_batch_prompt(items) -> str:
+    return render_prompt("moderation_batch_prompt.j2", items=items)
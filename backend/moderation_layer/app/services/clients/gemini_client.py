@@ -10,3 +10,18 @@ if not GEMINI_API_KEY:
 
 client = genai.Client(api_key=GEMINI_API_KEY)
 
+
+# Moderation sits on every interview turn: keep its deadline well under the
+# session engine's MODERATION_TIMEOUT so the "safe" fallback arrives in time
+MODERATION_DEADLINE = float(os.getenv("MODERATION_DEADLINE", "3.0"))
+MODERATION_RETRIES = int(os.getenv("MODERATION_RETRIES", "1"))
+MODERATION_HEDGE_DELAY = float(os.getenv("MODERATION_HEDGE_DELAY", "1.0"))
+BREAKER_FAILURE_RATE = float(os.getenv("BREAKER_FAILURE_RATE", "0.5"))
+BREAKER_MIN_CALLS = int(os.getenv("BREAKER_MIN_CALLS", "10"))
+BREAKER_COOLDOWN_SECONDS = float(os.getenv("BREAKER_COOLDOWN_SECONDS", "30"))
+
+# Result cache for repeated (question, input) pairs, and batch classification
+MODERATION_CACHE_TTL_SECONDS = float(os.getenv("MODERATION_CACHE_TTL_SECONDS", "3600"))
+MODERATION_CACHE_MAX_ENTRIES = int(os.getenv("MODERATION_CACHE_MAX_ENTRIES", "10000"))
+MODERATION_BATCH_SIZE = int(os.getenv("MODERATION_BATCH_SIZE", "25"))
+MODERATION_BATCH_DEADLINE = float(os.getenv("MODERATION_BATCH_DEADLINE", "20.0"))
@@ -0,0 +1,112 @@
+import math
+import re
+from typing import Optional
+
+# Short stock phrases for the interview control intents
+CONTROL_PATTERNS = {
+    "repeat": re.compile(
+        r"\b(repeat|say (that|it) again|come again|pardon|didn'?t (catch|hear|get) (that|it|the question)"
+        r"|what was the question|one more time)\b"
+    ),
+    "thinking": re.compile(
+        r"\b(give me an? (minute|moment|second|sec)|let me think|need (a|some) (time|moment|minute)"
+        r"|one (moment|sec|second)|hold on|(i'?m|i am|still) thinking|take a (moment|minute|second))\b"
+    ),
+    "change": re.compile(
+        r"\b((different|another|new|other) question|change (the|this) question|skip (this|the) question"
+        r"|can we move on|next question)\b"
+    ),
+}
+
+# Anything matching these always goes to the LLM. Injection cues are phrases,
+# not single words like "instructions" or "hate" that genuine answers use
+SUSPICIOUS = re.compile(
+    r"\b(ignore (all|any|the|previous|above|your)|(previous|above|prior|your) instructions|system prompt"
+    r"|your prompt|you are now|pretend|jailbreak|developer mode|reveal (the|your)|confidential|api key|password"
+    r"|as an ai|language model|rubric|scoring (criteria|guide)|evaluation criteria"
+    r"|kill (you|yourself)|i hate you|stupid|idiot|shut up|fuck\w*|shit\w*|bitch\w*|damn)\b"
+    r"|https?://|[{}<>`]"
+)
+
+WORD = re.compile(r"[a-z']+")
+NARRATIVE = frozenset(
+    "i we my our me us team project manager customer customers decided worked built led launched delivered "
+    "deadline result results outcome improved reduced increased learned because then after when".split()
+)
+STOPWORDS = frozenset("a an and the to of in on for with at by it is was were be this that you your".split())
+# Behavioral question boilerplate; says nothing about the topic
+QUESTION_FILLER = frozenset(
+    "tell me about time times describe give example situation share walk through when how what which did do "
+    "can could would had have has make made".split()
+)
+
+# Logistic weights for "plainly a genuine answer" on long inputs
+SAFE_WEIGHTS = {
+    "bias": -4.0,
+    "log_words": 1.1,        # long, substantive answers
+    "narrative": 9.0,        # share of first-person / story words
+    "past_tense": 6.0,       # share of words ending in -ed
+    "question_marks": -1.5,  # answers rarely ask questions back
+    "topic_overlap": 2.0,    # share of the question's content words reused in the answer
+}
+
+MAX_CONTROL_WORDS = 12
+MIN_SAFE_WORDS = 25
+# Share of the question's topic words the answer must reuse before it can be
+# called safe locally: the style weights alone score an on-topic story and an
+# off-topic one the same
+MIN_TOPIC_OVERLAP = 0.15
+
+
+class LocalModerator:
+    """
+    First tier of moderation, sub-millisecond and deterministic. Resolves short
+    control phrases (repeat / thinking / change) and plainly genuine long
+    answers that stay on the question's topic; returns None for anything
+    ambiguous, off-topic or suspicious so the caller escalates to Gemini.
+    """
+
+    def __init__(self, safe_threshold=0.9):
+        self.safe_threshold = safe_threshold
+
+    def classify(self, question: str, user_input: str) -> Optional[str]:
+        text = user_input.lower().strip()
+        if not text or SUSPICIOUS.search(text):
+            return None
+
+        words = WORD.findall(text)
+        if len(words) <= MAX_CONTROL_WORDS:
+            matched = [label for label, pattern in CONTROL_PATTERNS.items() if pattern.search(text)]
+            # Exactly one intent, otherwise let the LLM sort it out
+            return matched[0] if len(matched) == 1 else None
+
+        if len(words) < MIN_SAFE_WORDS or topic_overlap(question, words) < MIN_TOPIC_OVERLAP:
+            return None
+        if self.safe_probability(question, text, words) >= self.safe_threshold:
+            return "safe"
+        return None
+
+    @staticmethod
+    def safe_probability(question: str, text: str, words) -> float:
+        features = {
+            "log_words": math.log(len(words)),
+            "narrative": sum(1 for w in words if w in NARRATIVE) / len(words),
+            "past_tense": sum(1 for w in words if w.endswith("ed")) / len(words),
+            "question_marks": text.count("?"),
+            "topic_overlap": topic_overlap(question, words),
+        }
+        z = SAFE_WEIGHTS["bias"] + sum(SAFE_WEIGHTS[name] * value for name, value in features.items())
+        return 1.0 / (1.0 + math.exp(-z))
+
+
+def _stem(word: str) -> str:
+    # Crude, but enough to match "disagreed" with "disagreement" or "deadline" with "deadlines"
+    return word[:6]
+
+
+def topic_overlap(question: str, words) -> float:
+    """Share of the question's topic words (stemmed) that also appear in the answer; 0.0 if it has none."""
+    topic = {_stem(w) for w in WORD.findall(question.lower()) if w not in STOPWORDS and w not in QUESTION_FILLER}
+    if not topic:
+        return 0.0
+    return len(topic & {_stem(w) for w in words}) / len(topic)
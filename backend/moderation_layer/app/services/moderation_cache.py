@@ -0,0 +1,58 @@
+import hashlib
+import re
+import time
+from collections import OrderedDict
+from typing import Optional
+from app.services.clients.gemini_client import MODERATION_CACHE_TTL_SECONDS, MODERATION_CACHE_MAX_ENTRIES
+
+SPACES = re.compile(r"\s+")
+
+
+def normalize(text: str) -> str:
+    # Transcripts of the same utterance differ mostly in case, spacing and trailing punctuation
+    return SPACES.sub(" ", text.lower()).strip().strip(".!?,;: ")
+
+
+class ModerationCache:
+    """TTL + LRU cache of moderation labels keyed by a hash of the normalized (question, user_input)."""
+
+    def __init__(self, ttl=MODERATION_CACHE_TTL_SECONDS, max_entries=MODERATION_CACHE_MAX_ENTRIES):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries = OrderedDict()  # key -> (expires_at, label), least recently used first
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @staticmethod
+    def key(question: str, user_input: str) -> str:
+        raw = normalize(question) + "\0" + normalize(user_input)
+        return hashlib.sha256(raw.encode()).hexdigest()
+
+    def get(self, key: str) -> Optional[str]:
+        entry = self._entries.get(key)
+        if entry is None or entry[0] <= time.monotonic():
+            if entry is not None:
+                del self._entries[key]
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry[1]
+
+    def put(self, key: str, label: str):
+        self._entries[key] = (time.monotonic() + self.ttl, label)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+        }
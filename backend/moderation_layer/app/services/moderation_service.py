@@ -1,15 +1,149 @@
+import asyncio
+from typing import List
 from app.services.base.moderation_model import GeminiModerationClient
-from app.services.builders.moderation_prompt_builder import build_moderation_prompt
-from app.schemas.moderation import ModerationResponse
+from app.services.builders.moderation_prompt_builder import build_moderation_prompt, build_moderation_batch_prompt
+from app.services.clients.gemini_client import MODERATION_BATCH_SIZE
+from app.services.local_moderator import LocalModerator
+from app.services.moderation_cache import ModerationCache
+from app.schemas.moderation import ModerationRequest, ModerationResponse
+
+VALID_LABELS = {"safe", "abusive", "off_topic", "malicious", "repeat", "change", "thinking"}
 
 class Moderator:
     def __init__(self):
         self.client = GeminiModerationClient()
+        self.local = LocalModerator()
+        self.cache = ModerationCache()
+        self._inflight = {}  # cache key -> task classifying it, shared by identical concurrent requests
+        self.local_counts = {}
+        self.cached = 0
+        self.coalesced = 0
+        self.escalated = 0
+        self.batch_calls = 0
+
+    def _local(self, question: str, user_input: str):
+        label = self.local.classify(question, user_input)
+        if label is not None:
+            self.local_counts[label] = self.local_counts.get(label, 0) + 1
+        return label
+
+    async def moderate(self, question: str, user_input: str) -> ModerationResponse:
+        # Stock control phrases and plainly genuine answers never reach Gemini
+        label = self._local(question, user_input)
+        if label is not None:
+            print(f"[MODERATION] Local classification: {label}")
+            return ModerationResponse(status=label)
+
+        key = ModerationCache.key(question, user_input)
+        label = self.cache.get(key)
+        if label is not None:
+            self.cached += 1
+            return ModerationResponse(status=label)
 
-    def moderate(self, question: str, user_input: str) -> ModerationResponse:
+        # Shielded so one caller disconnecting does not cancel the others' answer
+        return ModerationResponse(status=await asyncio.shield(self._escalate(key, question, user_input)))
+
+    def _escalate(self, key: str, question: str, user_input: str) -> asyncio.Future:
+        """Task classifying one item with Gemini, shared with an identical request already in flight."""
+        task = self._inflight.get(key)
+        if task is None:
+            self.escalated += 1
+            task = asyncio.ensure_future(self._classify(key, question, user_input))
+            self._inflight[key] = task
+            task.add_done_callback(lambda _: self._inflight.pop(key, None))
+        else:
+            self.coalesced += 1
+        return task
+
+    async def _classify(self, key: str, question: str, user_input: str) -> str:
         prompt = build_moderation_prompt(question, user_input)
-        classification = self.client.generate(prompt).strip().lower()
+        text = await self.client.generate(prompt)
+        if text is None:
+            return "safe"  # Gemini unavailable: let the turn through, but don't remember it
+        classification = text.strip().lower()
         print(f"[MODERATION] Classification: {classification}")
 
-        valid_labels = {"abusive", "off_topic", "malicious", "repeat", "change", "thinking"}
-        return ModerationResponse(status=classification if classification in valid_labels else "safe")
+        status = classification if classification in VALID_LABELS else "safe"
+        self.cache.put(key, status)
+        return status
+
+    async def moderate_batch(self, items: List[ModerationRequest]) -> List[ModerationResponse]:
+        """
+        Classifies many items with as few Gemini calls as possible: local and
+        cached results first, then the remaining distinct items in structured-output
+        batches of MODERATION_BATCH_SIZE, sent concurrently.
+        """
+        statuses = [None] * len(items)
+        pending = {}  # cache key -> (item, indexes of that item in the request)
+        for i, item in enumerate(items):
+            label = self._local(item.question, item.user_input)
+            if label is None:
+                key = ModerationCache.key(item.question, item.user_input)
+                label = self.cache.get(key)
+                if label is None:
+                    if key in pending:
+                        self.coalesced += 1
+                    pending.setdefault(key, (item, []))[1].append(i)
+                    continue
+                self.cached += 1
+            statuses[i] = label
+
+        keys = list(pending)
+        chunks = [keys[i:i + MODERATION_BATCH_SIZE] for i in range(0, len(keys), MODERATION_BATCH_SIZE)]
+        calls = 0
+        for labels, chunk_calls in await asyncio.gather(*(self._classify_batch(chunk, pending) for chunk in chunks)):
+            calls += chunk_calls
+            for key, label in labels.items():
+                for i in pending[key][1]:
+                    statuses[i] = label
+
+        print(f"[MODERATION] Batch of {len(items)}: {len(keys)} sent to Gemini in {calls} call(s)")
+        # Items Gemini failed on or left out fall back to "safe", uncached
+        return [ModerationResponse(status=status or "safe") for status in statuses]
+
+    async def _classify_batch(self, keys, pending):
+        """
+        Labels one chunk with a single structured call; returns the labels and
+        the number of Gemini calls made for them. Batch labels are returned
+        to this request only and never cached: items share one prompt, so an
+        injected item can sway its neighbours' labels, and the single-item
+        /moderate path must not inherit that. A reply whose ids do not match the
+        chunk exactly is discarded and the chunk is classified item by item,
+        each item counted once (escalated, or coalesced with a call in flight).
+        """
+        self.batch_calls += 1
+        prompt = build_moderation_batch_prompt([pending[key][0] for key in keys])
+        result = await self.client.generate_batch(prompt)
+        if result is None:
+            self.escalated += len(keys)
+            return {}, 1
+
+        ids = [entry.id for entry in result.labels]
+        if sorted(ids) != list(range(len(keys))):
+            print(f"[MODERATION] Batch reply ids {ids} do not match {len(keys)} item(s); classifying one by one")
+            escalated = self.escalated
+            tasks = [self._escalate(key, pending[key][0].question, pending[key][0].user_input) for key in keys]
+            single_calls = self.escalated - escalated
+            statuses = await asyncio.gather(*(asyncio.shield(task) for task in tasks))
+            return dict(zip(keys, statuses)), 1 + single_calls
+
+        self.escalated += len(keys)
+        labels = {}
+        for entry in result.labels:
+            status = entry.status.strip().lower()
+            labels[keys[entry.id]] = status if status in VALID_LABELS else "safe"
+        return labels, 1
+
+    def stats(self):
+        local = sum(self.local_counts.values())
+        total = local + self.cached + self.coalesced + self.escalated
+        return {
+            "total": total,
+            "local": self.local_counts,
+            "cached": self.cached,
+            "coalesced": self.coalesced,
+            "escalated": self.escalated,
+            "batch_calls": self.batch_calls,
+            "local_fraction": round(local / total, 4) if total else 0.0,
+            "cache": self.cache.stats(),
+        }
@@ -0,0 +1,113 @@
+import asyncio
+import os
+import time
+os.environ.setdefault("GEMINI_API_KEY", "test-key")  # the client module refuses to import without one
+
+from app.schemas.moderation import BatchLabel, BatchLabels, ModerationRequest
+from app.services.moderation_cache import ModerationCache
+from app.services.moderation_service import Moderator
+
+QUESTION = "Tell me about a time you disagreed with your manager"
+
+
+class FakeGemini:
+    def __init__(self, label="off_topic", batch_ids=None, delay=0.0):
+        self.label = label
+        self.batch_ids = batch_ids
+        self.delay = delay
+        self.calls = 0
+        self.batch_prompts = []
+
+    async def generate(self, prompt):
+        self.calls += 1
+        await asyncio.sleep(self.delay)
+        return self.label
+
+    async def generate_batch(self, prompt):
+        self.batch_prompts.append(prompt)
+        count = prompt.count("\nItem ")
+        ids = self.batch_ids if self.batch_ids is not None else range(count)
+        return BatchLabels(labels=[BatchLabel(id=i, status="malicious" if i == 0 else "off_topic") for i in ids])
+
+
+def make_moderator(fake):
+    moderator = Moderator()
+    moderator.client = fake
+    return moderator
+
+
+def item(answer):
+    return ModerationRequest(question=QUESTION, user_input=answer)
+
+
+def test_cache_key_ignores_case_spacing_and_edge_punctuation():
+    assert ModerationCache.key("Q?", "I  disagreed, then  left.") == ModerationCache.key("q", "i disagreed, then left")
+    assert ModerationCache.key("q", "yes") != ModerationCache.key("q", "no")
+
+
+def test_cache_expires_and_evicts_least_recently_used():
+    cache = ModerationCache(ttl=0.05, max_entries=2)
+    cache.put("a", "safe")
+    cache.put("b", "off_topic")
+    assert cache.get("a") == "safe"
+    cache.put("c", "abusive")  # evicts "b", the least recently used
+    assert cache.get("b") is None and cache.stats()["evictions"] == 1
+    time.sleep(0.06)
+    assert cache.get("a") is None
+
+
+def test_identical_requests_share_one_gemini_call_and_are_cached():
+    fake = FakeGemini(delay=0.01)
+    moderator = make_moderator(fake)
+
+    async def run():
+        first = await asyncio.gather(*(moderator.moderate(QUESTION, "pineapple pizza") for _ in range(5)))
+        again = await moderator.moderate(QUESTION, "Pineapple pizza!")
+        return first, again
+
+    first, again = asyncio.run(run())
+    assert {r.status for r in first} == {"off_topic"} and again.status == "off_topic"
+    assert fake.calls == 1
+    assert moderator.stats()["coalesced"] == 4 and moderator.stats()["cached"] == 1
+
+
+def test_unavailable_gemini_lets_the_turn_through_uncached():
+    fake = FakeGemini(label=None)
+    moderator = make_moderator(fake)
+    assert asyncio.run(moderator.moderate(QUESTION, "pineapple pizza")).status == "safe"
+    assert asyncio.run(moderator.moderate(QUESTION, "pineapple pizza")).status == "safe"
+    assert fake.calls == 2
+
+
+def test_batch_dedupes_and_does_not_feed_the_single_item_cache():
+    fake = FakeGemini(label="safe")
+    moderator = make_moderator(fake)
+    items = [item("first odd answer"), item("second odd answer"), item("First odd answer."), item("can you repeat that")]
+
+    results = asyncio.run(moderator.moderate_batch(items))
+    assert [r.status for r in results] == ["malicious", "off_topic", "malicious", "repeat"]
+    assert len(fake.batch_prompts) == 1 and moderator.stats()["batch_calls"] == 1
+
+    # A batch label must not decide what /moderate answers for the same input
+    assert asyncio.run(moderator.moderate(QUESTION, "second odd answer")).status == "safe"
+    assert fake.calls == 1
+
+
+def test_batch_reply_with_shifted_ids_is_discarded():
+    fake = FakeGemini(label="safe", batch_ids=[1, 2])
+    moderator = make_moderator(fake)
+    results = asyncio.run(moderator.moderate_batch([item("first odd answer"), item("second odd answer")]))
+    assert [r.status for r in results] == ["safe", "safe"]  # from single-item calls, not the batch
+    assert fake.calls == 2
+
+
+def test_batch_id_mismatch_counts_each_item_once(capsys):
+    fake = FakeGemini(label="safe", batch_ids=[0, 0, 5])
+    moderator = make_moderator(fake)
+    answers = ["first odd answer", "second odd answer", "third odd answer"]
+    results = asyncio.run(moderator.moderate_batch([item(answer) for answer in answers]))
+    assert [r.status for r in results] == ["safe"] * 3
+    stats = moderator.stats()
+    assert (stats["total"], stats["escalated"], stats["coalesced"]) == (3, 3, 0)
+    assert stats["cache"]["misses"] == 3
+    assert "in 4 call(s)" in capsys.readouterr().out
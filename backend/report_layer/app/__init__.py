@@ -0,0 +1,5 @@
+import os
+import sys
+
+# Modules shared by the backend services live in backend/common
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../..")))
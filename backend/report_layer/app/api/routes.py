@@ -1,4 +1,4 @@
-
+import asyncio
 from fastapi.responses import FileResponse
 from app.services.report_services import analyze_all_principles_for_session
 from app.services.utils.create_pdf import generate_pdf_from_json
@@ -6,26 +6,27 @@ from fastapi import APIRouter, HTTPException
 from pydantic import BaseModel
 from app.services.utils.clean_report import clean_full_report
 from app.schemas.schema import SessionIDRequest
+from common.resilience import resilience_stats
 
 router = APIRouter()
 
 @router.post("/get_report")
-def get_report(request: SessionIDRequest):
+async def get_report(request: SessionIDRequest):
     try:
-        report_results = analyze_all_principles_for_session(request.session_id)
+        report_results = await analyze_all_principles_for_session(request.session_id)
         return {"session_id": request.session_id, "report": report_results}
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
 
 @router.post("/get_report_pdf")
-def get_report_pdf(request: SessionIDRequest):
+async def get_report_pdf(request: SessionIDRequest):
     
     try:
-        full_report = analyze_all_principles_for_session(request.session_id)
+        full_report = await analyze_all_principles_for_session(request.session_id)
         
         lp_reports = clean_full_report({"report": full_report} )
         
-        pdf_path = generate_pdf_from_json(lp_reports, output_path=f"{request.session_id}_report.pdf")
+        pdf_path = await asyncio.to_thread(generate_pdf_from_json, lp_reports, output_path=f"{request.session_id}_report.pdf")
 
         return FileResponse(
             path=pdf_path,
@@ -34,3 +35,7 @@ def get_report_pdf(request: SessionIDRequest):
         )
     except Exception as e:
         raise HTTPException(status_code=400, detail=f"Error in get_report_pdf: {e}")
+
+@router.get("/resilience/stats")
+async def report_resilience_stats():
+    return resilience_stats()
@@ -7,6 +7,16 @@ class Settings:
     ENV: str = os.getenv("ENV", "dev")
     MONGO_URI: str = os.getenv("MONGO_URI", "")
     GEMINI_API_KEY = os.getenv("GEMINI_API_KEY","")
+
+    # Resilience for report analysis calls (one per LP block)
+    REPORT_LLM_DEADLINE: float = float(os.getenv("REPORT_LLM_DEADLINE", "60"))
+    REPORT_LLM_RETRIES: int = int(os.getenv("REPORT_LLM_RETRIES", "2"))
+    # Off by default: a losing guard call runs in a thread and cannot be cancelled
+    REPORT_HEDGE: bool = os.getenv("REPORT_HEDGE", "false").lower() == "true"
+    REPORT_HEDGE_DELAY: float = float(os.getenv("REPORT_HEDGE_DELAY", "20"))
+    BREAKER_FAILURE_RATE: float = float(os.getenv("BREAKER_FAILURE_RATE", "0.5"))
+    BREAKER_MIN_CALLS: int = int(os.getenv("BREAKER_MIN_CALLS", "5"))
+    BREAKER_COOLDOWN_SECONDS: float = float(os.getenv("BREAKER_COOLDOWN_SECONDS", "60"))
     
 
 settings = Settings()
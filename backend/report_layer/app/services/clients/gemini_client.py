@@ -1,6 +1,8 @@
-
+import asyncio
+import time
 import google.generativeai as genai
 from app.core.config import settings
+from common.resilience import CircuitBreaker, get_caller
 from app.services.base.llm_base import LLMClientBase
 from app.schemas.schema import ReportResponse
 from guardrails import Guard
@@ -21,29 +23,66 @@ class GeminiClient(LLMClientBase):
     def __init__(self):
         
         self.model = _gemini_model 
+        self.resilience = get_caller(
+            "report_analysis",
+            deadline=settings.REPORT_LLM_DEADLINE,
+            retries=settings.REPORT_LLM_RETRIES,
+            hedge=settings.REPORT_HEDGE,
+            hedge_delay=settings.REPORT_HEDGE_DELAY,
+            # A timed-out guard() thread cannot be stopped; a retry would run next to it
+            retry_timeouts=False,
+            breaker=CircuitBreaker(
+                failure_rate=settings.BREAKER_FAILURE_RATE,
+                min_calls=settings.BREAKER_MIN_CALLS,
+                slow_call=settings.REPORT_LLM_DEADLINE * 0.8,
+                cooldown=settings.BREAKER_COOLDOWN_SECONDS
+            )
+        )
 
-    def generate(self, prompt: str, temperature: float = 0.1) -> ReportResponse | str:
-        try: 
+    def _attempt(self, prompt: str, temperature: float, timeout: float):
+        start = time.monotonic()
+        try:
             result = guard(
                 messages=[{"role":"user", "content":prompt}],
                 model="gemini/gemini-2.0-flash",
                 temperature=temperature,
-                max_tokens=5000 
+                max_tokens=5000,
+                timeout=timeout
                 )
+        except Exception as e:
+            if time.monotonic() - start >= timeout:
+                raise TimeoutError(f"Report analysis attempt used its {timeout:.0f}s budget") from e
+            raise
+        if result.validated_output is None:
+            # Counts as a failed attempt so it is retried
+            raise ValueError("Guardrails could not validate the report output")
+        return result.validated_output
 
-            return result.validated_output
+    async def generate(self, prompt: str, temperature: float = 0.1) -> ReportResponse | str:
+        try: 
+            # guard() is blocking and each attempt runs in a worker thread that cannot be
+            # cancelled, so every attempt is only given the time left before the shared
+            # deadline: an abandoned thread ends with the call instead of outliving it
+            deadline = time.monotonic() + self.resilience.deadline
+            return await self.resilience.call(lambda: self._attempt_in_thread(prompt, temperature, deadline))
         except Exception as e:
             logging.exception("Guardrails validation failed.")
             return f"[Gemini Error] {str(e)}"
 
-    def generate_with_conversation(self, conversation: list[str], intended_lp: str) -> ReportResponse | str:
+    async def _attempt_in_thread(self, prompt: str, temperature: float, deadline: float):
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            raise TimeoutError("No time left for another report analysis attempt")
+        return await asyncio.to_thread(self._attempt, prompt, temperature, remaining)
+
+    async def generate_with_conversation(self, conversation: list[str], intended_lp: str) -> ReportResponse | str:
         try:
             prompt_text = prompt_template.render(
                 conversation_text="\n".join(conversation),
                 # lp_type=intended_lp
             )
             
-            return self.generate(prompt_text)
+            return await self.generate(prompt_text)
         except Exception as e:
             logging.exception("Prompt generation failed.")
             return f"[Prompt Error] {str(e)}"
@@ -1,9 +1,10 @@
+import asyncio
 from typing import List, Dict, Any
 from app.services.clients.gemini_client import gemini_client
 from app.services.builders.prompt_builder import render_prompt
 from app.db.db_handler import get_all_conversations_by_session
 
-def analyze_lp_from_doc(doc: Dict[str, Any]) -> str:
+async def analyze_lp_from_doc(doc: Dict[str, Any]) -> str:
     lp_type = doc.get("principle", "unknown")
 
     conversation = []
@@ -16,16 +17,16 @@ def analyze_lp_from_doc(doc: Dict[str, Any]) -> str:
         conversation.append(f"Candidate: {fup.get('answer', '')}")
 
     conversation_text = "\n".join(conversation)
-    result = gemini_client.generate_with_conversation(conversation_text, lp_type)
+    result = await gemini_client.generate_with_conversation(conversation_text, lp_type)
     return result
 
-def analyze_all_principles_for_session(session_id: str) -> List[Dict[str, Any]]:
-    docs = get_all_conversations_by_session(session_id)
+async def analyze_all_principles_for_session(session_id: str) -> List[Dict[str, Any]]:
+    docs = await asyncio.to_thread(get_all_conversations_by_session, session_id)
     results = []
 
     for doc in docs:
         try:
-            result = analyze_lp_from_doc(doc)
+            result = await analyze_lp_from_doc(doc)
 
             results.append({
                 
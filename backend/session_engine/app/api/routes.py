@@ -1,12 +1,16 @@
 from fastapi import APIRouter, WebSocket, Depends, WebSocketDisconnect, Query
 from session_engine.engine.websocket_engine import WebSocketInterviewSession
 from session_engine.services.tts_handler import TTSHandler
+from session_engine.engine.session_registry import create_session_registry, LeaseKeeper
+import logging
+import uuid
 import jwt
 from jwt import ExpiredSignatureError, PyJWTError
 from auth_service.app.core import config
 
 router = APIRouter()
-active_sessions = set()  # Session deduplication
+session_registry = create_session_registry()
+lease_keeper = LeaseKeeper(session_registry)
 
 @router.websocket("/ws/interview")
 async def websocket_interview(websocket: WebSocket, token: str = Query(...)):
@@ -27,12 +31,18 @@ async def websocket_interview(websocket: WebSocket, token: str = Query(...)):
         await websocket.close(code=403)
         return
     
-    # Session deduplication
-    if not user_id in active_sessions:
-        active_sessions.add(user_id)
-        print(f"🔍 [DEBUG] Added user {user_id} to active sessions. Total: {len(active_sessions)}")
-    else:
-        print(f"🚨 [DEBUG] User {user_id} already has active session. Rejecting.")
+    # Session deduplication across all workers
+    session_id = str(uuid.uuid4())
+    try:
+        acquired = await session_registry.acquire(user_id, session_id)
+    except Exception as e:
+        # Registry outage should not take interviews down with it
+        logging.error(f"Session registry unavailable, admitting user {user_id} without dedup: {e}")
+        acquired = None
+
+    if acquired is False:
+        existing = await session_registry.lookup(user_id)
+        print(f"🚨 [DEBUG] User {user_id} already has active session {existing}. Rejecting.")
         await websocket.accept()
         await websocket.send_json({
             "type": "terminate",
@@ -40,14 +50,17 @@ async def websocket_interview(websocket: WebSocket, token: str = Query(...)):
         })
         await websocket.close()
         return
-    
+
     await websocket.accept()
-    
-    # Initialize TTS handler and enhanced session with TTS coordination
-    tts_handler = TTSHandler()
-    session = WebSocketInterviewSession(user_id=user_id, websocket=websocket, tts_handler=tts_handler)
-    
+
     try:
+        # Initialize TTS handler and enhanced session with TTS coordination
+        tts_handler = TTSHandler()
+        session = WebSocketInterviewSession(user_id=user_id, websocket=websocket, tts_handler=tts_handler, session_id=session_id)
+        if acquired:
+            lease_keeper.hold(user_id, session_id, on_lost=session.cancel_event.set)
+            print(f"🔍 [DEBUG] User {user_id} holds session lease {session_id} on worker {session_registry.owner}")
+
         print(f"🎤 [SESSION] Starting coordinated interview session for user {user_id}")
         await session.start()
     except WebSocketDisconnect:
@@ -58,7 +71,11 @@ async def websocket_interview(websocket: WebSocket, token: str = Query(...)):
         traceback.print_exc()
     finally:
         # Session cleanup
-        print(f"🔍 [DEBUG] Removing user {user_id} from active sessions")
-        active_sessions.discard(user_id)
-        print(f"🔍 [DEBUG] Active sessions remaining: {len(active_sessions)}")
-        print(f"🎤 [SESSION] Interview session ended for user {user_id}")
\ No newline at end of file
+        print(f"🔍 [DEBUG] Releasing session lease for user {user_id}")
+        lease_keeper.drop(user_id)
+        if acquired:
+            try:
+                await session_registry.release(user_id, session_id)
+            except Exception as e:
+                logging.error(f"Failed to release session lease for user {user_id}; it will expire: {e}")
+        print(f"🎤 [SESSION] Interview session ended for user {user_id}")
@@ -1,8 +1,13 @@
 import sys, os
+import asyncio
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../../")))
 from fastapi import FastAPI
 from session_engine.app.api.routes import router as session_router
 from fastapi.middleware.cors import CORSMiddleware
+from session_engine.services.http_client import close_http_client
+from session_engine.services.stt_client import close_stt_client
+from session_engine.engine.heartbeat import heartbeat_scheduler
+from session_engine.custom_logging.db_handler import close_mongo_logger
 
 app = FastAPI(title="Session Engine")
 app.add_middleware(
@@ -13,3 +18,12 @@ app.add_middleware(
     allow_headers=["*"],
 )
 app.include_router(session_router, prefix="/session")
+
+
+@app.on_event("shutdown")
+async def shutdown():
+    await heartbeat_scheduler.stop()
+    await close_http_client()
+    await close_stt_client()
+    # Write any interview logs still queued before the worker exits
+    await asyncio.to_thread(close_mongo_logger)
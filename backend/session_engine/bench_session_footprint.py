@@ -0,0 +1,67 @@
+"""
+Reports memory held per idle interview session.
+
+Run from backend/:
+    python -m session_engine.bench_session_footprint --sessions 1000
+"""
+import argparse
+import gc
+import json
+import tracemalloc
+from session_engine.config.constants import QUESTION_FILE
+from session_engine.custom_logging import logger
+from session_engine.engine.question_bank import get_question_bank
+from session_engine.engine.lp_selector import LPSelector
+from session_engine.engine.websocket_engine import WebSocketInterviewSession
+from session_engine.services.tts_handler import TTSHandler
+
+
+class IdleWebSocket:
+    """Stands in for a connected client; an idle session never touches it."""
+
+
+class OfflineDbLogger:
+    """Stands in for the shared Mongo logger so the benchmark runs without a database."""
+
+
+def bytes_per_object(factory, count):
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    objects = [factory() for _ in range(count)]
+    gc.collect()
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del objects
+    return (after - before) / count
+
+
+def private_bank_copy():
+    with open(QUESTION_FILE, "r") as f:
+        return json.load(f)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sessions", type=int, default=1000)
+    args = parser.parse_args()
+
+    # Shared, process-wide state is created once outside the measurement
+    db_logger = OfflineDbLogger()
+    logger.get_mongo_logger = lambda: db_logger
+    bank = get_question_bank()
+    tts = TTSHandler()
+    WebSocketInterviewSession("warmup", IdleWebSocket(), tts)
+
+    rows = [
+        ("idle WebSocketInterviewSession", lambda: WebSocketInterviewSession("bench-user", IdleWebSocket(), tts)),
+        ("LPSelector (question state)", lambda: LPSelector(bank)),
+        ("private questions.json copy (old per-session cost)", private_bank_copy),
+    ]
+    print(f"{args.sessions} sessions, {len(bank)} principles, {sum(map(len, bank.questions))} questions")
+    for label, factory in rows:
+        print(f"{label:<52} {bytes_per_object(factory, args.sessions):>10,.0f} bytes/session")
+
+
+if __name__ == "__main__":
+    main()
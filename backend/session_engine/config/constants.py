@@ -4,8 +4,46 @@ MIN_LP_QUESTIONS = 1
 FOLLOW_UP_COUNT = 1
 LLM_ENDPOINT = "http://localhost:8000/generate-followup"
 SHOULD_GENERATE_ENDPOINT = "http://localhost:8000/should-followup"
+NEXT_TURN_ENDPOINT = "http://localhost:8000/next-turn"
+RECORD_TURN_ENDPOINT = "http://localhost:8000/record-turn"
 MODERATION_ENDPOINT = "http://localhost:8100/moderate"
 REPORT_ENDPOINT = "http://localhost:8080/get_report"
+STT_MUX_ENDPOINT = "ws://localhost:8002/ws/transcribe/mux"
 SESSION_ENGINE_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
 
 QUESTION_FILE = os.path.join(SESSION_ENGINE_DIR, "questions.json")
+# Follow-ups pre-generated offline (lp_followup_engine: python -m app.services.followup_bank_job)
+FOLLOWUP_BANK_FILE = os.path.join(SESSION_ENGINE_DIR, "followup_bank.jsonl")
+
+# Outbound HTTP to the moderation / follow-up services (seconds)
+HTTP_MAX_CONNECTIONS = 200
+HTTP_MAX_KEEPALIVE_CONNECTIONS = 50
+HTTP_KEEPALIVE_EXPIRY = 30
+HTTP_CONNECT_TIMEOUT = 2.0
+MODERATION_TIMEOUT = 5.0
+FOLLOWUP_DECISION_TIMEOUT = 8.0
+FOLLOWUP_GENERATION_TIMEOUT = 12.0
+# Past this many seconds the next-turn call is abandoned for a pre-generated follow-up
+FOLLOWUP_LATENCY_BUDGET = float(os.getenv("FOLLOWUP_LATENCY_BUDGET", "6.0"))
+
+# Start the next-turn call alongside moderation; discarded if the answer is not usable
+SPECULATIVE_FOLLOWUP = True
+# Stream follow-ups sentence by sentence to the browser instead of waiting for the full text
+STREAM_FOLLOWUPS = True
+# Run the turn pipeline on the transcript so far when the candidate's silence nears
+# the STT service's end-of-answer threshold; the result is used if the final answer
+# matches, so the next question is ready at once. A later pause replaces the run.
+EARLY_TURN = True
+EARLY_TURN_MIN_WORDS = 3
+
+# Seconds between heartbeats sent by the worker-wide scheduler to every live session
+HEARTBEAT_INTERVAL = float(os.getenv("HEARTBEAT_INTERVAL", "2.0"))
+
+# How often (seconds) to stat questions.json for changes before reloading the shared bank
+QUESTION_BANK_RELOAD_INTERVAL = float(os.getenv("QUESTION_BANK_RELOAD_INTERVAL", "5.0"))
+
+# One-interview-per-user registry shared by all workers: "memory", "sqlite" or "redis"
+SESSION_REGISTRY_BACKEND = os.getenv("SESSION_REGISTRY_BACKEND", "memory")
+SESSION_REGISTRY_SQLITE_PATH = os.getenv("SESSION_REGISTRY_SQLITE_PATH", os.path.join(SESSION_ENGINE_DIR, "active_sessions.db"))
+SESSION_REGISTRY_REDIS_URL = os.getenv("SESSION_REGISTRY_REDIS_URL", "redis://localhost:6379/0")
+SESSION_LEASE_TTL = float(os.getenv("SESSION_LEASE_TTL", "30"))
@@ -1,17 +1,60 @@
 from pymongo import MongoClient
+from pymongo.errors import BulkWriteError, PyMongoError
 from datetime import datetime
+import atexit
+import logging
+import queue
+import threading
+import time
 import os
 from dotenv import load_dotenv
 
 load_dotenv()
 MONGO_URI = os.getenv("MONGO_URI")
 
+LOG_MAX_PENDING = int(os.getenv("MONGO_LOG_MAX_PENDING", "10000"))
+LOG_BATCH_SIZE = int(os.getenv("MONGO_LOG_BATCH_SIZE", "100"))
+LOG_FLUSH_INTERVAL = float(os.getenv("MONGO_LOG_FLUSH_INTERVAL", "1.0"))
+LOG_WRITE_RETRIES = 3
+DUPLICATE_KEY = 11000
+
+_STOP = object()
+
+class _Flush:
+    """Queued by flush(); set once every document queued before it is written or failed."""
+
+    def __init__(self):
+        self.done = threading.Event()
+
 class MongoLogger:
-    def __init__(self, db_name="alp_interviews", collection_name="sessions"):
+    """
+    Process-wide write-behind interview logger. log_lp_block only enqueues the
+    document; a background thread writes batches with an unordered insert_many
+    once `batch_size` documents are waiting or `flush_interval` seconds have
+    passed. At most `max_pending` documents are held; beyond that new documents
+    are dropped and counted. close() writes everything still queued.
+    """
+
+    def __init__(self, db_name="alp_interviews", collection_name="sessions",
+                 max_pending=LOG_MAX_PENDING, batch_size=LOG_BATCH_SIZE, flush_interval=LOG_FLUSH_INTERVAL):
         self.client = MongoClient(MONGO_URI)
         self.db = self.client[db_name]
         self.collection = self.db[collection_name]
 
+        self.max_pending = max_pending
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+
+        self._queue = queue.Queue()
+        self._state = threading.Lock()
+        self._pending = 0
+        self.written = 0
+        self.dropped = 0
+        self.failed = 0
+
+        self._thread = threading.Thread(target=self._run, name="mongo-log-writer", daemon=True)
+        self._thread.start()
+
     def log_lp_block(self, session_id, user_id, principle, main_question, main_answer, followups):
         doc = {
             "session_id": session_id,
@@ -24,7 +67,120 @@ class MongoLogger:
             "followups": followups,
             "timestamp": datetime.now().isoformat()
         }
-        self.collection.insert_one(doc)
+        with self._state:
+            if self._pending >= self.max_pending:
+                self.dropped += 1
+                logging.error(f"Mongo log queue full ({self._pending} pending); dropping LP block for session {session_id}")
+                return
+            self._pending += 1
+        self._queue.put(doc)
+
+    def flush(self, timeout=5.0):
+        """
+        Block until everything queued so far is written (or failed). Documents
+        queued by other sessions after this call are not waited for.
+        Returns False on timeout.
+        """
+        marker = _Flush()
+        self._queue.put(marker)
+        return marker.done.wait(timeout)
+
+    def stats(self):
+        with self._state:
+            return {"pending": self._pending, "written": self.written, "dropped": self.dropped, "failed": self.failed}
+
+    def _run(self):
+        stopping = False
+        while not stopping:
+            batch, flushes, stopping = self._next_batch()
+            if batch:
+                self._write(batch)
+            for marker in flushes:
+                marker.done.set()
+
+    def _next_batch(self):
+        batch = []
+        flushes = []
+        deadline = None
+        while len(batch) < self.batch_size:
+            timeout = None if deadline is None else deadline - time.monotonic()
+            if timeout is not None and timeout <= 0:
+                break
+            try:
+                item = self._queue.get(timeout=timeout)
+            except queue.Empty:
+                break
+            if item is _STOP:
+                return batch, flushes, True
+            if isinstance(item, _Flush):
+                # Everything queued before the marker is in this batch or already written
+                flushes.append(item)
+                break
+            batch.append(item)
+            if deadline is None:
+                # The time trigger starts with the first document of the batch
+                deadline = time.monotonic() + self.flush_interval
+        return batch, flushes, False
+
+    def _write(self, batch):
+        # insert_many sets each document's _id on the first attempt, so a retry of
+        # a document that did reach the server fails with a duplicate key instead
+        # of inserting it twice
+        remaining = batch
+        for attempt in range(LOG_WRITE_RETRIES):
+            try:
+                self.collection.insert_many(remaining, ordered=False)
+                remaining = []
+            except BulkWriteError as e:
+                # Unordered insert: everything except the listed indexes was written
+                failed_indexes = sorted(
+                    err["index"] for err in e.details.get("writeErrors", []) if err.get("code") != DUPLICATE_KEY
+                )
+                remaining = [remaining[i] for i in failed_indexes]
+                if remaining:
+                    logging.warning(f"Mongo batch write left {len(remaining)} LP block(s) unwritten (attempt {attempt + 1}/{LOG_WRITE_RETRIES})")
+            except PyMongoError as e:
+                logging.warning(f"Mongo batch write failed (attempt {attempt + 1}/{LOG_WRITE_RETRIES}): {e}")
+            if not remaining:
+                break
+            if attempt + 1 < LOG_WRITE_RETRIES:
+                time.sleep(0.5 * (attempt + 1))
+
+        failed = len(remaining)
+        written = len(batch) - failed
+        if failed:
+            logging.error(f"Dropping {failed} LP block(s) after {LOG_WRITE_RETRIES} failed writes")
+
+        with self._state:
+            self._pending -= len(batch)
+            self.written += written
+            self.failed += failed
+
+    def close(self, timeout=10.0):
+        """Flush queued documents, stop the writer thread and close the client."""
+        if self._thread.is_alive():
+            self._queue.put(_STOP)
+            self._thread.join(timeout=timeout)
+            if self._thread.is_alive():
+                logging.error(f"Mongo log writer did not finish within {timeout}s; {self._pending} block(s) unwritten")
+        self.client.close()
+
+
+_logger = None
+_logger_lock = threading.Lock()
+
+def get_mongo_logger():
+    """Shared logger for the whole process (one client, one connection pool)."""
+    global _logger
+    with _logger_lock:
+        if _logger is None:
+            _logger = MongoLogger()
+            atexit.register(close_mongo_logger)
+        return _logger
 
-    def close(self):
-        self.client.close()
\ No newline at end of file
+def close_mongo_logger():
+    global _logger
+    with _logger_lock:
+        if _logger is not None:
+            _logger.close()
+        _logger = None
@@ -0,0 +1,99 @@
+import asyncio
+import logging
+import re
+from session_engine.config.constants import EARLY_TURN, EARLY_TURN_MIN_WORDS
+
+NON_WORD = re.compile(r"[^a-z0-9']+")
+
+
+def normalize(text: str) -> str:
+    # Partials and the final transcript differ in case and punctuation
+    return NON_WORD.sub(" ", text.lower()).strip()
+
+
+class EarlyTurn:
+    """
+    Starts the turn pipeline (moderation / intent, follow-up decision and text)
+    on the transcript so far when the STT service reports that the candidate's
+    silence is nearing its end-of-answer threshold ("pause" segments), while
+    they may still go on. A later pause with new words replaces the earlier run.
+    When the answer is complete, result() reuses the latest speculative run if
+    it was computed on the same words, and otherwise discards it and processes
+    the answer normally. Speculative runs store nothing in the follow-up engine;
+    the final answer is recorded once when a run is reused.
+
+    `question` may be set after construction, e.g. once a streamed follow-up
+    has been spoken in full. `time_remaining` is a callable so each run sees
+    the session time left when it starts.
+    """
+
+    def __init__(self, pipeline, lp, question, num_followups, num_lp_questions, time_remaining, want_followup=True,
+                 enabled: bool = EARLY_TURN, min_words: int = EARLY_TURN_MIN_WORDS):
+        self.pipeline = pipeline
+        self.lp = lp
+        self.question = question
+        self.num_followups = num_followups
+        self.num_lp_questions = num_lp_questions
+        self.time_remaining = time_remaining
+        self.want_followup = want_followup
+        self.enabled = enabled
+        self.min_words = min_words
+        self.attempts = 0
+        self._text = None  # normalized transcript the current task was started on
+        self._task = None
+
+    def _process(self, answer, record=True):
+        return self.pipeline.process(
+            self.lp, self.question, answer, self.num_followups, self.num_lp_questions, self.time_remaining(),
+            want_followup=self.want_followup, record=record
+        )
+
+    def observe(self, segment):
+        """Feed one transcript segment from WebSocketQuestionHandler.stream_user_response()."""
+        if not self.enabled or segment.kind != "pause" or self.question is None:
+            return
+        text = normalize(segment.text)
+        if len(text.split()) < self.min_words or text == self._text:
+            return
+        self._cancel()
+        self.attempts += 1
+        self._text = text
+        self._task = asyncio.create_task(self._process(segment.text, record=False))
+        logging.info(f"Early turn #{self.attempts} started on {len(text.split())} words")
+
+    def _cancel(self):
+        if self._task is None:
+            return
+        task, self._task = self._task, None
+        task.cancel()
+        # A run that already finished may hold a follow-up stream that must be stopped
+        task.add_done_callback(_discard_result)
+
+    async def result(self, answer):
+        """TurnResult for the final `answer`, reused from the early run when it saw the same words."""
+        if self._task is not None and normalize(answer) == self._text:
+            task, self._task = self._task, None
+            logging.info(f"Early turn used (attempt {self.attempts}, done={task.done()})")
+            try:
+                turn = await task
+            except Exception:
+                logging.exception("Early turn failed; processing the answer again")
+            else:
+                if self.want_followup and turn.is_answer:
+                    await self.pipeline.record(self.lp, self.question, answer)
+                return turn
+        await self.discard()
+        return await self._process(answer)
+
+    async def discard(self):
+        """Stop any speculative run; call when the answer is not going to be processed."""
+        if self._task is not None:
+            task = self._task
+            self._cancel()
+            await asyncio.gather(task, return_exceptions=True)
+
+
+def _discard_result(task):
+    if task.cancelled() or task.exception() is not None:
+        return
+    asyncio.ensure_future(task.result().discard())
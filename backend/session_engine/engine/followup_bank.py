@@ -0,0 +1,85 @@
+import json
+import logging
+import re
+import threading
+from typing import Optional
+from session_engine.config.constants import FOLLOWUP_BANK_FILE
+
+WORD = re.compile(r"[a-z0-9']+")
+STOPWORDS = frozenset(
+    "a an and are as at be but by for from had has have he her his i in is it its me my of on or our she so that "
+    "the their them they this to was we were what when which who will with you your".split()
+)
+
+
+def tokens(text: str) -> frozenset:
+    return frozenset(w for w in WORD.findall(text.lower()) if w not in STOPWORDS)
+
+
+class FollowupBank:
+    """
+    Follow-ups pre-generated offline for each main question
+    (lp_followup_engine/app/services/followup_bank_job.py). pick() matches the
+    candidate's answer against each follow-up's keywords in microseconds.
+    """
+    __slots__ = ("_by_question", "_by_principle")
+
+    def __init__(self, records=()):
+        self._by_question = {}   # (principle, question) -> ((followup, keyword tokens), ...)
+        self._by_principle = {}  # principle -> same, across all of its questions
+        for record in records:
+            entries = tuple(
+                (f["question"], tokens(" ".join(f["keywords"])))
+                for f in record["followups"]
+            )
+            self._by_question[(record["principle"], record["question"])] = entries
+            self._by_principle[record["principle"]] = self._by_principle.get(record["principle"], ()) + entries
+
+    @classmethod
+    def load(cls, path: str = FOLLOWUP_BANK_FILE):
+        records = []
+        with open(path, "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    records.append(json.loads(line))
+                except ValueError:
+                    continue  # line cut off by an interrupted bank job
+        return cls(records)
+
+    def __len__(self):
+        return len(self._by_question)
+
+    def pick(self, principle: str, question: str, answer: str, exclude=()) -> Optional[str]:
+        """
+        Best pre-generated follow-up for this answer. `question` is the question
+        just answered: its own follow-ups are used when it is a main question,
+        otherwise every follow-up for the principle. Ties keep generation order.
+        """
+        candidates = self._by_question.get((principle, question)) or self._by_principle.get(principle, ())
+        answer_tokens = tokens(answer)
+        best, best_score = None, -1.0
+        for followup, keywords in candidates:
+            if followup == question or followup in exclude:
+                continue
+            score = len(keywords & answer_tokens) / (len(keywords) ** 0.5 or 1)
+            if score > best_score:
+                best, best_score = followup, score
+        return best
+
+
+_bank = None
+_lock = threading.Lock()
+
+def get_followup_bank(path: str = FOLLOWUP_BANK_FILE) -> FollowupBank:
+    """Shared bank, loaded once per process; empty if the offline job has not been run."""
+    global _bank
+    if _bank is None:
+        with _lock:
+            if _bank is None:
+                try:
+                    _bank = FollowupBank.load(path)
+                    logging.info(f"Loaded follow-up bank: {len(_bank)} main questions")
+                except OSError as e:
+                    logging.warning(f"No follow-up bank ({e}); falling back to a generic follow-up")
+                    _bank = FollowupBank()
+    return _bank
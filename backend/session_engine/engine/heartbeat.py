@@ -0,0 +1,57 @@
+import asyncio
+import logging
+import time
+from session_engine.config.constants import HEARTBEAT_INTERVAL
+
+
+class HeartbeatScheduler:
+    """
+    One periodic task per worker that sends a heartbeat to every live interview
+    session in a single batch. Dead sockets are detected by each session's
+    receive loop (the ASGI disconnect event), not here; a failed send only
+    removes the socket from the batch. Each send is bounded by the interval so
+    one stalled client cannot hold up the heartbeat for everyone else.
+    """
+
+    def __init__(self, interval: float = HEARTBEAT_INTERVAL):
+        self.interval = interval
+        self._sockets = {}
+        self._task = None
+
+    def register(self, session_key, websocket):
+        self._sockets[session_key] = websocket
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    def unregister(self, session_key):
+        self._sockets.pop(session_key, None)
+
+    @property
+    def session_count(self):
+        return len(self._sockets)
+
+    async def _run(self):
+        # Exits when the last session unregisters; the next register() restarts it
+        while self._sockets:
+            await asyncio.sleep(self.interval)
+            batch = list(self._sockets.items())
+            payload = {"type": "heartbeat", "timestamp": time.time()}
+            results = await asyncio.gather(
+                *(asyncio.wait_for(websocket.send_json(payload), self.interval) for _, websocket in batch),
+                return_exceptions=True
+            )
+            for (session_key, websocket), result in zip(batch, results):
+                # The key may have been re-registered with a new socket meanwhile
+                if isinstance(result, Exception) and self._sockets.get(session_key) is websocket:
+                    logging.info(f"Heartbeat send failed for session {session_key}: {type(result).__name__}")
+                    self.unregister(session_key)
+
+    async def stop(self):
+        self._sockets.clear()
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+
+heartbeat_scheduler = HeartbeatScheduler()
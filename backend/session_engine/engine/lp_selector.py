@@ -1,14 +1,20 @@
 import random
+from array import array
 
 class LPSelector:
-    def __init__(self, lp_questions):
-        self.lp_questions = lp_questions
-        self.asked = set()
+    def __init__(self, question_bank):
+        self.question_bank = question_bank
+        # Indices of principles not asked yet; the bank itself is shared
+        self.remaining = array("H", range(len(question_bank)))
+        self.current = None
 
     def pick_new_lp(self):
-        remaining = list(set(self.lp_questions.keys()) - self.asked)
-        if not remaining:
+        if not self.remaining:
             return None
-        lp = random.choice(remaining)
-        self.asked.add(lp)
-        return lp
\ No newline at end of file
+        i = random.randrange(len(self.remaining))
+        self.remaining[i], self.remaining[-1] = self.remaining[-1], self.remaining[i]
+        self.current = self.remaining.pop()
+        return self.question_bank.principles[self.current]
+
+    def pick_question(self):
+        return self.question_bank.random_question(self.current)
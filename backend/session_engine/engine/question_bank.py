@@ -0,0 +1,69 @@
+import json
+import logging
+import os
+import random
+import threading
+import time
+from session_engine.config.constants import QUESTION_FILE, QUESTION_BANK_RELOAD_INTERVAL
+
+
+class QuestionBank:
+    """
+    Read-only, indexed view of questions.json. One instance is shared by every
+    session in the process; sessions keep only indices into it.
+    """
+    __slots__ = ("principles", "questions", "_index", "mtime")
+
+    def __init__(self, data: dict, mtime: float = 0.0):
+        self.principles = tuple(data.keys())
+        self.questions = tuple(tuple(questions) for questions in data.values())
+        self._index = {principle: i for i, principle in enumerate(self.principles)}
+        self.mtime = mtime
+
+    @classmethod
+    def load(cls, path: str = QUESTION_FILE):
+        mtime = os.stat(path).st_mtime
+        with open(path, "r") as f:
+            return cls(json.load(f), mtime)
+
+    def __len__(self):
+        return len(self.principles)
+
+    def index_of(self, principle: str) -> int:
+        return self._index[principle]
+
+    def random_question(self, principle_index: int) -> str:
+        return random.choice(self.questions[principle_index])
+
+
+_bank = None
+_last_check = 0.0
+_lock = threading.Lock()
+
+def get_question_bank(path: str = QUESTION_FILE) -> QuestionBank:
+    """
+    Return the shared bank, reloading it when the file changes. The file is
+    stat'ed at most every QUESTION_BANK_RELOAD_INTERVAL seconds, and a reload
+    swaps the reference in one step, so running sessions keep the snapshot they
+    started with. A broken file keeps the previous bank in service.
+    """
+    global _bank, _last_check
+    now = time.monotonic()
+    if _bank is not None and now - _last_check < QUESTION_BANK_RELOAD_INTERVAL:
+        return _bank
+
+    with _lock:
+        if _bank is not None and now - _last_check < QUESTION_BANK_RELOAD_INTERVAL:
+            return _bank
+        _last_check = now
+        try:
+            if _bank is None or os.stat(path).st_mtime != _bank.mtime:
+                bank = QuestionBank.load(path)
+                if _bank is not None:
+                    logging.info(f"Reloaded question bank: {len(bank)} principles")
+                _bank = bank
+        except (OSError, ValueError) as e:
+            if _bank is None:
+                raise
+            logging.error(f"Question bank reload failed, keeping previous version: {e}")
+        return _bank
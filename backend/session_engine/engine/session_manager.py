@@ -2,8 +2,8 @@ import time
 import uuid
 
 class SessionManager:
-    def __init__(self):
-        self.session_id = str(uuid.uuid4())
+    def __init__(self, session_id=None):
+        self.session_id = session_id or str(uuid.uuid4())
         self.start_time = None
 
     def start_session(self):
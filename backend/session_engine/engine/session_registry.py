@@ -0,0 +1,246 @@
+import asyncio
+import json
+import logging
+import os
+import socket
+import sqlite3
+import time
+import uuid
+from abc import ABC, abstractmethod
+from contextlib import contextmanager
+from typing import Callable, Optional
+from session_engine.config.constants import (
+    SESSION_REGISTRY_BACKEND,
+    SESSION_REGISTRY_SQLITE_PATH,
+    SESSION_REGISTRY_REDIS_URL,
+    SESSION_LEASE_TTL,
+)
+
+# Identifies this worker process in registry entries
+WORKER_ID = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+
+
+class SessionRegistry(ABC):
+    """
+    Tracks which user has a live interview and which worker owns it. Entries are
+    leases: they expire after `ttl` seconds unless renewed, so a crashed worker
+    cannot block its users forever.
+    """
+
+    def __init__(self, ttl: float = SESSION_LEASE_TTL, owner: str = WORKER_ID):
+        self.ttl = ttl
+        self.owner = owner
+
+    @abstractmethod
+    async def acquire(self, user_id: str, session_id: str) -> bool:
+        """Take the user's lease for this session; False if another live session holds it."""
+
+    @abstractmethod
+    async def renew(self, user_id: str, session_id: str) -> bool:
+        """Extend a lease this worker holds; False if it was lost."""
+
+    @abstractmethod
+    async def release(self, user_id: str, session_id: str) -> None:
+        """Drop the lease if it still belongs to this session."""
+
+    @abstractmethod
+    async def lookup(self, user_id: str) -> Optional[dict]:
+        """Current entry for the user: session_id, owner and expires_at."""
+
+
+class InMemorySessionRegistry(SessionRegistry):
+    """Single-process registry; only correct with one worker."""
+
+    def __init__(self, ttl: float = SESSION_LEASE_TTL, owner: str = WORKER_ID):
+        super().__init__(ttl, owner)
+        self._entries = {}
+
+    def _live(self, user_id):
+        entry = self._entries.get(user_id)
+        if entry and entry["expires_at"] <= time.time():
+            del self._entries[user_id]
+            return None
+        return entry
+
+    async def acquire(self, user_id, session_id):
+        if self._live(user_id):
+            return False
+        self._entries[user_id] = {"session_id": session_id, "owner": self.owner, "expires_at": time.time() + self.ttl}
+        return True
+
+    async def renew(self, user_id, session_id):
+        entry = self._live(user_id)
+        if not entry or entry["session_id"] != session_id:
+            return False
+        entry["expires_at"] = time.time() + self.ttl
+        return True
+
+    async def release(self, user_id, session_id):
+        entry = self._entries.get(user_id)
+        if entry and entry["session_id"] == session_id:
+            del self._entries[user_id]
+
+    async def lookup(self, user_id):
+        entry = self._live(user_id)
+        return dict(entry) if entry else None
+
+
+class SQLiteSessionRegistry(SessionRegistry):
+    """Registry shared by workers on one host through a SQLite file."""
+
+    def __init__(self, path: str = SESSION_REGISTRY_SQLITE_PATH, ttl: float = SESSION_LEASE_TTL, owner: str = WORKER_ID):
+        super().__init__(ttl, owner)
+        self.path = path
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS active_sessions ("
+                "user_id TEXT PRIMARY KEY, session_id TEXT NOT NULL, owner TEXT NOT NULL, expires_at REAL NOT NULL)"
+            )
+
+    @contextmanager
+    def _connect(self):
+        conn = sqlite3.connect(self.path, timeout=5, isolation_level=None)
+        try:
+            yield conn
+        finally:
+            conn.close()
+
+    def _acquire(self, user_id, session_id):
+        now = time.time()
+        with self._connect() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            conn.execute("DELETE FROM active_sessions WHERE user_id = ? AND expires_at <= ?", (user_id, now))
+            cur = conn.execute(
+                "INSERT OR IGNORE INTO active_sessions VALUES (?, ?, ?, ?)",
+                (user_id, session_id, self.owner, now + self.ttl)
+            )
+            conn.execute("COMMIT")
+            return cur.rowcount == 1
+
+    def _renew(self, user_id, session_id):
+        now = time.time()
+        with self._connect() as conn:
+            cur = conn.execute(
+                "UPDATE active_sessions SET expires_at = ? WHERE user_id = ? AND session_id = ? AND expires_at > ?",
+                (now + self.ttl, user_id, session_id, now)
+            )
+            return cur.rowcount == 1
+
+    def _release(self, user_id, session_id):
+        with self._connect() as conn:
+            conn.execute("DELETE FROM active_sessions WHERE user_id = ? AND session_id = ?", (user_id, session_id))
+
+    def _lookup(self, user_id):
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT session_id, owner, expires_at FROM active_sessions WHERE user_id = ? AND expires_at > ?",
+                (user_id, time.time())
+            ).fetchone()
+        return {"session_id": row[0], "owner": row[1], "expires_at": row[2]} if row else None
+
+    async def acquire(self, user_id, session_id):
+        return await asyncio.to_thread(self._acquire, user_id, session_id)
+
+    async def renew(self, user_id, session_id):
+        return await asyncio.to_thread(self._renew, user_id, session_id)
+
+    async def release(self, user_id, session_id):
+        await asyncio.to_thread(self._release, user_id, session_id)
+
+    async def lookup(self, user_id):
+        return await asyncio.to_thread(self._lookup, user_id)
+
+
+# Compare-and-set scripts so a worker can only touch the lease it owns
+_RENEW_SCRIPT = """
+if redis.call('GET', KEYS[1]) == ARGV[1] then
+    return redis.call('PEXPIRE', KEYS[1], ARGV[2])
+end
+return 0
+"""
+_RELEASE_SCRIPT = """
+if redis.call('GET', KEYS[1]) == ARGV[1] then
+    return redis.call('DEL', KEYS[1])
+end
+return 0
+"""
+
+class RedisSessionRegistry(SessionRegistry):
+    """
+    Registry for several hosts, backed by any Redis-protocol store. `client` is a
+    redis.asyncio.Redis (or a compatible fake such as fakeredis for local runs).
+    """
+
+    def __init__(self, client, ttl: float = SESSION_LEASE_TTL, owner: str = WORKER_ID, prefix: str = "interview:active:"):
+        super().__init__(ttl, owner)
+        self.client = client
+        self.prefix = prefix
+
+    def _key(self, user_id):
+        return f"{self.prefix}{user_id}"
+
+    def _value(self, session_id):
+        return json.dumps({"session_id": session_id, "owner": self.owner})
+
+    async def acquire(self, user_id, session_id):
+        return bool(await self.client.set(self._key(user_id), self._value(session_id), nx=True, px=int(self.ttl * 1000)))
+
+    async def renew(self, user_id, session_id):
+        return bool(await self.client.eval(_RENEW_SCRIPT, 1, self._key(user_id), self._value(session_id), int(self.ttl * 1000)))
+
+    async def release(self, user_id, session_id):
+        await self.client.eval(_RELEASE_SCRIPT, 1, self._key(user_id), self._value(session_id))
+
+    async def lookup(self, user_id):
+        key = self._key(user_id)
+        value = await self.client.get(key)
+        if value is None:
+            return None
+        entry = json.loads(value)
+        ttl_ms = await self.client.pttl(key)
+        entry["expires_at"] = time.time() + max(ttl_ms, 0) / 1000
+        return entry
+
+
+class LeaseKeeper:
+    """Renews every lease held by this worker from one task, every ttl/3 seconds."""
+
+    def __init__(self, registry: SessionRegistry):
+        self.registry = registry
+        self._held = {}  # user_id -> (session_id, on_lost)
+        self._task = None
+
+    def hold(self, user_id: str, session_id: str, on_lost: Callable[[], None]):
+        self._held[user_id] = (session_id, on_lost)
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    def drop(self, user_id: str):
+        self._held.pop(user_id, None)
+
+    async def _run(self):
+        while self._held:
+            await asyncio.sleep(self.registry.ttl / 3)
+            for user_id, (session_id, on_lost) in list(self._held.items()):
+                try:
+                    renewed = await self.registry.renew(user_id, session_id)
+                except Exception as e:
+                    # Keep the session running; the lease still has time left
+                    logging.error(f"Lease renewal error for user {user_id}: {e}")
+                    continue
+                if not renewed and self._held.get(user_id, (None,))[0] == session_id:
+                    logging.warning(f"Lost session lease for user {user_id} (session {session_id}); ending session")
+                    self._held.pop(user_id, None)
+                    on_lost()
+
+
+def create_session_registry(backend: str = SESSION_REGISTRY_BACKEND) -> SessionRegistry:
+    if backend == "memory":
+        return InMemorySessionRegistry()
+    if backend == "sqlite":
+        return SQLiteSessionRegistry()
+    if backend == "redis":
+        import redis.asyncio as redis
+        return RedisSessionRegistry(redis.from_url(SESSION_REGISTRY_REDIS_URL))
+    raise ValueError(f"Unknown session registry backend: {backend}")
@@ -1,15 +1,14 @@
 
-import json
 import logging
-import random
 import sys
 import os
 project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
 if project_root not in sys.path:
     sys.path.insert(0, project_root)
-from session_engine.config.constants import SESSION_DURATION_LIMIT, MIN_LP_QUESTIONS, FOLLOW_UP_COUNT, QUESTION_FILE
+from session_engine.config.constants import SESSION_DURATION_LIMIT, MIN_LP_QUESTIONS, FOLLOW_UP_COUNT
 from session_engine.engine.session_manager import SessionManager
 from session_engine.engine.lp_selector import LPSelector
+from session_engine.engine.question_bank import get_question_bank
 from session_engine.services.moderation_service import ModerationService
 from session_engine.services.followup_manager import FollowupManager
 from session_engine.handlers.question_handler import QuestionHandler
@@ -29,12 +28,11 @@ logger.addHandler(file_handler)
 
 class TurnEngine:
     def __init__(self, user_id: str):
-        with open(QUESTION_FILE, "r") as f:
-            self.lp_questions = json.load(f)
+        self.question_bank = get_question_bank()
 
         self.session_manager = SessionManager()
         self.tts = TTSHandler()
-        self.lp_selector = LPSelector(self.lp_questions)
+        self.lp_selector = LPSelector(self.question_bank)
         self.moderator = ModerationService()
         self.logger = InteractionLogger(user_id)
         self.question_handler = QuestionHandler(self.tts, self.session_manager, SESSION_DURATION_LIMIT)
@@ -53,7 +51,7 @@ class TurnEngine:
             if not lp:
                 break
 
-            main_question = random.choice(self.lp_questions[lp])
+            main_question = self.lp_selector.pick_question()
             print(f"\n[Leadership Principle: {lp}]")
             logging.info(f"Starting LP block: {lp}")
 
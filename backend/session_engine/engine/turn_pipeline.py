@@ -0,0 +1,156 @@
+import asyncio
+import logging
+import time
+from dataclasses import dataclass
+from functools import partial
+from typing import AsyncIterator, Awaitable, Callable, Optional
+from session_engine.config.constants import SPECULATIVE_FOLLOWUP, STREAM_FOLLOWUPS, FOLLOWUP_LATENCY_BUDGET
+from session_engine.utils.stream_buffer import iter_sentences
+
+# Moderation labels that mean the answer must not advance the interview
+NON_ANSWER_STATUSES = {"off_topic", "repeat", "change", "thinking", "abusive", "malicious"}
+
+
+@dataclass
+class TurnResult:
+    mod_status: str
+    should_followup: bool = False
+    followup: Optional[str] = None
+    # Set instead of `followup` in streaming mode: complete sentences as they are generated
+    followup_stream: Optional[AsyncIterator[str]] = None
+    # Pre-generated follow-up to speak if the stream is late or comes back empty
+    fallback: Optional[Callable[[], str]] = None
+    # Seconds left of the latency budget for the first streamed sentence (the decision used the rest)
+    first_sentence_budget: float = FOLLOWUP_LATENCY_BUDGET
+    # Stops work still running for this result (the streamed generation)
+    on_discard: Optional[Callable[[], Awaitable]] = None
+
+    @property
+    def is_answer(self) -> bool:
+        return self.mod_status not in NON_ANSWER_STATUSES
+
+    async def discard(self):
+        """Drop a result that will not be used."""
+        if self.on_discard is not None:
+            await self.on_discard()
+
+
+class FollowupStream:
+    """
+    Runs a streamed next-turn call in the background so it can start before the
+    answer is known to be usable. The call yields its decision first, which
+    resolves `decision`; the follow-up chunks after it are buffered for reading.
+    """
+
+    def __init__(self, turn):
+        self._queue = asyncio.Queue()
+        self.decision = asyncio.get_running_loop().create_future()
+        self._task = asyncio.create_task(self._pump(turn))
+
+    async def _pump(self, turn):
+        try:
+            async for item in turn:
+                if not self.decision.done():
+                    self.decision.set_result(item)
+                else:
+                    self._queue.put_nowait(item)
+        finally:
+            if not self.decision.done():
+                self.decision.set_result(True)
+            self._queue.put_nowait(None)
+
+    async def __aiter__(self):
+        try:
+            while True:
+                chunk = await self._queue.get()
+                if chunk is None:
+                    return
+                yield chunk
+        finally:
+            # Reader gave up (e.g. latency budget missed): stop generating
+            self._task.cancel()
+
+    async def cancel(self):
+        self._task.cancel()
+        await asyncio.gather(self._task, return_exceptions=True)
+
+
+class TurnPipeline:
+    """
+    Runs the per-answer round trips concurrently: moderation and the follow-up
+    engine's next-turn call (decision + follow-up text) start together.
+    The next-turn result for an answer that moderation rejects is cancelled and
+    dropped; the follow-up engine overwrites that turn when the real answer arrives.
+
+    In streaming mode a streamed next-turn call starts alongside moderation
+    instead: the decision comes back first, the follow-up is generated only if
+    wanted and is handed back sentence by sentence. A decision that misses the
+    latency budget is abandoned for a pre-generated follow-up.
+    """
+
+    def __init__(self, moderator, followup_manager, speculative: bool = SPECULATIVE_FOLLOWUP, stream: bool = STREAM_FOLLOWUPS):
+        self.moderator = moderator
+        self.followup_manager = followup_manager
+        self.speculative = speculative
+        self.stream = stream
+
+    async def process(self, lp, question, answer, num_followups, num_lp_questions, time_remaining, want_followup=True,
+                      record=True) -> TurnResult:
+        """`record=False` runs on a partial answer without storing it in the follow-up engine; see record()."""
+        moderation = asyncio.create_task(self.moderator.moderate_async(question, answer))
+        next_turn = stream = None
+        accepted = False
+        if want_followup and self.stream:
+            stream = FollowupStream(self.followup_manager.stream_next_turn_async(
+                lp, question, answer, num_followups, num_lp_questions, time_remaining, record=record
+            ))
+        elif want_followup and self.speculative:
+            next_turn = asyncio.create_task(self._next_turn(lp, question, answer, num_followups, num_lp_questions, time_remaining, record))
+
+        try:
+            mod_status = await moderation
+            if mod_status in NON_ANSWER_STATUSES:
+                logging.info(f"Turn pipeline: moderation returned '{mod_status}', discarding follow-up work")
+                return TurnResult(mod_status)
+            if not want_followup:
+                return TurnResult(mod_status)
+
+            if stream is not None:
+                started = time.monotonic()
+                try:
+                    wanted = await asyncio.wait_for(stream.decision, FOLLOWUP_LATENCY_BUDGET)
+                except asyncio.TimeoutError:
+                    logging.warning(f"⚠️ No follow-up decision within {FOLLOWUP_LATENCY_BUDGET}s; using pre-generated follow-up")
+                    return TurnResult(
+                        mod_status, should_followup=True,
+                        followup=self.followup_manager.fallback_followup(lp, question, answer)
+                    )
+                if not wanted:
+                    return TurnResult(mod_status)
+                accepted = True
+                return TurnResult(
+                    mod_status, should_followup=True, followup_stream=iter_sentences(stream),
+                    fallback=partial(self.followup_manager.fallback_followup, lp, question, answer),
+                    first_sentence_budget=FOLLOWUP_LATENCY_BUDGET - (time.monotonic() - started),
+                    on_discard=stream.cancel
+                )
+
+            if next_turn is None:
+                next_turn = asyncio.create_task(self._next_turn(lp, question, answer, num_followups, num_lp_questions, time_remaining, record))
+            should_followup, followup = await next_turn
+            return TurnResult(mod_status, should_followup=should_followup, followup=followup)
+        finally:
+            pending = [t for t in (moderation, next_turn) if t is not None and not t.done()]
+            for task in pending:
+                task.cancel()
+            if pending:
+                await asyncio.gather(*pending, return_exceptions=True)
+            if stream is not None and not accepted:
+                await stream.cancel()
+
+    def _next_turn(self, lp, question, answer, num_followups, num_lp_questions, time_remaining, record):
+        return self.followup_manager.next_turn_async(lp, question, answer, num_followups, num_lp_questions, time_remaining, record=record)
+
+    async def record(self, lp, question, answer):
+        """Store the final answer of a turn whose result came from a record=False run."""
+        await self.followup_manager.record_turn_async(lp, question, answer)
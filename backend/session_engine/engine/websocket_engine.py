@@ -1,14 +1,17 @@
 import logging
-import random
-import json
 import os
 import uuid
 from datetime import datetime
 import asyncio
+from contextlib import aclosing
 from starlette.websockets import WebSocketState, WebSocketDisconnect
-from session_engine.config.constants import SESSION_DURATION_LIMIT, MIN_LP_QUESTIONS, FOLLOW_UP_COUNT, QUESTION_FILE
+from session_engine.config.constants import SESSION_DURATION_LIMIT, MIN_LP_QUESTIONS, FOLLOW_UP_COUNT, FOLLOWUP_LATENCY_BUDGET
 from session_engine.engine.session_manager import SessionManager
 from session_engine.engine.lp_selector import LPSelector
+from session_engine.engine.question_bank import get_question_bank
+from session_engine.engine.turn_pipeline import TurnPipeline
+from session_engine.engine.early_turn import EarlyTurn
+from session_engine.engine.heartbeat import heartbeat_scheduler
 from session_engine.services.moderation_service import ModerationService
 from session_engine.services.followup_manager import FollowupManager
 from session_engine.custom_logging.logger import InteractionLogger
@@ -17,15 +20,14 @@ from session_engine.services.tts_handler import TTSHandler
 import time
 
 class WebSocketInterviewSession:
-    def __init__(self, user_id: str, websocket, tts_handler: TTSHandler):
+    def __init__(self, user_id: str, websocket, tts_handler: TTSHandler, session_id: str = None):
         self.user_id = user_id
         self.websocket = websocket
         self.tts = tts_handler
-        with open(QUESTION_FILE, "r") as f:
-            self.lp_questions = json.load(f)
+        self.question_bank = get_question_bank()
 
-        self.session_manager = SessionManager()
-        self.lp_selector = LPSelector(self.lp_questions)
+        self.session_manager = SessionManager(session_id)
+        self.lp_selector = LPSelector(self.question_bank)
         self.moderator = ModerationService()
         self.logger = InteractionLogger(user_id)
         self.cancel_event = asyncio.Event()
@@ -40,14 +42,15 @@ class WebSocketInterviewSession:
         logging.info("WebSocket interview session started")
         await self.websocket.send_json({"type": "system", "text": "Interview started!", "session_id": self.session_manager.get_session_id()})
 
-        # Create concurrent tasks including a message listener
+        # Heartbeats come from the shared worker scheduler; disconnects surface in the message listener
+        session_key = self.session_manager.get_session_id()
+        heartbeat_scheduler.register(session_key, self.websocket)
         interview_task = asyncio.create_task(self._run_interview())
-        disconnect_task = asyncio.create_task(self._monitor_disconnect())
         message_task = asyncio.create_task(self._listen_for_messages())
 
         try:
             done, pending = await asyncio.wait(
-                [interview_task, disconnect_task, message_task],
+                [interview_task, message_task],
                 return_when=asyncio.FIRST_COMPLETED
             )
 
@@ -62,6 +65,7 @@ class WebSocketInterviewSession:
         except Exception as e:
             logging.error(f"Session error: {e}")
         finally:
+            heartbeat_scheduler.unregister(session_key)
             logging.info("WebSocket interview session ended")
 
     async def _listen_for_messages(self):
@@ -123,9 +127,8 @@ class WebSocketInterviewSession:
             print(f"⚠️ [TTS] Message {message_id} not in pending questions")
             return
         
-        # Create event for this message
-        event = asyncio.Event()
-        self.tts_events[message_id] = event
+        # Reuse the event if it was registered when the message was sent
+        event = self.tts_events.setdefault(message_id, asyncio.Event())
         
         try:
             print(f"⏳ [TTS] Waiting for TTS completion of message {message_id} (timeout: {timeout}s)")
@@ -166,7 +169,7 @@ class WebSocketInterviewSession:
         # Wait for completion
         await self._wait_for_tts_completion(message_id, timeout=10)
 
-    async def ask_question_and_wait_for_response(self, question):
+    async def ask_question_and_wait_for_response(self, question, question_type="main", early=None):
         """Ask question with TTS coordination and get response"""
         message_id = str(uuid.uuid4())
         
@@ -197,30 +200,90 @@ class WebSocketInterviewSession:
         print("🎧 [INTERVIEW] TTS completed, now getting user response...")
         
         # Get user response via STT
-        return await self.question_handler.get_user_response()
-
-    async def _monitor_disconnect(self):
-        """Monitor WebSocket state and set cancel event when disconnected"""
-        print("🔍 [DEBUG] Starting WebSocket disconnect monitoring")
-        while not self.cancel_event.is_set():
-            try:
-                print("🔍 [DEBUG] Sending heartbeat...")
-                # Try to send a heartbeat message
-                await self.websocket.send_json({
-                    "type": "heartbeat",
-                    "timestamp": time.time()
-                })
-                print("🔍 [DEBUG] WebSocket heartbeat sent successfully")
-                await asyncio.sleep(2.0)  # Check every 2 seconds
-                
-            except Exception as e:
-                print(f"🚨 [DEBUG] WebSocket disconnected detected: {type(e).__name__}: {e}")
-                print("🚨 [DEBUG] SETTING CANCEL EVENT NOW!")
-                self.cancel_event.set()
-                print(f"🚨 [DEBUG] Cancel event set - is_set(): {self.cancel_event.is_set()}")
+        return await self.listen(question_type, early)
+
+    async def listen(self, question_type="main", early=None):
+        """The candidate's answer; while they speak, transcript segments are fed to `early` (an EarlyTurn)."""
+        answer = ""
+        async with aclosing(self.question_handler.stream_user_response(question_type=question_type)) as segments:
+            async for segment in segments:
+                if segment.kind == "done":
+                    answer = segment.text
+                elif early is not None:
+                    early.observe(segment)
+        return answer
+
+    async def _first_within_budget(self, sentences, budget=FOLLOWUP_LATENCY_BUDGET):
+        """Re-yield `sentences`, giving up if the first one takes longer than `budget` seconds."""
+        try:
+            first = await asyncio.wait_for(anext(sentences), max(budget, 0.0))
+        except StopAsyncIteration:
+            return
+        except asyncio.TimeoutError:
+            logging.warning(f"⚠️ No follow-up sentence within the {FOLLOWUP_LATENCY_BUDGET}s budget; using pre-generated follow-up")
+            await sentences.aclose()
+            return
+        yield first
+        async for sentence in sentences:
+            yield sentence
+
+    async def stream_question_and_wait_for_response(self, sentences, fallback=None, early=None,
+                                                    budget=FOLLOWUP_LATENCY_BUDGET):
+        """
+        Speak a question that is still being generated: each completed sentence is
+        sent as its own speech message so browser TTS can start on the first one.
+        `fallback` supplies the question when nothing arrives within `budget` seconds
+        (what is left of the latency budget after the follow-up decision).
+        `early` gets the full question once known, then the answer's transcript.
+        Returns (full_question, user_response).
+        """
+        message_ids = []
+        parts = []
+        async for sentence in self._first_within_budget(sentences, budget):
+            if self.cancel_event.is_set():
                 break
-                
-        print("🔍 [DEBUG] Monitor disconnect loop ended")
+            message_id = str(uuid.uuid4())
+            self.pending_questions[message_id] = {
+                "question": sentence,
+                "status": "tts_pending",
+                "timestamp": time.time()
+            }
+            # Registered before sending so an early tts_completed is not lost
+            self.tts_events[message_id] = asyncio.Event()
+            await self.websocket.send_json({
+                "type": "speech",
+                "text": sentence,
+                "speech_type": "question",
+                "message_id": message_id
+            })
+            message_ids.append(message_id)
+            parts.append(sentence)
+
+        if not parts:
+            # Nothing came back from the LLM service in time
+            question = fallback() if fallback else "Can you elaborate further on that?"
+            if early is not None:
+                early.question = question
+            return question, await self.ask_question_and_wait_for_response(question, "followup", early)
+
+        question = " ".join(parts)
+        print(f"🎤 [INTERVIEW] Streamed question in {len(parts)} part(s): {question[:50]}...")
+
+        # Sentences are spoken in order, so the last completion covers the rest
+        for message_id in message_ids[:-1]:
+            self.pending_questions.pop(message_id, None)
+            self.tts_events.pop(message_id, None)
+        await self._wait_for_tts_completion(message_ids[-1], timeout=10)
+
+        await self.websocket.send_json({
+            "type": "start_listening"
+        })
+        if early is not None:
+            early.question = question
+        return question, await self.listen("followup", early)
+
+    def _minutes_remaining(self):
+        return round(self.session_manager.time_remaining(SESSION_DURATION_LIMIT) / 60)
 
     async def _run_interview(self):
         """Main interview loop with TTS coordination"""
@@ -228,6 +291,7 @@ class WebSocketInterviewSession:
         self.session_manager.start_session()
         self.session_id = self.session_manager.get_session_id()
         followup_manager = FollowupManager(self.tts, self.session_id)
+        pipeline = TurnPipeline(self.moderator, followup_manager)
 
         lp_asked = 0
 
@@ -241,7 +305,7 @@ class WebSocketInterviewSession:
             if not lp:
                 break
 
-            main_question = random.choice(self.lp_questions[lp])
+            main_question = self.lp_selector.pick_question()
             
             # Check for cancellation before asking question
             if self.cancel_event.is_set():
@@ -249,26 +313,36 @@ class WebSocketInterviewSession:
             
             # Use coordinated question asking
             main_answer = None
+            turn = None
             question_asked = False
             while True:
+                early = EarlyTurn(
+                    pipeline, lp, main_question, 0, lp_asked, self._minutes_remaining,
+                    want_followup=FOLLOW_UP_COUNT > 0
+                )
                 if not question_asked:
-                    main_answer = await self.ask_question_and_wait_for_response(main_question)
+                    main_answer = await self.ask_question_and_wait_for_response(main_question, early=early)
                     question_asked = True
                 else:
                     # Just get user response without repeating question
                     await self.websocket.send_json({"type": "start_listening"})
-                    main_answer = await self.question_handler.get_user_response()
+                    main_answer = await self.listen("main", early)
                 
                 # Check if cancelled during response
                 if self.cancel_event.is_set():
+                    await early.discard()
                     return
                     
                 if not main_answer:
                     # await self.websocket.send_json({"type": "system", "text": "No answer. Skipping."})
                     # main_answer = None
+                    await early.discard()
                     break
 
-                mod_status = self.moderator.moderate(main_question, main_answer)
+                # Moderation, follow-up decision and (speculative) generation run concurrently,
+                # usually already finished on the transcript while the candidate was talking
+                turn = await early.result(main_answer)
+                mod_status = turn.mod_status
 
                 if mod_status in ["abusive", "malicious"]:
                     await self.speak_and_wait("Interview terminated due to inappropriate behavior.", "termination")
@@ -293,7 +367,6 @@ class WebSocketInterviewSession:
                 continue
 
             followups = []
-            current_q, current_a = main_question, main_answer
             num_followups = 0
 
             while (num_followups < FOLLOW_UP_COUNT 
@@ -302,15 +375,12 @@ class WebSocketInterviewSession:
                 if self.session_manager.time_remaining(SESSION_DURATION_LIMIT) <= 0:
                     break
 
-                should_generate = followup_manager.should_generate_followup(
-                    lp, current_q, current_a, num_followups, lp_asked,
-                    round(self.session_manager.time_remaining(SESSION_DURATION_LIMIT) / 60)
-                )
-
-                if not should_generate:
+                # Decision and follow-up text were produced alongside the last answer's moderation
+                if not turn.should_followup:
                     break
 
-                follow_up = followup_manager.generate_followup(lp, current_q, current_a)
+                follow_up = turn.followup
+                followup_stream = turn.followup_stream
                 
                 if self.cancel_event.is_set():
                     break
@@ -319,22 +389,35 @@ class WebSocketInterviewSession:
                 user_answer = None
                 followup_asked = False
                 while True:
+                    early = EarlyTurn(
+                        pipeline, lp, follow_up, num_followups + 1, lp_asked, self._minutes_remaining,
+                        want_followup=num_followups + 1 < FOLLOW_UP_COUNT
+                    )
                     if not followup_asked:
-                        user_answer = await self.ask_question_and_wait_for_response(follow_up)
+                        if followup_stream is not None:
+                            follow_up, user_answer = await self.stream_question_and_wait_for_response(
+                                followup_stream, turn.fallback, early, turn.first_sentence_budget
+                            )
+                            followup_stream = None
+                        else:
+                            user_answer = await self.ask_question_and_wait_for_response(follow_up, "followup", early)
                         followup_asked = True
                     else:
                         # Just get user response without repeating question
                         await self.websocket.send_json({"type": "start_listening"})
-                        user_answer = await self.question_handler.get_user_response()
+                        user_answer = await self.listen("followup", early)
                     
                     if self.cancel_event.is_set():
+                        await early.discard()
                         return
                         
                     if not user_answer:
                         user_answer = None
+                        await early.discard()
                         break
 
-                    mod_status = self.moderator.moderate(follow_up, user_answer)
+                    turn = await early.result(user_answer)
+                    mod_status = turn.mod_status
 
                     if mod_status in ["abusive", "malicious"]:
                         await self.speak_and_wait("Interview terminated due to inappropriate behavior.", "termination")
@@ -355,10 +438,12 @@ class WebSocketInterviewSession:
                     else:
                         break  # Valid answer, proceed
 
-                if user_answer and not self.cancel_event.is_set():
-                    followups.append({"question": follow_up, "answer": user_answer})
-                    current_q, current_a = follow_up, user_answer
-                    num_followups += 1
+                if not user_answer or self.cancel_event.is_set():
+                    # No usable answer to follow up on; move to the next LP
+                    break
+
+                followups.append({"question": follow_up, "answer": user_answer})
+                num_followups += 1
 
             if not self.cancel_event.is_set():
                 self.logger.log_lp_block(self.session_id, lp, main_question, main_answer, followups)
@@ -368,7 +453,10 @@ class WebSocketInterviewSession:
 
         # Only send completion message if not cancelled
         if not self.cancel_event.is_set():
+            # The report is built from Mongo as soon as the client sees "complete"
+            if not await asyncio.to_thread(self.logger.flush):
+                logging.warning(f"Interview log flush timed out for session {self.session_id}")
             await self.speak_and_wait("Thank you for your time. The interview session is now complete.", "completion")
             await self.websocket.send_json({"type": "complete","session_id": self.session_id })
         
-        logging.info("Interview loop completed")
\ No newline at end of file
+        logging.info("Interview loop completed")
@@ -3,12 +3,22 @@
 import logging
 import json
 import asyncio
-import websockets
+from contextlib import aclosing
 from fastapi import WebSocket
-from starlette.websockets import WebSocketState
 from session_engine.services.tts_handler import TTSHandler
+from session_engine.services.stt_client import get_stt_client
 import uuid
 import time
+from typing import NamedTuple
+
+
+class TranscriptSegment(NamedTuple):
+    kind: str               # "partial" / "final" while the candidate speaks, "pause" when their
+                            # silence nears the end-of-answer threshold, then one "done"
+    text: str               # best full transcript so far; the answer itself for "done"
+    stable: str = ""        # leading part of `text` that will not change any more
+    speaking: bool = False  # candidate was still talking when this was produced
+
 
 class WebSocketQuestionHandler:
     def __init__(self, websocket: WebSocket, tts: TTSHandler, cancel_event: asyncio.Event):
@@ -33,10 +43,91 @@ class WebSocketQuestionHandler:
         # Wait a bit for TTS to complete (simplified for retry messages)
         await asyncio.sleep(3)
 
-    async def get_user_response(self, max_tries: int = 2) -> str:
+    async def _transcript_events(self, stt_ws):
+        """
+        Transcript updates for this transcription as they arrive, then one "done"
+        segment. One receive task and one cancellation watcher live for the whole
+        answer, and whichever fires first is handled immediately - nothing wakes
+        up while the candidate is speaking.
+        The "done" text is the transcript, "" if cancelled, or None if the attempt should be retried.
+        """
+        cancel_task = asyncio.create_task(self.cancel_event.wait())
+        recv_task = asyncio.create_task(stt_ws.recv())
+        try:
+            while True:
+                done, _ = await asyncio.wait([recv_task, cancel_task], return_when=asyncio.FIRST_COMPLETED)
+
+                if cancel_task in done:
+                    print("🚨 [DEBUG] Cancel event during STT - sending cancel to STT")
+                    try:
+                        await stt_ws.send({"command": "cancel"})
+                    except Exception as e:
+                        print(f"🚨 [DEBUG] Failed to send cancel to STT: {e}")
+                    yield TranscriptSegment("done", "")
+                    return
+
+                try:
+                    data = json.loads(recv_task.result())
+                except Exception as e:
+                    logging.error(f"Error processing STT response: {e}")
+                    yield TranscriptSegment("done", None)
+                    return
+
+                if data["type"] in ("partial", "final", "pause"):
+                    yield TranscriptSegment(data["type"], data["text"], data.get("stable", ""), data.get("speaking", False))
+
+                elif data["type"] == "done":
+                    transcript = data["text"].strip()
+                    if not transcript:
+                        print("🔍 [DEBUG] Empty transcript - retrying")
+                        yield TranscriptSegment("done", None)
+                        return
+                    logging.info(f"User said: {transcript}")
+                    try:
+                        await self.websocket.send_json({
+                            "type": "answer",
+                            "text": transcript
+                        })
+                    except:
+                        pass
+                    yield TranscriptSegment("done", transcript, transcript)
+                    return
+
+                elif data["type"] == "cancelled":
+                    print("🔍 [DEBUG] STT was cancelled")
+                    yield TranscriptSegment("done", "")
+                    return
+
+                elif data["type"] == "error":
+                    logging.error(f"STT Microservice Error: {data['message']}")
+                    yield TranscriptSegment("done", None)
+                    return
+
+                # Keep listening on the same stream
+                recv_task = asyncio.create_task(stt_ws.recv())
+        finally:
+            for task in (recv_task, cancel_task):
+                if not task.done():
+                    task.cancel()
+            await asyncio.gather(recv_task, cancel_task, return_exceptions=True)
+
+    async def get_user_response(self, max_tries: int = 2, question_type: str = "main") -> str:
         """
         Get user response via STT - now called AFTER TTS coordination is complete
-        This method no longer needs to handle TTS timing since that's done at session level
+        This method no longer needs to handle TTS timing since that's done at session level.
+        `question_type` ("main" / "followup") selects the STT service's end-of-answer limits.
+        """
+        answer = ""
+        async for segment in self.stream_user_response(max_tries, question_type):
+            if segment.kind == "done":
+                answer = segment.text
+        return answer
+
+    async def stream_user_response(self, max_tries: int = 2, question_type: str = "main"):
+        """
+        Async iterator over the candidate's answer as it is transcribed: "partial",
+        "final" and "pause" segments while they speak, ending with exactly one "done"
+        segment carrying the answer ("" if there was none or the session was cancelled).
         """
         print("🔍 [DEBUG] Starting get_user_response (TTS should already be complete)")
         
@@ -47,154 +138,48 @@ class WebSocketQuestionHandler:
             })
         except Exception as e:
             print(f"🚨 [DEBUG] Failed to send listening message: {e}")
-            return ""
+            yield TranscriptSegment("done", "")
+            return
         
         for attempt in range(max_tries):
             print(f"🔍 [DEBUG] STT Attempt {attempt + 1}")
             
             if self.cancel_event.is_set():
                 print("🚨 [DEBUG] Cancel event already set before attempt - returning immediately")
-                return ""
+                yield TranscriptSegment("done", "")
+                return
 
             try:
-                print("🔍 [DEBUG] Attempting to connect to STT...")
-                async with websockets.connect("ws://localhost:8002/ws/transcribe") as stt_ws:
-                    print("🔍 [DEBUG] Connected to STT successfully")
-                    
-                    # Check cancellation AFTER connecting
-                    if self.cancel_event.is_set():
-                        print("🚨 [DEBUG] Cancel event detected after STT connection - sending cancel immediately")
-                        try:
-                            await stt_ws.send(json.dumps({"command": "cancel"}))
-                            print("🚨 [DEBUG] Cancel command sent to STT successfully")
-                        except Exception as e:
-                            print(f"🚨 [DEBUG] Failed to send cancel to STT: {e}")
-                        return ""
-                    
-                    # Send STT configuration
-                    await stt_ws.send(json.dumps({
-                        "stop_duration": 4,
-                        "max_wait": 90
-                    }))
-                    print("🔍 [DEBUG] STT config sent")
-                    
-                    # Check cancellation again AFTER configuration
-                    if self.cancel_event.is_set():
-                        print("🚨 [DEBUG] Cancel event detected after STT config - sending cancel")
-                        try:
-                            await stt_ws.send(json.dumps({"command": "cancel"}))
-                            print("🚨 [DEBUG] Cancel command sent to STT successfully")
-                        except Exception as e:
-                            print(f"🚨 [DEBUG] Failed to send cancel to STT: {e}")
-                        return ""
-                    
-                    # Main STT loop
-                    while True:
-                        print(f"🔍 [DEBUG] STT loop - cancel_event.is_set(): {self.cancel_event.is_set()}")
-                        
-                        # Check cancellation
-                        if self.cancel_event.is_set():
-                            print("🚨 [DEBUG] Cancel event detected in STT loop - sending cancel to STT")
-                            try:
-                                await stt_ws.send(json.dumps({"command": "cancel"}))
-                                print("🚨 [DEBUG] Cancel command sent to STT successfully")
-                            except Exception as e:
-                                print(f"🚨 [DEBUG] Failed to send cancel to STT: {e}")
-                            return ""
-                        
-                        # Check WebSocket state
-                        if self.websocket.client_state != WebSocketState.CONNECTED:
-                            try:
-                                await stt_ws.send(json.dumps({"command": "cancel"}))
-                                await stt_ws.close(code=1000, reason="Interview ended")
-                            except:
-                                pass
-                            return ""
-                        
-                        # Race between STT response and cancellation
-                        try:
-                            stt_task = asyncio.create_task(stt_ws.recv())
-                            cancel_task = asyncio.create_task(self.cancel_event.wait())
-                            
-                            print("🔍 [DEBUG] Starting race between STT and cancel event")
-                            
-                            done, pending = await asyncio.wait(
-                                [stt_task, cancel_task],
-                                return_when=asyncio.FIRST_COMPLETED,
-                                timeout=1.0  # Reasonable timeout
-                            )
-                            
-                            # Cancel pending tasks
-                            for task in pending:
-                                task.cancel()
-                                try:
-                                    await task
-                                except asyncio.CancelledError:
-                                    pass
-                            
-                            print(f"🔍 [DEBUG] Race completed - done tasks: {len(done)}, pending: {len(pending)}")
-                            
-                            # Handle results
-                            if cancel_task in done:
-                                print("🚨 [DEBUG] CANCEL TASK WON THE RACE!")
-                                try:
-                                    await stt_ws.send(json.dumps({"command": "cancel"}))
-                                    print("🚨 [DEBUG] Cancel command sent to STT successfully")
-                                except Exception as e:
-                                    print(f"🚨 [DEBUG] Failed to send cancel to STT: {e}")
-                                return ""
-                            
-                            if stt_task in done:
-                                try:
-                                    message = stt_task.result()
-                                    data = json.loads(message)
-                                    
-                                    if data["type"] == "done":
-                                        transcript = data["text"].strip()
-                                        if transcript:
-                                            logging.info(f"User said: {transcript}")
-                                            try:
-                                                await self.websocket.send_json({
-                                                    "type": "answer",
-                                                    "text": transcript
-                                                })
-                                            except:
-                                                pass
-                                            return transcript
-                                        else:
-                                            print("🔍 [DEBUG] Empty transcript - breaking to retry")
-                                            break
-                                            
-                                    elif data["type"] == "cancelled":
-                                        print("🔍 [DEBUG] STT was cancelled")
-                                        return ""
-                                        
-                                    elif data["type"] == "error":
-                                        logging.error(f"STT Microservice Error: {data['message']}")
-                                        break
-                                        
-                                except Exception as e:
-                                    logging.error(f"Error processing STT response: {e}")
-                                    break
-                            
-                            # No tasks completed (timeout)
-                            if not done:
-                                print("🔍 [DEBUG] Race timeout - continuing loop")
-                                continue
-                                
-                        except Exception as e:
-                            logging.error(f"Error in STT communication: {e}")
-                            break
-                            
+                print("🔍 [DEBUG] Opening STT stream on shared connection...")
+                result = None
+                async with get_stt_client().stream({
+                    "question_type": question_type,
+                    "stream_transcripts": True
+                }) as stt_ws:
+                    print(f"🔍 [DEBUG] STT stream {stt_ws.stream_id} started")
+
+                    # Also covers a cancel that arrived while the stream was starting
+                    async with aclosing(self._transcript_events(stt_ws)) as events:
+                        async for segment in events:
+                            if segment.kind == "done":
+                                result = segment.text
+                            else:
+                                yield segment
+                if result is not None:
+                    yield TranscriptSegment("done", result, result)
+                    return
+
             except Exception as e:
-                logging.exception("Error connecting to STT microservice")
+                logging.exception("Error communicating with STT microservice")
                 if self.cancel_event.is_set():
-                    return ""
+                    yield TranscriptSegment("done", "")
+                    return
             
             # Check cancellation before retry
             if self.cancel_event.is_set():
                 print("🚨 [DEBUG] Cancel event set - not retrying")
-                return ""
+                yield TranscriptSegment("done", "")
+                return
                 
             if attempt < max_tries - 1:
                 logging.info(f"No response detected. Attempt {attempt + 1}/{max_tries}. Re-prompting user.")
@@ -215,4 +200,4 @@ class WebSocketQuestionHandler:
         except Exception as e:
             print(f"Failed to send skip message: {e}")
         
-        return ""
\ No newline at end of file
+        yield TranscriptSegment("done", "")
\ No newline at end of file
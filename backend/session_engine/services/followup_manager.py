@@ -1,9 +1,23 @@
+import asyncio
+import json
 import requests
+import httpx
 import logging
 import sys, os
 from datetime import datetime
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
-from config.constants import LLM_ENDPOINT, SHOULD_GENERATE_ENDPOINT
+from config.constants import (
+    LLM_ENDPOINT,
+    SHOULD_GENERATE_ENDPOINT,
+    NEXT_TURN_ENDPOINT,
+    RECORD_TURN_ENDPOINT,
+    FOLLOWUP_DECISION_TIMEOUT,
+    FOLLOWUP_GENERATION_TIMEOUT,
+    FOLLOWUP_LATENCY_BUDGET,
+    HTTP_CONNECT_TIMEOUT,
+)
+from session_engine.services.http_client import get_http_client
+from session_engine.engine.followup_bank import get_followup_bank
 from utils.stream_buffer import StreamTextChunkBuffer
 
 class FollowupManager:
@@ -11,6 +25,17 @@ class FollowupManager:
         self.tts = tts
         self.session_id = session_id
         self.start_time = datetime.now()
+        self.bank = get_followup_bank()
+        self.bank_served = set()
+
+    def fallback_followup(self, principle, question, user_input):
+        """Pre-generated follow-up best matching the answer, for when the live LLM is slow or failing."""
+        followup = self.bank.pick(principle, question, user_input, exclude=self.bank_served)
+        if followup is None:
+            return "Can you elaborate further on that?"
+        self.bank_served.add(followup)
+        logging.info(f"Serving pre-generated follow-up for LP: {principle}")
+        return followup
 
     def _time_elapsed(self):
         seconds = (datetime.now() - self.start_time).total_seconds()
@@ -32,7 +57,7 @@ class FollowupManager:
             resp = requests.post(SHOULD_GENERATE_ENDPOINT, json=payload)
             resp.raise_for_status()
             result = resp.json()
-            return True  # default to True if not specified
+            return bool(result.get("followup", True))  # default to True if not specified
 
         except requests.RequestException as e:
             logging.warning(f"⚠️ Could not reach should_generate_followup endpoint: {e}")
@@ -88,8 +113,114 @@ class FollowupManager:
                 return followup
             else:
                 logging.warning("⚠️ No follow-up generated by LLM.")
-                return "Can you elaborate further on that?"
+                return self.fallback_followup(principle, question, user_input)
             
         except requests.exceptions.RequestException as e:
             logging.error(f"❌ Error calling LLM microservice: {e}")
-            return "Can you elaborate further on that?"
+            return self.fallback_followup(principle, question, user_input)
+
+    async def next_turn_async(self, principle, question, user_input, num_followups, num_lp_questions, time_remaining, record=True):
+        """
+        Record the answer and get the decision plus follow-up text in one round trip.
+        With record=False (speculative, on a partial answer) nothing is stored.
+        Returns (should_followup, followup_text).
+        """
+        payload = {
+            "session_id": self.session_id,
+            "principle": principle,
+            "question": question,
+            "user_input": user_input,
+            "time_remaining": time_remaining,
+            "time_spent": self._time_elapsed(),
+            "num_followups": num_followups,
+            "num_lp_questions": num_lp_questions,
+            "record": record
+        }
+        logging.info(f"Requesting next turn | Session ID: {self.session_id}, LP: {principle}, Num Followups: {num_followups}, Num LP Questions: {num_lp_questions}")
+        try:
+            async with asyncio.timeout(FOLLOWUP_LATENCY_BUDGET):
+                response = await get_http_client().post(
+                    NEXT_TURN_ENDPOINT,
+                    json=payload,
+                    timeout=httpx.Timeout(FOLLOWUP_DECISION_TIMEOUT + FOLLOWUP_GENERATION_TIMEOUT, connect=HTTP_CONNECT_TIMEOUT),
+                )
+            response.raise_for_status()
+            result = response.json()
+            if not result.get("followup", True):
+                return False, None
+            followup = result.get("question", "").strip()
+            if followup:
+                return True, followup
+            logging.warning("⚠️ No follow-up generated by LLM.")
+            return True, self.fallback_followup(principle, question, user_input)
+
+        except TimeoutError:
+            logging.warning(f"⚠️ Next-turn call exceeded {FOLLOWUP_LATENCY_BUDGET}s budget; using pre-generated follow-up")
+            return True, self.fallback_followup(principle, question, user_input)
+        except (httpx.HTTPError, ValueError) as e:
+            logging.error(f"❌ Error calling next-turn endpoint: {type(e).__name__}: {e}")
+            return True, self.fallback_followup(principle, question, user_input)
+
+    async def record_turn_async(self, principle, question, user_input):
+        """Store an answer whose next turn was worked out speculatively with record=False."""
+        payload = {
+            "session_id": self.session_id,
+            "principle": principle,
+            "question": question,
+            "user_input": user_input
+        }
+        try:
+            response = await get_http_client().post(
+                RECORD_TURN_ENDPOINT,
+                json=payload,
+                timeout=httpx.Timeout(FOLLOWUP_DECISION_TIMEOUT, connect=HTTP_CONNECT_TIMEOUT),
+            )
+            response.raise_for_status()
+        except httpx.HTTPError as e:
+            logging.error(f"❌ Error recording turn: {type(e).__name__}: {e}")
+
+    async def stream_next_turn_async(self, principle, question, user_input, num_followups, num_lp_questions, time_remaining, record=True):
+        """
+        Streamed next-turn: one round trip records the answer and decides, and the
+        follow-up is generated only if one is wanted. Yields the decision first,
+        then follow-up text chunks as the LLM service produces them. With
+        record=False (speculative, on a partial answer) nothing is stored.
+        """
+        payload = {
+            "session_id": self.session_id,
+            "principle": principle,
+            "question": question,
+            "user_input": user_input,
+            "time_remaining": time_remaining,
+            "time_spent": self._time_elapsed(),
+            "num_followups": num_followups,
+            "num_lp_questions": num_lp_questions,
+            "stream": True,
+            "record": record
+        }
+        logging.info(f"Requesting streamed next turn | Session ID: {self.session_id}, LP: {principle}, Num Followups: {num_followups}, Num LP Questions: {num_lp_questions}")
+        decided = False
+        try:
+            async with get_http_client().stream(
+                "POST",
+                NEXT_TURN_ENDPOINT,
+                json=payload,
+                timeout=httpx.Timeout(FOLLOWUP_DECISION_TIMEOUT + FOLLOWUP_GENERATION_TIMEOUT, connect=HTTP_CONNECT_TIMEOUT),
+            ) as response:
+                response.raise_for_status()
+                if response.headers.get("content-type", "").startswith("application/json"):
+                    # No follow-up wanted: the decision comes back as plain JSON
+                    result = json.loads(await response.aread())
+                    decided = True
+                    yield bool(result.get("followup", True))
+                    return
+                decided = True
+                yield True
+                async for chunk in response.aiter_text():
+                    if chunk:
+                        yield chunk
+
+        except (httpx.HTTPError, ValueError) as e:
+            logging.error(f"❌ Error streaming next turn: {type(e).__name__}: {e}")
+            if not decided:
+                yield True  # default: follow up, the pre-generated bank covers the empty stream
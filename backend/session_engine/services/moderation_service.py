@@ -1,8 +1,10 @@
 import requests
+import httpx
 import logging
 import sys, os
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
-from config.constants import MODERATION_ENDPOINT
+from config.constants import MODERATION_ENDPOINT, MODERATION_TIMEOUT, HTTP_CONNECT_TIMEOUT
+from session_engine.services.http_client import get_http_client
 
 class ModerationService:
     def moderate(self, question, user_input):
@@ -13,4 +15,19 @@ class ModerationService:
             return response.json().get("status", "safe")
         except requests.exceptions.RequestException as e:
             logging.error(f"Moderation error: {e}")
-            return "safe"
\ No newline at end of file
+            return "safe"
+
+    async def moderate_async(self, question, user_input):
+        """Non-blocking variant used by the WebSocket engine; shares the worker's connection pool."""
+        try:
+            payload = {"question": question, "user_input": user_input}
+            response = await get_http_client().post(
+                MODERATION_ENDPOINT,
+                json=payload,
+                timeout=httpx.Timeout(MODERATION_TIMEOUT, connect=HTTP_CONNECT_TIMEOUT),
+            )
+            response.raise_for_status()
+            return response.json().get("status", "safe")
+        except (httpx.HTTPError, ValueError) as e:
+            logging.error(f"Moderation error: {type(e).__name__}: {e}")
+            return "safe"
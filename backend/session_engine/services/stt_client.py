@@ -0,0 +1,114 @@
+import asyncio
+import json
+import logging
+import uuid
+from contextlib import asynccontextmanager
+import websockets
+from session_engine.config.constants import STT_MUX_ENDPOINT
+
+
+class STTStream:
+    """One transcription carried over the shared STT connection."""
+
+    def __init__(self, client, stream_id, ws):
+        self.client = client
+        self.stream_id = stream_id
+        self.ws = ws
+        self.queue = asyncio.Queue()
+        self.finished = False
+
+    async def send(self, message: dict):
+        await self.ws.send(json.dumps({**message, "stream_id": self.stream_id}))
+
+    async def recv(self) -> str:
+        """Next raw JSON message for this stream (same shape as the single-stream endpoint)."""
+        message = await self.queue.get()
+        if json.loads(message).get("type") in ("done", "cancelled", "error"):
+            self.finished = True
+        return message
+
+
+class STTMultiplexClient:
+    """
+    A single long-lived WebSocket per worker to the STT service. Transcriptions
+    are tagged with a stream id and demultiplexed by one reader task, so starting
+    an answer no longer pays a WebSocket handshake.
+    """
+
+    def __init__(self, url: str = STT_MUX_ENDPOINT):
+        self.url = url
+        self._ws = None
+        self._reader = None
+        self._streams = {}
+        self._connect_lock = asyncio.Lock()
+
+    async def _ensure_connected(self):
+        async with self._connect_lock:
+            if self._ws is None:
+                self._ws = await websockets.connect(self.url, ping_interval=20, ping_timeout=20)
+                self._reader = asyncio.create_task(self._read_loop(self._ws))
+                logging.info(f"Connected to STT service at {self.url}")
+            return self._ws
+
+    async def _read_loop(self, ws):
+        try:
+            async for message in ws:
+                try:
+                    stream = self._streams.get(json.loads(message).get("stream_id"))
+                except ValueError:
+                    logging.error(f"Invalid message from STT service: {message!r}")
+                    continue
+                if stream is not None:
+                    stream.queue.put_nowait(message)
+        except websockets.exceptions.ConnectionClosed as e:
+            logging.warning(f"STT connection closed: {e}")
+        finally:
+            if self._ws is ws:
+                self._ws = None
+            # Fail every stream that was riding on this connection
+            for stream in list(self._streams.values()):
+                if stream.ws is ws:
+                    stream.queue.put_nowait(json.dumps({
+                        "stream_id": stream.stream_id,
+                        "type": "error",
+                        "message": "STT connection lost"
+                    }))
+
+    @asynccontextmanager
+    async def stream(self, config: dict):
+        ws = await self._ensure_connected()
+        stt_stream = STTStream(self, str(uuid.uuid4()), ws)
+        self._streams[stt_stream.stream_id] = stt_stream
+        try:
+            await stt_stream.send({"command": "start", **config})
+            yield stt_stream
+        finally:
+            self._streams.pop(stt_stream.stream_id, None)
+            if not stt_stream.finished and ws is self._ws:
+                # Don't leave an orphaned transcription running on the server
+                try:
+                    await stt_stream.send({"command": "cancel"})
+                except websockets.exceptions.ConnectionClosed:
+                    pass
+
+    async def close(self):
+        if self._ws is not None:
+            await self._ws.close()
+        if self._reader is not None:
+            await asyncio.gather(self._reader, return_exceptions=True)
+        self._ws = None
+
+
+_client = None
+
+def get_stt_client() -> STTMultiplexClient:
+    global _client
+    if _client is None:
+        _client = STTMultiplexClient()
+    return _client
+
+async def close_stt_client():
+    global _client
+    if _client is not None:
+        await _client.close()
+    _client = None
@@ -1,5 +1,5 @@
 import os
-import asyncio
+import sys
 import time
 import numpy as np
 import pyaudio
@@ -13,6 +13,8 @@ from speechmatics.models import (
 )
 from httpx import HTTPStatusError
 import webrtcvad
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../..")))
+from common.audio_buffer import AudioProcessor
 
 load_dotenv()
 
@@ -22,30 +24,6 @@ CONNECTION_URL = f"wss://eu2.rt.speechmatics.com/v2/{LANGUAGE}"
 CHUNK_SIZE = 960  # 30ms at 16kHz with 16-bit PCM (960 bytes)
 
 
-class AudioProcessor:
-    def __init__(self):
-        self.wave_data = bytearray()
-        self.read_offset = 0
-        self.finished = False
-
-    def finish(self):
-        self.finished = True
-
-    async def read(self, chunk_size):
-        while self.read_offset + chunk_size > len(self.wave_data):
-            if self.finished:
-                return b""  # Signal end-of-audio
-            await asyncio.sleep(0.001)
-
-        new_offset = self.read_offset + chunk_size
-        data = self.wave_data[self.read_offset:new_offset]
-        self.read_offset = new_offset
-        return data
-
-    def write_audio(self, data):
-        self.wave_data.extend(data)
-
-
 class VADMonitor:
     def __init__(self, sample_rate=16000):
         self.vad = webrtcvad.Vad(3)
@@ -0,0 +1,95 @@
+import asyncio
+from session_engine.engine.early_turn import EarlyTurn
+from session_engine.engine.turn_pipeline import TurnPipeline
+from session_engine.handlers.ws_question_handler import TranscriptSegment
+from session_engine.tests.test_turn_pipeline import LP, QUESTION, FakeFollowupManager, FakeModerator
+
+FIRST = "I led the migration to the new billing system"
+SECOND = "I led the migration to the new billing system and cut costs by a third"
+
+
+def segment(kind, text, speaking=False):
+    return TranscriptSegment(kind=kind, text=text, speaking=speaking)
+
+
+def early_turn(manager):
+    pipeline = TurnPipeline(FakeModerator("valid"), manager, speculative=True, stream=False)
+    return EarlyTurn(pipeline, LP, QUESTION, 0, 1, lambda: 20, enabled=True, min_words=3)
+
+
+def test_only_pauses_start_a_run():
+    manager = FakeFollowupManager()
+
+    async def run():
+        turn = early_turn(manager)
+        turn.observe(segment("partial", FIRST))
+        turn.observe(segment("final", FIRST))
+        assert turn.attempts == 0
+        turn.observe(segment("pause", FIRST))
+        assert turn.attempts == 1
+        turn.observe(segment("pause", FIRST))  # same words: the run is kept
+        assert turn.attempts == 1
+        await turn.discard()
+
+    asyncio.run(run())
+
+
+def test_reused_run_records_the_final_answer_once():
+    manager = FakeFollowupManager()
+
+    async def run():
+        turn = early_turn(manager)
+        turn.observe(segment("pause", FIRST))
+        return await turn.result(FIRST + ".")
+
+    result = asyncio.run(run())
+    assert result.should_followup
+    assert manager.calls == ["next_turn"]
+    assert manager.records == [False]
+    assert manager.recorded == [FIRST + "."]
+
+
+def test_later_pause_replaces_the_earlier_run():
+    manager = FakeFollowupManager()
+
+    async def run():
+        turn = early_turn(manager)
+        turn.observe(segment("pause", FIRST))
+        await asyncio.sleep(0.01)
+        turn.observe(segment("pause", SECOND))
+        result = await turn.result(SECOND)
+        return turn, result
+
+    turn, result = asyncio.run(run())
+    assert turn.attempts == 2 and result.should_followup
+    assert manager.cancelled  # the first run's request was dropped
+    assert manager.records == [False, False]
+    assert manager.recorded == [SECOND]
+
+
+def test_changed_answer_is_processed_and_recorded_normally():
+    manager = FakeFollowupManager()
+
+    async def run():
+        turn = early_turn(manager)
+        turn.observe(segment("pause", FIRST))
+        await asyncio.sleep(0.01)
+        return await turn.result(SECOND)
+
+    asyncio.run(run())
+    assert manager.records == [False, True]
+    assert manager.recorded == []
+
+
+def test_non_answer_is_not_recorded():
+    manager = FakeFollowupManager()
+
+    async def run():
+        pipeline = TurnPipeline(FakeModerator("off_topic"), manager, speculative=True, stream=False)
+        turn = EarlyTurn(pipeline, LP, QUESTION, 0, 1, lambda: 20, enabled=True, min_words=3)
+        turn.observe(segment("pause", FIRST))
+        return await turn.result(FIRST)
+
+    result = asyncio.run(run())
+    assert not result.is_answer
+    assert manager.recorded == []
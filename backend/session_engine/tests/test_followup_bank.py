@@ -0,0 +1,59 @@
+import json
+from session_engine.engine.followup_bank import FollowupBank
+
+RECORDS = [
+    {
+        "principle": "Ownership",
+        "question": "Tell me about a time you took ownership.",
+        "followups": [
+            {"question": "How did you measure the outcome?", "keywords": ["metrics", "measured", "outcome"]},
+            {"question": "Who else did you bring in?", "keywords": ["team", "stakeholders", "manager"]},
+        ],
+    },
+    {
+        "principle": "Ownership",
+        "question": "Describe a project you saw through end to end.",
+        "followups": [
+            {"question": "What would you do differently?", "keywords": ["mistake", "differently"]},
+        ],
+    },
+]
+
+
+def test_pick_scores_answer_against_keywords():
+    bank = FollowupBank(RECORDS)
+    question = RECORDS[0]["question"]
+
+    assert bank.pick("Ownership", question, "I pulled in my manager and the team") == "Who else did you bring in?"
+    assert bank.pick("Ownership", question, "We measured the metrics weekly") == "How did you measure the outcome?"
+    # No overlap: ties keep generation order
+    assert bank.pick("Ownership", question, "It went fine") == "How did you measure the outcome?"
+
+
+def test_pick_falls_back_to_principle_for_followup_questions():
+    bank = FollowupBank(RECORDS)
+
+    # The question just answered was itself a follow-up, so every follow-up for the principle is a candidate
+    picked = bank.pick("Ownership", "Who else did you bring in?", "Looking back it was a mistake")
+    assert picked == "What would you do differently?"
+    assert bank.pick("Ownership", "Who else did you bring in?", "the team helped") != "Who else did you bring in?"
+    assert bank.pick("Customer Obsession", "Any question", "any answer") is None
+
+
+def test_pick_skips_excluded_followups():
+    bank = FollowupBank(RECORDS)
+    question = RECORDS[0]["question"]
+    answer = "my manager and the team"
+
+    assert bank.pick("Ownership", question, answer, exclude={"Who else did you bring in?"}) == "How did you measure the outcome?"
+    assert bank.pick("Ownership", question, answer, exclude={f["question"] for f in RECORDS[0]["followups"]}) is None
+
+
+def test_load_skips_lines_cut_off_by_an_interrupted_job(tmp_path):
+    path = tmp_path / "followup_bank.jsonl"
+    lines = [json.dumps(record) for record in RECORDS]
+    path.write_text(lines[0] + "\n" + lines[1][:25] + "\n" + lines[1] + "\n", encoding="utf-8")
+
+    bank = FollowupBank.load(str(path))
+    assert len(bank) == 2
+    assert bank.pick("Ownership", RECORDS[1]["question"], "a mistake") == "What would you do differently?"
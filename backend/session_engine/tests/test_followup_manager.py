@@ -0,0 +1,77 @@
+"""
+Run from backend/:
+    python -m pytest session_engine/tests
+"""
+import asyncio
+import json
+import httpx
+from session_engine.services import followup_manager
+from session_engine.services.followup_manager import FollowupManager
+
+
+class FakeTTS:
+    def speak(self, text):
+        pass
+
+
+def use_transport(monkeypatch, handler):
+    client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    monkeypatch.setattr(followup_manager, "get_http_client", lambda: client)
+    return client
+
+
+def next_turn(manager):
+    return asyncio.run(manager.next_turn_async(
+        "Ownership", "Tell me about a time you took ownership.", "I led the migration.", 0, 1, 20
+    ))
+
+
+def test_next_turn_posts_payload(monkeypatch):
+    seen = []
+
+    def handler(request):
+        seen.append((str(request.url), json.loads(request.content)))
+        return httpx.Response(200, json={"followup": True, "question": " What did you measure? "})
+
+    use_transport(monkeypatch, handler)
+    assert next_turn(FollowupManager(FakeTTS(), "s1")) == (True, "What did you measure?")
+    url, payload = seen[0]
+    assert url == followup_manager.NEXT_TURN_ENDPOINT
+    assert payload["session_id"] == "s1" and payload["record"] is True
+    assert payload["num_lp_questions"] == 1
+
+
+def test_next_turn_falls_back_to_a_followup_on_errors(monkeypatch):
+    use_transport(monkeypatch, lambda request: httpx.Response(503))
+    should_followup, followup = next_turn(FollowupManager(FakeTTS(), "s1"))
+    assert should_followup and followup
+
+
+def stream_turn(manager):
+    async def run():
+        return [item async for item in manager.stream_next_turn_async(
+            "Ownership", "Tell me about a time you took ownership.", "I led the migration.", 0, 1, 20
+        )]
+    return asyncio.run(run())
+
+
+def test_stream_next_turn_yields_decision_then_chunks(monkeypatch):
+    seen = []
+
+    def handler(request):
+        seen.append(json.loads(request.content))
+        return httpx.Response(200, content=b"What was the result?", headers={"content-type": "text/plain"})
+
+    use_transport(monkeypatch, handler)
+    assert stream_turn(FollowupManager(FakeTTS(), "s1")) == [True, "What was the result?"]
+    assert seen[0]["stream"] is True
+
+
+def test_stream_next_turn_decision_only_when_no_followup(monkeypatch):
+    use_transport(monkeypatch, lambda request: httpx.Response(200, json={"followup": False, "question": ""}))
+    assert stream_turn(FollowupManager(FakeTTS(), "s1")) == [False]
+
+
+def test_stream_next_turn_defaults_to_followup_on_error(monkeypatch):
+    use_transport(monkeypatch, lambda request: httpx.Response(504))
+    assert stream_turn(FollowupManager(FakeTTS(), "s1")) == [True]
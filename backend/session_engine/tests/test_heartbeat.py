@@ -0,0 +1,83 @@
+import asyncio
+from session_engine.engine.heartbeat import HeartbeatScheduler
+
+
+class FakeWebSocket:
+    def __init__(self, fail=False, stall=False):
+        self.fail = fail
+        self.stall = stall
+        self.sent = []
+
+    async def send_json(self, payload):
+        if self.stall:
+            await asyncio.sleep(3600)
+        if self.fail:
+            raise RuntimeError("socket closed")
+        self.sent.append(payload)
+
+
+def test_register_and_unregister():
+    async def run():
+        scheduler = HeartbeatScheduler(interval=0.01)
+        ws = FakeWebSocket()
+        scheduler.register("s1", ws)
+        scheduler.register("s2", FakeWebSocket())
+        assert scheduler.session_count == 2
+        await asyncio.sleep(0.05)
+        assert ws.sent and ws.sent[0]["type"] == "heartbeat"
+
+        scheduler.unregister("s2")
+        scheduler.unregister("missing")
+        assert scheduler.session_count == 1
+        await scheduler.stop()
+        assert scheduler.session_count == 0
+
+    asyncio.run(run())
+
+
+def test_failed_send_drops_only_that_socket():
+    async def run():
+        scheduler = HeartbeatScheduler(interval=0.01)
+        good, bad = FakeWebSocket(), FakeWebSocket(fail=True)
+        scheduler.register("good", good)
+        scheduler.register("bad", bad)
+        await asyncio.sleep(0.05)
+        assert scheduler.session_count == 1
+        assert len(good.sent) >= 2
+        await scheduler.stop()
+
+    asyncio.run(run())
+
+
+def test_stalled_send_does_not_block_the_batch():
+    async def run():
+        scheduler = HeartbeatScheduler(interval=0.02)
+        good, stalled = FakeWebSocket(), FakeWebSocket(stall=True)
+        scheduler.register("good", good)
+        scheduler.register("stalled", stalled)
+        await asyncio.sleep(0.15)
+        assert scheduler.session_count == 1
+        assert len(good.sent) >= 2
+        await scheduler.stop()
+
+    asyncio.run(run())
+
+
+def test_task_exits_when_empty_and_restarts_on_register():
+    async def run():
+        scheduler = HeartbeatScheduler(interval=0.01)
+        scheduler.register("s1", FakeWebSocket())
+        first = scheduler._task
+        scheduler.unregister("s1")
+        await asyncio.sleep(0.05)
+        assert first.done()
+
+        ws = FakeWebSocket()
+        scheduler.register("s2", ws)
+        assert scheduler._task is not first
+        await asyncio.sleep(0.05)
+        assert ws.sent
+        await scheduler.stop()
+        assert scheduler._task is None
+
+    asyncio.run(run())
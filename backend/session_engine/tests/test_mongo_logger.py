@@ -0,0 +1,106 @@
+import threading
+import time
+from pymongo.errors import AutoReconnect, BulkWriteError
+from session_engine.custom_logging import db_handler
+from session_engine.custom_logging.db_handler import DUPLICATE_KEY, MongoLogger
+
+
+class FakeCollection:
+    """Stores inserted documents by _id; `script` supplies an exception to raise per call."""
+
+    def __init__(self, script=()):
+        self.docs = {}
+        self.calls = []
+        self.script = list(script)
+        self.gates = {}
+        self.started = threading.Event()
+
+    def insert_many(self, docs, ordered=True):
+        self.calls.append([d["principle"] for d in docs])
+        for d in docs:
+            d.setdefault("_id", id(d))
+            gate = self.gates.get(d["principle"])
+            if gate is not None:
+                self.started.set()
+                gate.wait(5)
+        action = self.script.pop(0) if self.script else None
+        if action is not None:
+            raise action(docs, self.docs)
+        for d in docs:
+            self.docs[d["_id"]] = d
+
+
+def make_logger(monkeypatch, collection, **kwargs):
+    # The client connects lazily; only the writer thread's collection is used
+    monkeypatch.setattr(db_handler, "MONGO_URI", "mongodb://localhost:27017")
+    logger = MongoLogger(**kwargs)
+    logger.collection = collection
+    return logger
+
+
+def log(logger, principle):
+    logger.log_lp_block("s1", "u1", principle, "q", "a", [])
+
+
+def test_flush_waits_only_for_documents_queued_before_it(monkeypatch):
+    collection = FakeCollection()
+    collection.gates = {"first": threading.Event(), "later": threading.Event()}
+    logger = make_logger(monkeypatch, collection, batch_size=1, flush_interval=0.01)
+    try:
+        log(logger, "first")
+        assert collection.started.wait(2)  # writer is busy with "first"
+
+        result = []
+        flusher = threading.Thread(target=lambda: result.append(logger.flush(timeout=2)))
+        flusher.start()
+        while logger._queue.qsize() == 0:
+            time.sleep(0.001)
+        log(logger, "later")  # another session's block, queued after the flush
+
+        collection.gates["first"].set()
+        flusher.join(3)
+        assert result == [True]
+        assert logger.stats()["pending"] == 1
+    finally:
+        collection.gates["later"].set()
+        logger.close()
+
+
+def test_partial_bulk_failure_retries_only_failed_documents(monkeypatch):
+    def fail_second(docs, stored):
+        stored[docs[0]["_id"]] = docs[0]
+        stored[docs[2]["_id"]] = docs[2]
+        return BulkWriteError({"writeErrors": [{"index": 1, "code": 91, "errmsg": "shutdown"}], "nInserted": 2})
+
+    collection = FakeCollection(script=[fail_second])
+    logger = make_logger(monkeypatch, collection, batch_size=3, flush_interval=0.01)
+    try:
+        for principle in ("a", "b", "c"):
+            log(logger, principle)
+        assert logger.flush(timeout=3)
+        assert collection.calls == [["a", "b", "c"], ["b"]]
+        assert sorted(d["principle"] for d in collection.docs.values()) == ["a", "b", "c"]
+        assert logger.stats() == {"pending": 0, "written": 3, "dropped": 0, "failed": 0}
+    finally:
+        logger.close()
+
+
+def test_retry_after_lost_reply_counts_duplicates_as_written(monkeypatch):
+    def reply_lost(docs, stored):
+        for d in docs:
+            stored[d["_id"]] = d
+        return AutoReconnect("connection reset")
+
+    def already_there(docs, stored):
+        return BulkWriteError({"writeErrors": [{"index": i, "code": DUPLICATE_KEY} for i in range(len(docs))], "nInserted": 0})
+
+    collection = FakeCollection(script=[reply_lost, already_there])
+    logger = make_logger(monkeypatch, collection, batch_size=2, flush_interval=0.01)
+    try:
+        log(logger, "a")
+        log(logger, "b")
+        assert logger.flush(timeout=3)
+        assert len(collection.docs) == 2
+        assert logger.stats()["written"] == 2 and logger.stats()["failed"] == 0
+    finally:
+        logger.close()
@@ -0,0 +1,66 @@
+import json
+import os
+import pytest
+from session_engine.engine import question_bank
+from session_engine.engine.lp_selector import LPSelector
+from session_engine.engine.question_bank import QuestionBank, get_question_bank
+
+
+@pytest.fixture
+def bank_file(tmp_path, monkeypatch):
+    monkeypatch.setattr(question_bank, "_bank", None)
+    monkeypatch.setattr(question_bank, "_last_check", 0.0)
+    monkeypatch.setattr(question_bank, "QUESTION_BANK_RELOAD_INTERVAL", 0)
+    path = tmp_path / "questions.json"
+
+    def write(data, mtime):
+        path.write_text(data if isinstance(data, str) else json.dumps(data))
+        os.utime(path, (mtime, mtime))
+        return str(path)
+    return write
+
+
+def test_reloads_when_mtime_changes(bank_file):
+    path = bank_file({"Ownership": ["q1"]}, mtime=1000)
+    first = get_question_bank(path)
+    assert first.principles == ("Ownership",)
+    assert get_question_bank(path) is first
+
+    bank_file({"Ownership": ["q1"], "Bias for Action": ["q2"]}, mtime=2000)
+    second = get_question_bank(path)
+    assert second is not first
+    assert second.principles == ("Ownership", "Bias for Action")
+    # Sessions holding the old snapshot keep it unchanged
+    assert first.principles == ("Ownership",)
+
+
+def test_broken_file_keeps_previous_bank(bank_file):
+    path = bank_file({"Ownership": ["q1"]}, mtime=1000)
+    first = get_question_bank(path)
+
+    bank_file('{"Ownership": [', mtime=2000)
+    assert get_question_bank(path) is first
+
+    os.remove(path)
+    assert get_question_bank(path) is first
+
+
+def test_broken_file_without_previous_bank_raises(bank_file):
+    path = bank_file("not json", mtime=1000)
+    with pytest.raises(ValueError):
+        get_question_bank(path)
+
+
+def test_selector_asks_each_principle_once():
+    bank = QuestionBank({"A": ["a1", "a2"], "B": ["b1"], "C": ["c1"]})
+    selector = LPSelector(bank)
+
+    picked = []
+    for _ in range(len(bank)):
+        lp = selector.pick_new_lp()
+        picked.append(lp)
+        assert selector.pick_question() in bank.questions[bank.index_of(lp)]
+
+    assert sorted(picked) == ["A", "B", "C"]
+    assert selector.pick_new_lp() is None
+    assert selector.pick_new_lp() is None
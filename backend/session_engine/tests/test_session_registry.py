@@ -0,0 +1,103 @@
+import asyncio
+import pytest
+from session_engine.engine.session_registry import (
+    InMemorySessionRegistry,
+    LeaseKeeper,
+    RedisSessionRegistry,
+    SQLiteSessionRegistry,
+)
+
+
+@pytest.fixture(params=["memory", "sqlite", "redis"])
+def make_registry(request, tmp_path):
+    def make(ttl=30, owner="worker-a"):
+        if request.param == "memory":
+            return InMemorySessionRegistry(ttl=ttl, owner=owner)
+        if request.param == "sqlite":
+            return SQLiteSessionRegistry(path=str(tmp_path / "registry.db"), ttl=ttl, owner=owner)
+        fakeredis = pytest.importorskip("fakeredis")
+        pytest.importorskip("lupa")  # fakeredis needs it for EVAL
+        return RedisSessionRegistry(fakeredis.FakeAsyncRedis(), ttl=ttl, owner=owner)
+    return make
+
+
+def test_one_live_session_per_user(make_registry):
+    registry = make_registry()
+
+    async def run():
+        assert await registry.acquire("u1", "s1")
+        assert not await registry.acquire("u1", "s2")
+        assert await registry.acquire("u2", "s3")
+        return await registry.lookup("u1"), await registry.lookup("nobody")
+
+    entry, missing = asyncio.run(run())
+    assert entry["session_id"] == "s1" and entry["owner"] == "worker-a"
+    assert missing is None
+
+
+def test_renew_and_release_only_touch_the_own_session(make_registry):
+    registry = make_registry()
+
+    async def run():
+        await registry.acquire("u1", "s1")
+        assert await registry.renew("u1", "s1")
+        assert not await registry.renew("u1", "other")
+        await registry.release("u1", "other")
+        assert (await registry.lookup("u1"))["session_id"] == "s1"
+        await registry.release("u1", "s1")
+        assert await registry.lookup("u1") is None
+        assert await registry.acquire("u1", "s2")
+
+    asyncio.run(run())
+
+
+def test_expired_lease_can_be_taken_over(make_registry):
+    registry = make_registry(ttl=0.05)
+
+    async def run():
+        await registry.acquire("u1", "s1")
+        await asyncio.sleep(0.1)
+        assert not await registry.renew("u1", "s1")
+        assert await registry.acquire("u1", "s2")
+
+    asyncio.run(run())
+
+
+def test_lease_keeper_renews_until_dropped(make_registry):
+    registry = make_registry(ttl=0.15)
+    keeper = LeaseKeeper(registry)
+    lost = []
+
+    async def run():
+        await registry.acquire("u1", "s1")
+        keeper.hold("u1", "s1", on_lost=lambda: lost.append("u1"))
+        await asyncio.sleep(0.3)  # twice the TTL: alive only because it was renewed
+        assert (await registry.lookup("u1"))["session_id"] == "s1"
+        keeper.drop("u1")
+        await asyncio.wait_for(keeper._task, 1)  # nothing held: the task exits
+
+    asyncio.run(run())
+    assert lost == []
+
+
+def test_lease_keeper_reports_a_lost_lease_and_restarts(make_registry):
+    registry = make_registry(ttl=0.15)
+    keeper = LeaseKeeper(registry)
+    lost = []
+
+    async def run():
+        await registry.acquire("u1", "s1")
+        keeper.hold("u1", "s1", on_lost=lambda: lost.append("s1"))
+        await registry.release("u1", "s1")  # e.g. taken over after a registry hiccup
+        await asyncio.wait_for(keeper._task, 1)
+        assert lost == ["s1"]
+
+        first_task = keeper._task
+        await registry.acquire("u1", "s2")
+        keeper.hold("u1", "s2", on_lost=lambda: lost.append("s2"))
+        assert keeper._task is not first_task and not keeper._task.done()
+        keeper.drop("u1")
+        await asyncio.wait_for(keeper._task, 1)
+
+    asyncio.run(run())
+    assert lost == ["s1"]
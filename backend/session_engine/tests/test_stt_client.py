@@ -0,0 +1,101 @@
+import asyncio
+import json
+from types import SimpleNamespace
+import pytest
+import websockets.exceptions
+from session_engine.services import stt_client
+from session_engine.services.stt_client import STTMultiplexClient
+
+
+class FakeConnection:
+    """Stands in for the STT service end of the shared WebSocket."""
+
+    def __init__(self):
+        self.sent = []
+        self.incoming = asyncio.Queue()
+
+    async def send(self, message):
+        self.sent.append(json.loads(message))
+
+    def push(self, **message):
+        self.incoming.put_nowait(json.dumps(message))
+
+    def drop(self):
+        self.incoming.put_nowait(None)
+
+    async def close(self):
+        self.drop()
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        message = await self.incoming.get()
+        if message is None:
+            raise StopAsyncIteration
+        return message
+
+
+@pytest.fixture
+def connections(monkeypatch):
+    opened = []
+
+    async def connect(url, **kwargs):
+        opened.append(FakeConnection())
+        return opened[-1]
+
+    monkeypatch.setattr(stt_client, "websockets", SimpleNamespace(connect=connect, exceptions=websockets.exceptions))
+    return opened
+
+
+def test_streams_share_one_connection_and_get_their_own_messages(connections):
+    client = STTMultiplexClient("ws://stt")
+
+    async def run():
+        async with client.stream({"question_type": "main"}) as first, client.stream({"question_type": "followup"}) as second:
+            conn = connections[0]
+            conn.push(stream_id=second.stream_id, type="done", text="second answer")
+            conn.push(stream_id="someone-else", type="done", text="not ours")
+            conn.push(stream_id=first.stream_id, type="partial", text="first")
+            conn.push(stream_id=first.stream_id, type="done", text="first answer")
+            received = [json.loads(await first.recv()), json.loads(await first.recv()), json.loads(await second.recv())]
+        await client.close()
+        return received
+
+    received = asyncio.run(run())
+    assert len(connections) == 1
+    assert [m["text"] for m in received] == ["first", "first answer", "second answer"]
+    starts = [m for m in connections[0].sent if m["command"] == "start"]
+    assert [m["question_type"] for m in starts] == ["main", "followup"]
+    assert not any(m["command"] == "cancel" for m in connections[0].sent)  # both streams finished
+
+
+def test_dropped_connection_fails_its_streams_and_reconnects(connections):
+    client = STTMultiplexClient("ws://stt")
+
+    async def run():
+        async with client.stream({}) as first, client.stream({}) as second:
+            connections[0].drop()
+            errors = [json.loads(await first.recv()), json.loads(await second.recv())]
+        async with client.stream({}) as third:
+            connections[1].push(stream_id=third.stream_id, type="done", text="after reconnect")
+            after = json.loads(await third.recv())
+        await client.close()
+        return errors, after
+
+    errors, after = asyncio.run(run())
+    assert [(e["type"], e["message"]) for e in errors] == [("error", "STT connection lost")] * 2
+    assert len(connections) == 2 and after["text"] == "after reconnect"
+
+
+def test_leaving_a_stream_early_cancels_it_on_the_server(connections):
+    client = STTMultiplexClient("ws://stt")
+
+    async def run():
+        async with client.stream({}) as stream:
+            stream_id = stream.stream_id
+        await client.close()
+        return stream_id
+
+    stream_id = asyncio.run(run())
+    assert connections[0].sent[-1] == {"command": "cancel", "stream_id": stream_id}
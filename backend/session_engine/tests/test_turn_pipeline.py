@@ -0,0 +1,158 @@
+import asyncio
+from session_engine.engine import turn_pipeline
+from session_engine.engine.turn_pipeline import TurnPipeline
+
+LP, QUESTION, ANSWER = "Ownership", "Tell me about a time you took ownership.", "I led the migration and cut costs."
+
+
+class FakeModerator:
+    def __init__(self, status, delay=0.0):
+        self.status = status
+        self.delay = delay
+
+    async def moderate_async(self, question, answer):
+        await asyncio.sleep(self.delay)
+        return self.status
+
+
+class FakeFollowupManager:
+    def __init__(self, decision=True, chunks=(), followup="what was the hardest part?", decision_delay=0.0):
+        self.decision = decision
+        self.decision_delay = decision_delay
+        self.chunks = chunks
+        self.followup = followup
+        self.calls = []
+        self.closed = False
+        self.cancelled = False
+        self.records = []  # record flag of each next-turn call
+        self.recorded = []
+
+    async def stream_next_turn_async(self, lp, question, answer, num_followups, num_lp_questions, time_remaining,
+                                     record=True):
+        self.calls.append("stream_next_turn")
+        self.records.append(record)
+        try:
+            await asyncio.sleep(self.decision_delay)
+            yield self.decision
+            for chunk in self.chunks:
+                await asyncio.sleep(0)
+                yield chunk
+        finally:
+            self.closed = True
+
+    async def next_turn_async(self, lp, question, answer, num_followups, num_lp_questions, time_remaining,
+                              record=True):
+        self.calls.append("next_turn")
+        self.records.append(record)
+        try:
+            await asyncio.sleep(0.05)
+        except asyncio.CancelledError:
+            self.cancelled = True
+            raise
+        return True, self.followup
+
+    async def record_turn_async(self, lp, question, answer):
+        self.recorded.append(answer)
+
+    def fallback_followup(self, lp, question, answer):
+        return "can you elaborate further on that?"
+
+
+def process(pipeline):
+    return pipeline.process(LP, QUESTION, ANSWER, 0, 1, 20)
+
+
+async def collect(result):
+    return [sentence async for sentence in result.followup_stream]
+
+
+def test_stream_yields_sentences_after_decision():
+    manager = FakeFollowupManager(chunks=["What was ", "the outcome? How did you ", "measure it?"])
+
+    async def run():
+        result = await process(TurnPipeline(FakeModerator("valid"), manager, stream=True))
+        return result, await collect(result)
+
+    result, sentences = asyncio.run(run())
+    assert result.should_followup and result.followup is None
+    assert sentences == ["What was the outcome?", "How did you measure it?"]
+    assert manager.calls == ["stream_next_turn"]
+
+
+def test_stream_no_followup_when_decision_is_no():
+    manager = FakeFollowupManager(decision=False)
+    result = asyncio.run(process(TurnPipeline(FakeModerator("valid"), manager, stream=True)))
+    assert not result.should_followup
+    assert result.followup_stream is None
+    assert manager.closed
+
+
+def test_slow_decision_falls_back_within_budget(monkeypatch):
+    monkeypatch.setattr(turn_pipeline, "FOLLOWUP_LATENCY_BUDGET", 0.05)
+    manager = FakeFollowupManager(decision_delay=1.0)
+
+    async def run():
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        result = await process(TurnPipeline(FakeModerator("valid"), manager, stream=True))
+        return result, loop.time() - started
+
+    result, elapsed = asyncio.run(run())
+    assert elapsed < 0.5
+    assert result.should_followup and result.followup_stream is None
+    assert result.followup == "can you elaborate further on that?"
+    assert manager.closed
+
+
+def test_decision_wait_counts_against_first_sentence_budget(monkeypatch):
+    monkeypatch.setattr(turn_pipeline, "FOLLOWUP_LATENCY_BUDGET", 1.0)
+    manager = FakeFollowupManager(chunks=["What changed?"], decision_delay=0.2)
+
+    async def run():
+        result = await process(TurnPipeline(FakeModerator("valid"), manager, stream=True))
+        await result.discard()
+        return result
+
+    result = asyncio.run(run())
+    assert 0.5 < result.first_sentence_budget <= 0.8
+
+
+def test_stream_dropped_when_moderation_rejects():
+    manager = FakeFollowupManager(chunks=["never read."] * 3)
+    result = asyncio.run(process(TurnPipeline(FakeModerator("off_topic", delay=0.01), manager, stream=True)))
+    assert result.mod_status == "off_topic" and not result.is_answer
+    assert result.followup_stream is None
+    assert manager.closed
+
+
+def test_stream_discard_stops_generation():
+    manager = FakeFollowupManager(chunks=["Sentence one. "] * 50)
+
+    async def run():
+        result = await process(TurnPipeline(FakeModerator("valid"), manager, stream=True))
+        await result.discard()
+
+    asyncio.run(run())
+    assert manager.closed
+
+
+def test_speculative_next_turn_starts_before_moderation_finishes():
+    manager = FakeFollowupManager()
+    result = asyncio.run(process(TurnPipeline(FakeModerator("valid", delay=0.01), manager, speculative=True, stream=False)))
+    assert result.should_followup
+    assert result.followup == "what was the hardest part?"
+    assert manager.calls == ["next_turn"]
+
+
+def test_speculative_next_turn_cancelled_when_moderation_rejects():
+    manager = FakeFollowupManager()
+    result = asyncio.run(process(TurnPipeline(FakeModerator("repeat", delay=0.01), manager, speculative=True, stream=False)))
+    assert result.mod_status == "repeat" and not result.should_followup
+    assert manager.cancelled
+
+
+def test_no_followup_work_when_not_wanted():
+    manager = FakeFollowupManager()
+    result = asyncio.run(TurnPipeline(FakeModerator("valid"), manager, stream=True).process(LP, QUESTION, ANSWER, 0, 1, 20, want_followup=False))
+    assert result.is_answer and not result.should_followup
+    assert manager.calls == []
@@ -27,3 +27,23 @@ class StreamTextChunkBuffer:
         if self.buffer.strip():
             self.tts.speak(self.buffer)
             self.buffer = ""
+
+
+# Sentence end followed by whitespace, so "3.5" or a chunk ending mid-token is not split
+SENTENCE_END = re.compile(r'[.!?]+["\')\]]*\s')
+
+async def iter_sentences(chunks):
+    """Regroup an async stream of text chunks into sentences, yielding each as soon as it is complete."""
+    buffer = ""
+    async for chunk in chunks:
+        buffer += chunk
+        while True:
+            match = SENTENCE_END.search(buffer)
+            if not match:
+                break
+            sentence = buffer[:match.end()].strip()
+            buffer = buffer[match.end():]
+            if sentence:
+                yield sentence
+    if buffer.strip():
+        yield buffer.strip()
@@ -0,0 +1,86 @@
+"""
+Microbenchmark of the VAD stage over recorded audio.
+
+    python bench_vad.py answer1.wav answer2.wav --block-ms 60 --repeat 5
+
+WAV files must be mono 16-bit PCM at 8, 16, 32 or 48 kHz. Each file is fed in
+blocks the way the microphone callback or a client would send them, once as
+float32 (microphone format) and once as int16 (client pcm_s16le). Reports
+frames per second for VADMonitor and for the previous per-block
+implementation, which converted with fresh allocations and classified only the
+first 30ms frame of each block.
+"""
+import argparse
+import time
+import wave
+import numpy as np
+import webrtcvad
+from vad import FRAME_MS, VADMonitor
+
+
+def load_wav(path):
+    with wave.open(path, "rb") as f:
+        if f.getnchannels() != 1 or f.getsampwidth() != 2:
+            raise ValueError(f"{path}: expected mono 16-bit PCM")
+        return f.getframerate(), np.frombuffer(f.readframes(f.getnframes()), dtype=np.int16)
+
+
+def blocks(samples, block_samples):
+    data = samples.tobytes()
+    step = block_samples * samples.itemsize
+    return [data[i:i + step] for i in range(0, len(data), step)]
+
+
+def legacy(chunks, sample_rate):
+    """The old stream_callback VAD path; returns (frames classified, frames in the audio)."""
+    vad = webrtcvad.Vad(3)
+    frame_size = int(sample_rate * FRAME_MS / 1000) * 2
+    classified = 0
+    for in_data in chunks:
+        float_audio = np.frombuffer(in_data, dtype=np.float32)
+        int16_audio = np.clip(float_audio * 32768, -32768, 32767).astype(np.int16)
+        pcm_data = int16_audio.tobytes()
+        if len(pcm_data) >= frame_size:
+            vad.is_speech(pcm_data[:frame_size], sample_rate)
+            classified += 1
+    return classified
+
+
+def run(label, fn, frames, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - start)
+    audio_seconds = frames * FRAME_MS / 1000
+    print(f"{label:<28} {frames / best:>12,.0f} frames/s  {audio_seconds / best:>8,.0f}x real time  {result}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the STT VAD stage on recorded audio")
+    parser.add_argument("wavs", nargs="+")
+    parser.add_argument("--block-ms", type=int, default=60, help="callback block size (microphone default: 60ms)")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    for path in args.wavs:
+        sample_rate, samples = load_wav(path)
+        block_samples = sample_rate * args.block_ms // 1000
+        float_chunks = blocks(samples.astype(np.float32) / 32768, block_samples)
+        int_chunks = blocks(samples, block_samples)
+        frames = len(samples) // (sample_rate * FRAME_MS // 1000)
+        print(f"\n{path}: {len(samples) / sample_rate:.1f}s at {sample_rate} Hz, {frames} frames, {args.block_ms}ms blocks")
+
+        def monitor(chunks, dtype):
+            vad = VADMonitor(sample_rate, dtype)
+            for chunk in chunks:
+                vad.process(chunk)
+            return vad.stats()
+
+        run("legacy (first frame only)", lambda: f"classified={legacy(float_chunks, sample_rate)}", frames, args.repeat)
+        run("VADMonitor float32", lambda: monitor(float_chunks, np.float32), frames, args.repeat)
+        run("VADMonitor int16", lambda: monitor(int_chunks, np.int16), frames, args.repeat)
+
+
+if __name__ == "__main__":
+    main()
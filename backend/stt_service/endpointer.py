@@ -0,0 +1,163 @@
+import re
+from vad import FRAME_MS
+
+# Per question type, in seconds: the shortest and longest silence that ends an
+# answer, the silence used before the speaker's own pauses are known, and how
+# long to wait for any speech at all. Overridable per stream in the config.
+ENDPOINT_PROFILES = {
+    "main": {"min_silence": 0.9, "initial_silence": 2.0, "max_silence": 4.0, "max_wait": 90},
+    "followup": {"min_silence": 0.7, "initial_silence": 1.6, "max_silence": 3.0, "max_wait": 60},
+}
+DEFAULT_PROFILE = "main"
+# The flat silence every answer waited for before adaptive endpointing; savings are reported against it
+LEGACY_STOP_DURATION = 4.0
+
+MIN_PAUSES = 5            # pauses needed before the speaker's own distribution is trusted
+PAUSE_PERCENTILE = 0.9
+PAUSE_MARGIN = 1.3        # end of answer = comfortably longer than the speaker's long pauses
+STABLE_SECONDS = 0.5      # transcript unchanged this long counts as settled
+COMPLETE_FACTOR = 0.6     # settled transcript ending a sentence
+INCOMPLETE_FACTOR = 1.5   # transcript trailing off mid-sentence
+NEAR_END_FRACTION = 0.6   # share of the required silence at which a pause is reported as nearing the end
+
+SENTENCE_END = re.compile(r"[.?!][\"')\]]*\s*$")
+TRAILING_WORD = re.compile(
+    r"\b(and|but|so|or|because|like|then|which|that|the|a|an|to|of|with|um+|uh+|er+|hmm+)\W*$",
+    re.IGNORECASE
+)
+
+
+class EndpointStats:
+    """Running totals of endpoint decisions for /endpointer/stats."""
+
+    def __init__(self):
+        self.by_type = {}
+
+    def record(self, profile, silence, baseline, reason):
+        entry = self.by_type.setdefault(profile, {"turns": 0, "silence": 0.0, "saved": 0.0, "reasons": {}})
+        entry["turns"] += 1
+        entry["silence"] += silence
+        entry["saved"] += max(0.0, baseline - silence)
+        entry["reasons"][reason] = entry["reasons"].get(reason, 0) + 1
+
+    def snapshot(self):
+        return {
+            profile: {
+                "turns": entry["turns"],
+                "avg_silence_seconds": round(entry["silence"] / entry["turns"], 3),
+                "avg_saved_seconds": round(entry["saved"] / entry["turns"], 3),
+                "reasons": dict(entry["reasons"]),
+            }
+            for profile, entry in self.by_type.items()
+        }
+
+
+endpoint_stats = EndpointStats()
+
+
+class Endpointer:
+    """
+    Decides when an answer is over instead of waiting a flat silence. The
+    silence required starts from the profile's initial value and, once enough
+    pauses have been measured, becomes a margin over the speaker's own long
+    pauses. A settled transcript that ends a sentence shortens it; one that
+    trails off mid-sentence lengthens it. Always within [min_silence, max_silence].
+    """
+
+    def __init__(self, question_type=DEFAULT_PROFILE, min_silence=None, initial_silence=None, max_silence=None,
+                 max_wait=None):
+        # Unknown types from the client fall back to the default profile
+        self.profile = question_type if question_type in ENDPOINT_PROFILES else DEFAULT_PROFILE
+        profile = ENDPOINT_PROFILES[self.profile]
+        self.max_silence = max_silence if max_silence is not None else profile["max_silence"]
+        self.min_silence = min(min_silence if min_silence is not None else profile["min_silence"], self.max_silence)
+        initial = initial_silence if initial_silence is not None else profile["initial_silence"]
+        self.initial_silence = min(max(initial, self.min_silence), self.max_silence)
+        self.max_wait = max_wait if max_wait is not None else profile["max_wait"]
+
+        self.finals = []
+        self.partial = ""
+        self.changed_at_frame = 0
+        self.frames = 0
+        self.reason = None
+        self.near_end_reported = False
+
+    @classmethod
+    def from_config(cls, config):
+        """Build from a transcription config; the old fixed `stop_duration` becomes the upper bound."""
+        return cls(
+            question_type=config.get("question_type", DEFAULT_PROFILE),
+            min_silence=config.get("min_silence"),
+            initial_silence=config.get("initial_silence"),
+            max_silence=config.get("max_silence", config.get("stop_duration")),
+            max_wait=config.get("max_wait"),
+        )
+
+    def on_partial(self, text):
+        if text != self.partial:
+            self.partial = text
+            self.changed_at_frame = self.frames
+
+    def on_final(self, text):
+        self.finals.append(text)
+        self.partial = ""
+        self.changed_at_frame = self.frames
+
+    def transcript(self):
+        return " ".join(self.finals + [self.partial]).strip()
+
+    def required_silence(self, vad):
+        """Silence (seconds) that ends the answer right now, and why."""
+        pauses = sorted(vad.pauses)
+        if len(pauses) >= MIN_PAUSES:
+            required = pauses[min(len(pauses) - 1, int(len(pauses) * PAUSE_PERCENTILE))] * PAUSE_MARGIN
+            reason = "pause_profile"
+        else:
+            required = self.initial_silence
+            reason = "initial"
+
+        text = self.transcript()
+        settled = (self.frames - self.changed_at_frame) * FRAME_MS / 1000 >= STABLE_SECONDS
+        if text and settled and SENTENCE_END.search(text):
+            required *= COMPLETE_FACTOR
+            reason += "+sentence_end"
+        elif text and TRAILING_WORD.search(text):
+            required *= INCOMPLETE_FACTOR
+            reason += "+trailing"
+        return min(max(required, self.min_silence), self.max_silence), reason
+
+    def near_end(self, vad):
+        """
+        True once per pause, when the silence reaches NEAR_END_FRACTION of what
+        would end the answer; lets callers start work before the answer is over.
+        """
+        silence = vad.silence_seconds()
+        if silence == 0.0:
+            self.near_end_reported = False
+            return False
+        if self.reason is not None or self.near_end_reported or not vad.speech_detected:
+            return False
+        required, _ = self.required_silence(vad)
+        if silence < required * NEAR_END_FRACTION:
+            return False
+        self.near_end_reported = True
+        return True
+
+    def is_complete(self, vad):
+        """Call after every block the VAD has processed."""
+        self.frames = vad.frames
+        if self.reason is not None:
+            return True
+        silence = vad.silence_seconds()
+        if not vad.speech_detected or silence < self.min_silence:
+            return False
+        required, reason = self.required_silence(vad)
+        if silence < required:
+            return False
+
+        self.reason = reason if silence < self.max_silence else "max_silence"
+        saved = max(0.0, LEGACY_STOP_DURATION - silence)
+        endpoint_stats.record(self.profile, silence, LEGACY_STOP_DURATION, self.reason)
+        print(f"⏱️ End of answer after {silence:.2f}s silence ({self.reason}, {len(vad.pauses)} pauses measured); "
+              f"{saved:.2f}s sooner than the old fixed {LEGACY_STOP_DURATION:.1f}s wait")
+        return True
@@ -0,0 +1,93 @@
+"""
+Streams recorded WAV files to /ws/transcribe as client audio, many candidates
+at once, to load-test one STT process on a headless box.
+
+    python load_test.py answer1.wav answer2.wav --concurrency 20
+
+WAV files must be mono 16-bit PCM at 8, 16, 32 or 48 kHz. Audio is paced in
+real time unless --fast is given; trailing silence is appended so the server's
+silence detection can end the answer.
+"""
+import argparse
+import asyncio
+import itertools
+import json
+import time
+import wave
+import websockets
+
+FRAME_MS = 20
+
+
+def load_wav(path):
+    with wave.open(path, "rb") as f:
+        if f.getnchannels() != 1 or f.getsampwidth() != 2:
+            raise ValueError(f"{path}: expected mono 16-bit PCM")
+        return f.getframerate(), f.readframes(f.getnframes())
+
+
+async def stream_one(uri, path, sample_rate, pcm, args):
+    frame_bytes = sample_rate * FRAME_MS // 1000 * 2
+    trailer = bytes(int(sample_rate * (args.stop_duration + 1)) * 2)
+    start = time.monotonic()
+    async with websockets.connect(uri) as ws:
+        await ws.send(json.dumps({
+            "stop_duration": args.stop_duration,
+            "max_wait": args.max_wait,
+            "encoding": "pcm_s16le",
+            "sample_rate": sample_rate
+        }))
+
+        async def send_audio():
+            audio = pcm + trailer
+            for i, offset in enumerate(range(0, len(audio), frame_bytes)):
+                await ws.send(audio[offset:offset + frame_bytes])
+                if not args.fast:
+                    # Pace against the start time so sleep jitter does not accumulate
+                    await asyncio.sleep(max(0.0, start + (i + 1) * FRAME_MS / 1000 - time.monotonic()))
+            await ws.send(json.dumps({"command": "end"}))
+
+        sender = asyncio.create_task(send_audio())
+        try:
+            async for message in ws:
+                data = json.loads(message)
+                if data["type"] in ("done", "cancelled", "error"):
+                    return path, data, time.monotonic() - start, len(pcm) / 2 / sample_rate
+        finally:
+            sender.cancel()
+            await asyncio.gather(sender, return_exceptions=True)
+    return path, {"type": "error", "message": "connection closed"}, time.monotonic() - start, len(pcm) / 2 / sample_rate
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="Load-test the STT service with recorded WAV files")
+    parser.add_argument("wavs", nargs="+")
+    parser.add_argument("--uri", default="ws://localhost:8002/ws/transcribe")
+    parser.add_argument("--concurrency", type=int, default=10)
+    parser.add_argument("--stop-duration", type=float, default=2.0)
+    parser.add_argument("--max-wait", type=float, default=20)
+    parser.add_argument("--fast", action="store_true", help="send audio as fast as possible instead of in real time")
+    args = parser.parse_args()
+
+    recordings = [(path, *load_wav(path)) for path in args.wavs]
+    jobs = [stream_one(args.uri, path, rate, pcm, args)
+            for path, rate, pcm in itertools.islice(itertools.cycle(recordings), args.concurrency)]
+
+    wall = time.monotonic()
+    results = await asyncio.gather(*jobs, return_exceptions=True)
+    wall = time.monotonic() - wall
+
+    ok = 0
+    for result in results:
+        if isinstance(result, Exception):
+            print(f"❌ {type(result).__name__}: {result}")
+            continue
+        path, data, elapsed, audio_seconds = result
+        ok += data["type"] == "done"
+        text = data.get("text", data.get("message", ""))
+        print(f"[{data['type']}] {path}: {audio_seconds:.1f}s audio in {elapsed:.1f}s -> {text[:60]!r}")
+    print(f"{ok}/{len(results)} streams transcribed in {wall:.1f}s")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -1,8 +1,7 @@
 import os
-import asyncio
+import sys
 import time
 import numpy as np
-import pyaudio
 from dotenv import load_dotenv
 import speechmatics
 from speechmatics.models import (
@@ -12,7 +11,15 @@ from speechmatics.models import (
     ServerMessageType,
 )
 from httpx import HTTPStatusError
-import webrtcvad
+from vad import VADMonitor
+from endpointer import Endpointer
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from common.audio_buffer import AUDIO_BUFFER_SECONDS, AudioProcessor
+
+try:
+    import pyaudio  # only needed to capture from a local microphone
+except ImportError:
+    pyaudio = None
 
 load_dotenv()
 
@@ -21,70 +28,61 @@ LANGUAGE = "en"
 CONNECTION_URL = f"wss://eu2.rt.speechmatics.com/v2/{LANGUAGE}"
 CHUNK_SIZE = 960  # 30ms at 16kHz with 16-bit PCM (960 bytes)
 
-
-class AudioProcessor:
-    def __init__(self):
-        self.wave_data = bytearray()
-        self.read_offset = 0
-        self.finished = False
-
-    def finish(self):
-        self.finished = True
-
-    async def read(self, chunk_size):
-        while self.read_offset + chunk_size > len(self.wave_data):
-            if self.finished:
-                return b""  # Signal end-of-audio
-            await asyncio.sleep(0.001)
-
-        new_offset = self.read_offset + chunk_size
-        data = self.wave_data[self.read_offset:new_offset]
-        self.read_offset = new_offset
-        return data
-
-    def write_audio(self, data):
-        self.wave_data.extend(data)
-
-
-class VADMonitor:
-    def __init__(self, sample_rate=16000):
-        self.vad = webrtcvad.Vad(3)
-        self.sample_rate = sample_rate
-        self.silence_start_time = None
-        self.speech_detected = False
-
-    def update(self, pcm_data):
-        try:
-            is_speech = self.vad.is_speech(pcm_data, self.sample_rate)
-        except webrtcvad.VadError:
-            is_speech = False
-
-        if is_speech:
-            print("🗣️ Speech detected")
-            self.speech_detected = True
-            self.silence_start_time = None
-        else:
-            if self.speech_detected and self.silence_start_time is None:
-                self.silence_start_time = time.time()
-
-    def is_sustained_silence(self, duration):
-        return self.silence_start_time and (time.time() - self.silence_start_time) >= duration
+# Client-streamed audio: what the recognizer accepts and webrtcvad can frame
+CLIENT_ENCODINGS = {"pcm_s16le": np.int16, "pcm_f32le": np.float32}
+VAD_SAMPLE_RATES = (8000, 16000, 32000, 48000)
 
 
 class STTTranscriber:
-    def __init__(self, silence_duration, max_wait=None, cancel_event=None):
+    def __init__(self, silence_duration, max_wait=None, cancel_event=None, endpointer=None, on_segment=None):
         self.silence_duration = silence_duration
-        self.max_wait = max_wait
+        # Ends the answer adaptively; silence_duration is only the upper bound
+        self.endpointer = endpointer or Endpointer(max_silence=silence_duration)
+        self.max_wait = max_wait if endpointer is None else endpointer.max_wait
         self.cancel_event = cancel_event
         self.audio_processor = AudioProcessor()
         self.transcript_final = ""
+        self.transcript_partial = ""
+        # Called with every partial/final update, from the recognizer's event loop thread
+        self.on_segment = on_segment
         self.vad_monitor = VADMonitor()
         self.stop_transcription = False
         self.ws = None
         self.sample_rate = 16000
+        self.encoding = "pcm_f32le"  # PyAudio microphone format
         self.start_time = time.time()
 
+    def use_client_audio(self, encoding, sample_rate):
+        """Take audio pushed through feed() instead of the local microphone."""
+        if encoding not in CLIENT_ENCODINGS:
+            raise ValueError(f"Unsupported encoding {encoding!r}; expected one of {sorted(CLIENT_ENCODINGS)}")
+        if sample_rate not in VAD_SAMPLE_RATES:
+            raise ValueError(f"Unsupported sample_rate {sample_rate}; expected one of {VAD_SAMPLE_RATES}")
+        self.encoding = encoding
+        self.sample_rate = sample_rate
+        self.audio_processor = AudioProcessor(sample_rate * self.sample_width * AUDIO_BUFFER_SECONDS)
+        self.vad_monitor = VADMonitor(sample_rate, CLIENT_ENCODINGS[encoding])
+
+    @property
+    def sample_width(self):
+        return np.dtype(CLIENT_ENCODINGS[self.encoding]).itemsize
+
+    def stop(self):
+        """End the transcription from outside the audio path (cancel, client gone, end of stream)."""
+        self.stop_transcription = True
+        self.audio_processor.finish()
+
     def stream_callback(self, in_data, frame_count, time_info, status):
+        if not self.feed(in_data):
+            print("🔁 Stream callback returning silence to finish...")
+            return (bytes(len(in_data)), pyaudio.paComplete)
+        return in_data, pyaudio.paContinue
+
+    def feed(self, in_data):
+        """
+        Push one block of audio (microphone callback or client frame) to the
+        recognizer and the VAD. Returns False once transcription should stop.
+        """
         # Check cancel signal
         if self.cancel_event and self.cancel_event.is_set():
             print("❌ Cancel signal received from WebSocket.")
@@ -104,40 +102,58 @@ class STTTranscriber:
 
         # Stop if triggered
         if self.stop_transcription:
-            print("🔁 Stream callback returning silence to finish...")
             self.audio_processor.finish()
-            return (bytes(len(in_data)), pyaudio.paComplete)
+            return False
 
         self.audio_processor.write_audio(in_data)
 
-        # Convert and update VAD
-        float_audio = np.frombuffer(in_data, dtype=np.float32)
-        int16_audio = np.clip(float_audio * 32768, -32768, 32767).astype(np.int16)
-        pcm_data = int16_audio.tobytes()
-
-        frame_duration_ms = 30
-        frame_size = int(self.sample_rate * frame_duration_ms / 1000) * 2
-
-        if len(pcm_data) >= frame_size:
-            frame = pcm_data[:frame_size]
-            self.vad_monitor.update(frame)
+        # Every 30ms frame of the block, converted and framed in place
+        self.vad_monitor.process(in_data)
 
-        if self.vad_monitor.is_sustained_silence(self.silence_duration):
-            print("🛑 Sustained silence. Preparing to stop...")
+        if self.endpointer.is_complete(self.vad_monitor):
+            print("🛑 End of answer. Preparing to stop...")
             self.stop_transcription = True
+        elif self.endpointer.near_end(self.vad_monitor):
+            self.emit_segment("pause", "")
 
-        return in_data, pyaudio.paContinue
+        return True
 
     def on_partial(self, msg):
         if 'transcript' in msg['metadata']:
             print(f"[partial] {msg['metadata']['transcript']}")
+            self.transcript_partial = msg['metadata']['transcript']
+            self.endpointer.on_partial(self.transcript_partial)
+            self.emit_segment("partial", self.transcript_partial)
 
     def on_final(self, msg):
         text = msg['metadata']['transcript']
         self.transcript_final += text + " "
+        self.transcript_partial = ""
+        self.endpointer.on_final(text)
+        self.emit_segment("final", text)
         print(f"[FINAL SAVED] {text}")
 
+    def emit_segment(self, kind, segment):
+        """
+        Forward a transcript update ("pause" when the silence nears the end of
+        the answer, with no new segment). "text" is the best full transcript so far,
+        "stable" the part that will not change (final segments only), and
+        "speaking" whether the candidate was still talking at that moment.
+        """
+        if self.on_segment is None:
+            return
+        stable = self.transcript_final.strip()
+        self.on_segment({
+            "type": kind,
+            "text": f"{stable} {self.transcript_partial}".strip(),
+            "stable": stable,
+            "segment": segment,
+            "speaking": self.vad_monitor.in_speech,
+        })
+
     def get_default_device(self):
+        if pyaudio is None:
+            raise RuntimeError("PyAudio is not installed; stream audio from the client instead")
         p = pyaudio.PyAudio()
         default_index = p.get_default_input_device_info()['index']
         rate = int(p.get_device_info_by_index(default_index)['defaultSampleRate'])
@@ -155,10 +171,13 @@ class STTTranscriber:
             stream_callback=self.stream_callback
         )
 
-    def run_transcription(self):
-        device_index, sample_rate = self.get_default_device()
-        stream = self.get_microphone_stream(device_index, sample_rate)
+    def report_buffer(self):
+        stats = self.audio_processor.stats()
+        if stats["overruns"]:
+            print(f"⚠️ Recognizer fell behind: {stats['overruns']} frame(s) / {stats['dropped_bytes']} bytes dropped, "
+                  f"peak {stats['peak_fill']}/{stats['capacity']} bytes buffered")
 
+    def _recognizer(self, sample_rate):
         conn = ConnectionSettings(url=CONNECTION_URL, auth_token=API_KEY)
         self.ws = speechmatics.client.WebsocketClient(conn)
 
@@ -169,13 +188,20 @@ class STTTranscriber:
         )
 
         audio_settings = AudioSettings(
-            encoding="pcm_f32le",
+            encoding=self.encoding,
             sample_rate=sample_rate,
             chunk_size=CHUNK_SIZE,
         )
 
         self.ws.add_event_handler(ServerMessageType.AddPartialTranscript, self.on_partial)
         self.ws.add_event_handler(ServerMessageType.AddTranscript, self.on_final)
+        return conf, audio_settings
+
+    def run_transcription(self):
+        """Transcribe from the host's default microphone; blocks until the answer ends."""
+        device_index, sample_rate = self.get_default_device()
+        stream = self.get_microphone_stream(device_index, sample_rate)
+        conf, audio_settings = self._recognizer(sample_rate)
 
         try:
             self.ws.run_synchronously(self.audio_processor, conf, audio_settings)
@@ -185,6 +211,25 @@ class STTTranscriber:
             else:
                 raise e
 
+        self.report_buffer()
+        return self.transcript_final.strip()
+
+    async def run_transcription_async(self):
+        """
+        Transcribe audio pushed through feed() on the caller's event loop, so
+        one process can serve many concurrent streams without a thread each.
+        """
+        conf, audio_settings = self._recognizer(self.sample_rate)
+
+        try:
+            await self.ws.run(self.audio_processor, conf, audio_settings)
+        except HTTPStatusError as e:
+            if e.response.status_code == 401:
+                print("Invalid API Key.")
+            else:
+                raise e
+
+        self.report_buffer()
         return self.transcript_final.strip()
 
 
@@ -5,86 +5,147 @@ import json
 import threading
 from concurrent.futures import ThreadPoolExecutor
 from stt_handler1 import STTTranscriber  # must expose class
+from endpointer import Endpointer, endpoint_stats
 
 app = FastAPI()
 executor = ThreadPoolExecutor()
 
+
+class SegmentForwarder:
+    """
+    Carries transcript segments from the recognizer (which may run on another
+    thread) to the client in order. flush() delivers everything pushed so far,
+    so a "done" sent after it never overtakes a segment.
+    """
+
+    def __init__(self, send, tag=None):
+        self.loop = asyncio.get_running_loop()
+        self.queue = asyncio.Queue()
+        self.tag = tag or {}
+        self.task = asyncio.create_task(self._run(send))
+
+    def push(self, segment):
+        self.loop.call_soon_threadsafe(self.queue.put_nowait, {**self.tag, **segment})
+
+    async def _run(self, send):
+        try:
+            while (segment := await self.queue.get()) is not None:
+                await send(segment)
+        except Exception as e:
+            print(f"⚠️ Stopped forwarding transcript segments: {e}")
+
+    async def flush(self):
+        self.queue.put_nowait(None)
+        await self.task
+
+    async def close(self):
+        self.task.cancel()
+        await asyncio.gather(self.task, return_exceptions=True)
+
+
 @app.websocket("/ws/transcribe")
 async def transcribe_websocket(websocket: WebSocket):
+    """
+    One transcription per connection.
+      client -> {"question_type", "stop_duration", "max_wait", "encoding", "sample_rate", "stream_transcripts"}
+                (config, first message)
+      client -> binary audio frames, mono, in the declared encoding
+      client -> {"command": "end"} when the audio is over, or {"command": "cancel"}
+      server -> {"type": "partial" | "final" | "pause", "text", "stable", "segment", "speaking"}   (with "stream_transcripts": true)
+      server -> {"type": "done" | "cancelled" | "error", ...}
+    Without "encoding"/"sample_rate" in the config the server's own microphone is used.
+    The answer ends adaptively (see endpointer.py); "question_type" picks the
+    silence limits and "stop_duration" caps the silence waited for.
+    """
     print("🔍 [STT DEBUG] New STT WebSocket connection")
     await websocket.accept()
     cancel_event = threading.Event()
     transcriber = None
-    
-    def run_transcription(stop_duration, max_wait):
-        nonlocal transcriber
-        transcriber = STTTranscriber(stop_duration, max_wait, cancel_event)
-        return transcriber.run_transcription()
-    
+    client_audio = False
+
+    async def receive_commands():
+        """Feeds client audio to the transcriber; returns when the client cancels."""
+        while True:
+            message = await websocket.receive()
+            if message["type"] == "websocket.disconnect":
+                raise WebSocketDisconnect(message.get("code", 1000))
+
+            data = message.get("bytes")
+            if data is not None:
+                if not client_audio:
+                    continue
+                if len(data) % transcriber.sample_width:
+                    raise ValueError(f"Audio frame of {len(data)} bytes is not whole {transcriber.encoding} samples")
+                transcriber.feed(data)
+                continue
+
+            msg = json.loads(message["text"])
+            print(f"🔍 [STT DEBUG] Received message: {msg}")
+            if msg.get("command") == "cancel":
+                return "cancel"
+            if msg.get("command") == "end":
+                print("🔍 [STT DEBUG] Client audio ended")
+                transcriber.stop()
+
     transcription_task = None
     receive_task = None
-    
+    segments = None
+
+    async def send(payload):
+        await websocket.send_text(json.dumps(payload))
+
     try:
         config_data = await websocket.receive_text()
         config = json.loads(config_data)
         stop_duration = config.get("stop_duration", 4)
         max_wait = config.get("max_wait", 10)
-        
-        loop = asyncio.get_event_loop()
-        transcription_task = loop.run_in_executor(
-            executor, run_transcription, stop_duration, max_wait
+
+        if config.get("stream_transcripts"):
+            segments = SegmentForwarder(send)
+        transcriber = STTTranscriber(
+            stop_duration, max_wait, cancel_event, Endpointer.from_config(config),
+            on_segment=segments.push if segments else None
         )
-        
-        receive_task = asyncio.create_task(websocket.receive_text())
-        
-        while True:
-            print("🔍 [STT DEBUG] Waiting for transcription or cancel command")
-            done, pending = await asyncio.wait(
-                [transcription_task, receive_task],
-                return_when=asyncio.FIRST_COMPLETED,
-            )
-            print(f"🔍 [STT DEBUG] Task completed - done: {len(done)}")
-            # Cancel all pending tasks to prevent orphaned tasks
-            for task in pending:
-                task.cancel()
-                try:
-                    await task  # Wait for cancellation to complete
-                except asyncio.CancelledError:
-                    pass  # Expected when cancelling
-            
-            if transcription_task in done:
-                transcript = transcription_task.result()
-                await websocket.send_text(json.dumps({
-                    "type": "done",
-                    "text": transcript
-                }))
-                break
-                
-            if receive_task in done:
-                try:
-                    msg_text = receive_task.result()
-                    msg = json.loads(msg_text)
-                    print(f"🔍 [STT DEBUG] Received message: {msg}")
-                    if msg.get("command") == "cancel":
-                        print("🚨 [STT DEBUG] CANCEL COMMAND RECEIVED!")
-                        cancel_event.set()
-                        print("🚨 [STT DEBUG] Cancel event set in STT")
-                        await websocket.send_text(json.dumps({
-                            "type": "cancelled",
-                            "text": "Transcription manually cancelled"
-                        }))
-                        break
-                except WebSocketDisconnect:
-                    # Client disconnected naturally - this is expected
-                    print("🔌 STT Client disconnected naturally")
-                    cancel_event.set()
-                    break
-                
-                # Restart receive task for next command
-                receive_task = asyncio.create_task(websocket.receive_text())
-                
+        client_audio = "encoding" in config or "sample_rate" in config
+        if client_audio:
+            transcriber.use_client_audio(config.get("encoding", "pcm_s16le"), int(config.get("sample_rate", 16000)))
+            # Runs on this event loop; no thread is tied up per candidate
+            transcription_task = asyncio.create_task(transcriber.run_transcription_async())
+        else:
+            loop = asyncio.get_event_loop()
+            transcription_task = loop.run_in_executor(executor, transcriber.run_transcription)
+
+        receive_task = asyncio.create_task(receive_commands())
+
+        print("🔍 [STT DEBUG] Waiting for transcription or cancel command")
+        done, _ = await asyncio.wait(
+            [transcription_task, receive_task],
+            return_when=asyncio.FIRST_COMPLETED,
+        )
+        print(f"🔍 [STT DEBUG] Task completed - done: {len(done)}")
+
+        if transcription_task in done:
+            transcript = transcription_task.result()
+            if segments:
+                await segments.flush()
+            await websocket.send_text(json.dumps({
+                "type": "done",
+                "text": transcript
+            }))
+        else:
+            # Raises WebSocketDisconnect / ValueError from the receive loop
+            receive_task.result()
+            print("🚨 [STT DEBUG] CANCEL COMMAND RECEIVED!")
+            cancel_event.set()
+            print("🚨 [STT DEBUG] Cancel event set in STT")
+            await websocket.send_text(json.dumps({
+                "type": "cancelled",
+                "text": "Transcription manually cancelled"
+            }))
+
     except WebSocketDisconnect:
-        print("🔌 STT Client disconnected during setup")
+        # Client disconnected naturally - this is expected
+        print("🔌 STT Client disconnected")
         cancel_event.set()
     except Exception as e:
         print(f"❌ STT Error: {e}")
@@ -95,24 +156,112 @@ async def transcribe_websocket(websocket: WebSocket):
     finally:
         # Cleanup: Cancel any remaining tasks
         cancel_event.set()
-        
-        if transcription_task and not transcription_task.done():
-            transcription_task.cancel()
-            try:
-                await transcription_task
-            except asyncio.CancelledError:
-                pass
-                
-        if receive_task and not receive_task.done():
-            receive_task.cancel()
-            try:
-                await receive_task
-            except asyncio.CancelledError:
-                pass
-                
+        if transcriber is not None:
+            transcriber.stop()
+        if segments:
+            await segments.close()
+
+        for task in (transcription_task, receive_task):
+            if task and not task.done():
+                task.cancel()
+                try:
+                    await task
+                except (asyncio.CancelledError, Exception):
+                    pass
+
         try:
             if not websocket.client_state == WebSocketState.DISCONNECTED:
                 await websocket.close()
         except:
             pass  # Already closed
 
+
+
+@app.websocket("/ws/transcribe/mux")
+async def transcribe_mux_websocket(websocket: WebSocket):
+    """
+    Long-lived connection carrying many transcriptions at once. Every message is
+    tagged with a client-chosen stream_id:
+      client -> {"stream_id", "command": "start", "question_type", "stop_duration", "max_wait", "stream_transcripts"}
+      client -> {"stream_id", "command": "cancel"}
+      server -> {"stream_id", "type": "partial" | "final" | "pause", ...}   (with "stream_transcripts": true)
+      server -> {"stream_id", "type": "done" | "cancelled" | "error", ...}
+    """
+    await websocket.accept()
+    print("🔍 [STT DEBUG] New multiplexed STT connection")
+    loop = asyncio.get_event_loop()
+    streams = {}  # stream_id -> (cancel_event, task)
+    send_lock = asyncio.Lock()
+
+    async def send(payload):
+        async with send_lock:
+            await websocket.send_text(json.dumps(payload))
+
+    async def run_stream(stream_id, cancel_event, config):
+        segments = SegmentForwarder(send, {"stream_id": stream_id}) if config.get("stream_transcripts") else None
+        try:
+            transcript = await loop.run_in_executor(
+                executor,
+                lambda: STTTranscriber(
+                    config.get("stop_duration", 4), config.get("max_wait", 10), cancel_event, Endpointer.from_config(config),
+                    on_segment=segments.push if segments else None
+                ).run_transcription()
+            )
+            if segments:
+                await segments.flush()
+            if not cancel_event.is_set():
+                await send({"stream_id": stream_id, "type": "done", "text": transcript})
+        except Exception as e:
+            print(f"❌ STT Error on stream {stream_id}: {e}")
+            try:
+                await send({"stream_id": stream_id, "type": "error", "message": str(e)})
+            except Exception:
+                pass
+        finally:
+            if segments:
+                await segments.close()
+            streams.pop(stream_id, None)
+
+    try:
+        while True:
+            msg = json.loads(await websocket.receive_text())
+            stream_id = msg.get("stream_id")
+            command = msg.get("command")
+            if not stream_id:
+                await send({"type": "error", "message": "stream_id is required"})
+                continue
+
+            if command == "start":
+                if stream_id in streams:
+                    await send({"stream_id": stream_id, "type": "error", "message": "stream already started"})
+                    continue
+                cancel_event = threading.Event()
+                task = asyncio.create_task(run_stream(stream_id, cancel_event, msg))
+                streams[stream_id] = (cancel_event, task)
+
+            elif command == "cancel":
+                # The stream's task stays tracked until it finishes and removes itself
+                entry = streams.get(stream_id)
+                if entry:
+                    entry[0].set()
+                await send({"stream_id": stream_id, "type": "cancelled", "text": "Transcription manually cancelled"})
+
+    except WebSocketDisconnect:
+        print("🔌 Multiplexed STT client disconnected")
+    except Exception as e:
+        print(f"❌ STT Error: {e}")
+    finally:
+        # Cleanup: stop every transcription riding on this connection
+        tasks = []
+        for cancel_event, task in list(streams.values()):
+            cancel_event.set()
+            task.cancel()
+            tasks.append(task)
+        await asyncio.gather(*tasks, return_exceptions=True)
+        streams.clear()
+
+
+@app.get("/endpointer/stats")
+async def endpointer_stats():
+    """Per question type: turns ended, average closing silence and time saved vs the fixed wait."""
+    return endpoint_stats.snapshot()
@@ -0,0 +1,102 @@
+"""
+Run from stt_service/:
+    python -m pytest tests
+"""
+import asyncio
+import numpy as np
+import pytest
+from fastapi.testclient import TestClient
+from speechmatics.models import ServerMessageType
+import stt_handler1
+import stt_microservice
+from stt_handler1 import STTTranscriber
+
+
+class FakeRecognizer:
+    """Stands in for the Speechmatics client: reads the whole stream, then reports its size as the transcript."""
+
+    runs = []
+
+    def __init__(self, connection_settings):
+        self.handlers = {}
+        self.audio = bytearray()
+
+    def add_event_handler(self, event, handler):
+        self.handlers[event] = handler
+
+    async def run(self, stream, conf, audio_settings):
+        FakeRecognizer.runs.append((self, audio_settings))
+        while chunk := await stream.read(audio_settings.chunk_size):
+            self.audio += chunk
+        self.handlers[ServerMessageType.AddTranscript]({"metadata": {"transcript": f"{len(self.audio)} bytes"}})
+
+
+@pytest.fixture
+def recognizer(monkeypatch):
+    FakeRecognizer.runs = []
+    monkeypatch.setattr(stt_handler1.speechmatics.client, "WebsocketClient", FakeRecognizer)
+    return FakeRecognizer
+
+
+def tone(samples, dtype, amplitude=0.5):
+    wave = amplitude * np.sin(np.linspace(0, 200 * np.pi, samples))
+    return (wave * 32767).astype(np.int16).tobytes() if dtype == np.int16 else wave.astype(np.float32).tobytes()
+
+
+def test_client_audio_settings_are_validated():
+    transcriber = STTTranscriber(4)
+    with pytest.raises(ValueError, match="encoding"):
+        transcriber.use_client_audio("opus", 16000)
+    with pytest.raises(ValueError, match="sample_rate"):
+        transcriber.use_client_audio("pcm_s16le", 44100)
+
+
+@pytest.mark.parametrize("encoding, dtype", [("pcm_s16le", np.int16), ("pcm_f32le", np.float32)])
+def test_feed_reaches_the_vad_and_the_recognizer(recognizer, encoding, dtype):
+    transcriber = STTTranscriber(4)
+    transcriber.use_client_audio(encoding, 16000)
+    assert transcriber.sample_width == np.dtype(dtype).itemsize
+    block = tone(480 * 10, dtype)  # 300 ms
+
+    async def run():
+        task = asyncio.create_task(transcriber.run_transcription_async())
+        for _ in range(3):
+            assert transcriber.feed(block)
+            await asyncio.sleep(0)
+        transcriber.stop()
+        return await task
+
+    assert asyncio.run(run()) == f"{3 * len(block)} bytes"
+    assert transcriber.vad_monitor.frames == 30 and transcriber.vad_monitor.speech_detected
+    (_, settings), = recognizer.runs
+    assert (settings.encoding, settings.sample_rate) == (encoding, 16000)
+
+
+def test_ws_client_audio_until_end(recognizer):
+    client = TestClient(stt_microservice.app)
+    with client.websocket_connect("/ws/transcribe") as ws:
+        ws.send_json({"encoding": "pcm_s16le", "sample_rate": 16000})
+        for _ in range(4):
+            ws.send_bytes(bytes(960))
+        ws.send_json({"command": "end"})
+        assert ws.receive_json() == {"type": "done", "text": f"{4 * 960} bytes"}
+    (_, settings), = recognizer.runs
+    assert (settings.encoding, settings.sample_rate) == ("pcm_s16le", 16000)
+
+
+def test_ws_rejects_frames_that_are_not_whole_samples(recognizer):
+    client = TestClient(stt_microservice.app)
+    with client.websocket_connect("/ws/transcribe") as ws:
+        ws.send_json({"encoding": "pcm_f32le", "sample_rate": 16000})
+        ws.send_bytes(bytes(6))
+        reply = ws.receive_json()
+    assert reply["type"] == "error" and "not whole pcm_f32le samples" in reply["message"]
+
+
+def test_ws_rejects_unsupported_audio_settings(recognizer):
+    client = TestClient(stt_microservice.app)
+    with client.websocket_connect("/ws/transcribe") as ws:
+        ws.send_json({"encoding": "pcm_s16le", "sample_rate": 22050})
+        reply = ws.receive_json()
+    assert reply["type"] == "error" and "sample_rate" in reply["message"]
+    assert recognizer.runs == []
@@ -0,0 +1,95 @@
+import pytest
+import endpointer
+from endpointer import LEGACY_STOP_DURATION, EndpointStats, Endpointer
+from vad import FRAME_MS
+
+
+class FakeVAD:
+    def __init__(self, silence=0.0, pauses=(), speech_detected=True, frames=1000):
+        self.silence = silence
+        self.pauses = list(pauses)
+        self.speech_detected = speech_detected
+        self.frames = frames
+
+    def silence_seconds(self):
+        return self.silence
+
+
+@pytest.fixture(autouse=True)
+def fresh_stats(monkeypatch):
+    monkeypatch.setattr(endpointer, "endpoint_stats", EndpointStats())
+
+
+def settled(point, text, final=True):
+    """Transcript that has not changed for a second of audio."""
+    (point.on_final if final else point.on_partial)(text)
+    point.frames = point.changed_at_frame + int(1.0 * 1000 / FRAME_MS)
+
+
+def test_initial_silence_until_pauses_are_known():
+    point = Endpointer("main")
+    assert point.required_silence(FakeVAD()) == (2.0, "initial")
+
+
+def test_sentence_end_shortens_and_trailing_word_lengthens():
+    point = Endpointer("main")
+    settled(point, "And that is how we shipped it.")
+    assert point.required_silence(FakeVAD()) == (pytest.approx(1.2), "initial+sentence_end")
+
+    point = Endpointer("main")
+    settled(point, "We shipped it and", final=False)
+    assert point.required_silence(FakeVAD()) == (pytest.approx(3.0), "initial+trailing")
+
+
+def test_unsettled_sentence_end_does_not_shorten():
+    point = Endpointer("main")
+    point.on_final("We shipped it.")
+    assert point.required_silence(FakeVAD())[1] == "initial"
+
+
+def test_speaker_pause_profile_within_bounds():
+    point = Endpointer("followup")
+    required, reason = point.required_silence(FakeVAD(pauses=[0.3, 0.4, 0.5, 0.6, 0.8]))
+    assert reason == "pause_profile" and required == pytest.approx(0.8 * 1.3)
+
+    required, _ = point.required_silence(FakeVAD(pauses=[2.5] * 6))
+    assert required == 3.0  # clamped to the follow-up profile's max_silence
+
+
+def test_from_config_keeps_stop_duration_as_upper_bound():
+    point = Endpointer.from_config({"question_type": "followup", "stop_duration": 2.5})
+    assert point.max_silence == 2.5 and point.min_silence == 0.7
+
+
+def test_no_end_before_speech_or_below_min_silence():
+    point = Endpointer("main")
+    assert not point.is_complete(FakeVAD(silence=5.0, speech_detected=False))
+    assert not point.is_complete(FakeVAD(silence=0.5))
+
+
+def test_stats_keyed_by_profile_and_saving_against_legacy_wait():
+    for question_type in ("followup", "followup", "not-a-profile"):
+        assert Endpointer(question_type).is_complete(FakeVAD(silence=2.0))
+
+    snapshot = endpointer.endpoint_stats.snapshot()
+    assert set(snapshot) == {"followup", "main"}
+    assert snapshot["followup"]["turns"] == 2
+    assert snapshot["followup"]["avg_saved_seconds"] == pytest.approx(LEGACY_STOP_DURATION - 2.0)
+    assert snapshot["main"]["reasons"] == {"initial": 1}
+
+
+def test_near_end_reported_once_per_pause():
+    point = Endpointer("main")  # 2.0s initial silence; reported from 1.2s
+    assert not point.near_end(FakeVAD(silence=1.0))
+    assert point.near_end(FakeVAD(silence=1.3))
+    assert not point.near_end(FakeVAD(silence=1.6))
+
+    assert not point.near_end(FakeVAD(silence=0.0))  # speech again
+    assert point.near_end(FakeVAD(silence=1.4))
+
+
+def test_near_end_not_reported_after_the_answer_ended():
+    point = Endpointer("main")
+    vad = FakeVAD(silence=2.5)
+    assert point.is_complete(vad)
+    assert not point.near_end(vad)
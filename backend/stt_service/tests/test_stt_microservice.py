@@ -0,0 +1,69 @@
+import threading
+import pytest
+from fastapi import FastAPI, WebSocket
+from fastapi.testclient import TestClient
+import stt_microservice
+
+
+class BlockingTranscriber:
+    """Stands in for STTTranscriber on the server microphone path: blocks until released."""
+
+    started = threading.Event()
+    release = threading.Event()
+
+    def __init__(self, silence_duration, max_wait=None, cancel_event=None, endpointer=None, on_segment=None):
+        self.cancel_event = cancel_event
+
+    def run_transcription(self):
+        self.started.set()
+        self.release.wait(5)
+        return "late transcript"
+
+
+events = []
+
+
+class RecordingForwarder(stt_microservice.SegmentForwarder):
+    async def close(self):
+        events.append("stream closed")
+        await super().close()
+
+
+@pytest.fixture
+def blocking(monkeypatch):
+    BlockingTranscriber.started.clear()
+    BlockingTranscriber.release.clear()
+    events.clear()
+    monkeypatch.setattr(stt_microservice, "STTTranscriber", BlockingTranscriber)
+    monkeypatch.setattr(stt_microservice, "SegmentForwarder", RecordingForwarder)
+    yield BlockingTranscriber
+    BlockingTranscriber.release.set()
+
+
+def test_mux_disconnect_cancels_and_awaits_running_streams(blocking):
+    app = FastAPI()
+    returned = threading.Event()
+
+    @app.websocket("/mux")
+    async def mux(websocket: WebSocket):
+        await stt_microservice.transcribe_mux_websocket(websocket)
+        events.append("handler returned")
+        returned.set()
+
+    with TestClient(app).websocket_connect("/mux") as ws:
+        ws.send_json({"stream_id": "s1", "command": "start", "stream_transcripts": True})
+        assert blocking.started.wait(2)
+        ws.close()
+        assert returned.wait(2)
+    # The transcription thread is still blocked, yet its stream was torn down before the handler returned
+    assert not blocking.release.is_set()
+    assert events == ["stream closed", "handler returned"]
+
+
+def test_mux_cancel_reports_cancelled_without_a_done(blocking):
+    client = TestClient(stt_microservice.app)
+    with client.websocket_connect("/ws/transcribe/mux") as ws:
+        ws.send_json({"stream_id": "s1", "command": "start"})
+        assert blocking.started.wait(2)
+        ws.send_json({"stream_id": "s1", "command": "cancel"})
+        assert ws.receive_json() == {"stream_id": "s1", "type": "cancelled", "text": "Transcription manually cancelled"}
@@ -0,0 +1,83 @@
+import numpy as np
+import pytest
+from vad import FRAME_MS, VADMonitor
+
+RATE = 16000
+FRAME = RATE * FRAME_MS // 1000
+
+
+class LoudIsSpeech:
+    """Stands in for webrtcvad: a frame is speech when its peak is loud."""
+
+    def __init__(self):
+        self.frames = 0
+
+    def is_speech(self, frame, sample_rate):
+        self.frames += 1
+        return np.abs(np.frombuffer(frame, dtype=np.int16)).max() > 8000
+
+
+def monitor(dtype=np.float32, **kwargs):
+    vad = VADMonitor(sample_rate=RATE, dtype=dtype, **kwargs)
+    vad.vad = LoudIsSpeech()
+    return vad
+
+
+def signal(*pattern):
+    """Float32 audio from (frames, amplitude) pairs."""
+    return np.concatenate([np.full(frames * FRAME, amplitude, dtype=np.float32) for frames, amplitude in pattern])
+
+
+def feed(vad, audio, block_samples):
+    data = audio.astype(vad.dtype) if vad.dtype == np.float32 else (audio * 32767).astype(np.int16)
+    for start in range(0, len(data), block_samples):
+        vad.process(data[start:start + block_samples].tobytes())
+
+
+def test_silence_is_gated_before_webrtcvad():
+    vad = monitor()
+    feed(vad, signal((50, 0.0), (10, 0.001)), block_samples=320)
+    assert vad.stats()["frames"] == 60 and vad.stats()["gated"] == 60
+    assert vad.vad.frames == 0
+    assert not vad.speech_detected
+
+
+@pytest.mark.parametrize("block_samples", [160, 320, 480, 960, 1000])
+def test_every_frame_is_classified_whatever_the_block_size(block_samples):
+    vad = monitor()
+    feed(vad, signal((5, 0.0), (20, 0.5), (40, 0.0)), block_samples)
+    assert vad.frames == 65
+    assert vad.voiced == 20
+    assert vad.speech_detected
+    assert vad.silence_seconds() == pytest.approx(40 * FRAME_MS / 1000)
+
+
+def test_int16_and_float32_blocks_agree():
+    audio = signal((5, 0.0), (10, 0.5), (10, 0.0))
+    results = []
+    for dtype in (np.float32, np.int16):
+        vad = monitor(dtype=dtype)
+        feed(vad, audio, block_samples=480)
+        results.append((vad.frames, vad.gated, vad.voiced))
+    assert results[0] == results[1]
+
+
+def test_onset_ignores_short_clicks():
+    vad = monitor()
+    feed(vad, signal((2, 0.5), (20, 0.0)), block_samples=480)
+    assert not vad.speech_detected
+    feed(vad, signal((3, 0.5)), block_samples=480)
+    assert vad.speech_detected and vad.in_speech
+
+
+def test_hangover_bridges_short_gaps_and_pauses_are_recorded():
+    vad = monitor()
+    feed(vad, signal((5, 0.5), (3, 0.0)), block_samples=480)
+    assert vad.in_speech and vad.silence_seconds() == 0.0  # 90ms gap, still speaking
+
+    feed(vad, signal((5, 0.5), (8, 0.0), (5, 0.5), (12, 0.0)), block_samples=480)
+    assert not vad.in_speech
+    assert vad.is_sustained_silence(0.3)
+    assert not vad.is_sustained_silence(0.5)
+    # 90ms is between words; 240ms counts as a pause
+    assert list(vad.pauses) == [pytest.approx(0.24)]
@@ -0,0 +1,124 @@
+from collections import deque
+import numpy as np
+import webrtcvad
+
+FRAME_MS = 30
+# Frames quieter than this are silence without asking webrtcvad (room noise, muted mic)
+ENERGY_GATE_DBFS = -50.0
+# Consecutive voiced frames before speech counts as started (filters clicks and pops)
+ONSET_FRAMES = 3
+# Speech state is held this long after the last voiced frame (bridges gaps between words)
+HANGOVER_MS = 300
+# Gaps shorter than this are between words, not pauses
+MIN_PAUSE_MS = 150
+
+
+class VADMonitor:
+    """
+    Voice activity over a continuous stream of blocks of any size. Each block is
+    converted to 16-bit PCM and split into 30ms frames in preallocated buffers,
+    and every frame is classified: an energy gate first, then webrtcvad. The raw
+    decisions are smoothed with an onset count and a hangover, and silence is
+    measured in audio time from the last voiced frame.
+    """
+
+    def __init__(self, sample_rate=16000, dtype=np.float32, aggressiveness=3, energy_gate_dbfs=ENERGY_GATE_DBFS,
+                 onset_frames=ONSET_FRAMES, hangover_ms=HANGOVER_MS):
+        self.vad = webrtcvad.Vad(aggressiveness)
+        self.sample_rate = sample_rate
+        self.dtype = np.dtype(dtype)
+        self.frame_samples = sample_rate * FRAME_MS // 1000
+        # Energy gate as a sum of squares over one frame, so no per-frame mean is needed
+        self.gate = self.frame_samples * (32768.0 * 10 ** (energy_gate_dbfs / 20)) ** 2
+        self.onset_frames = onset_frames
+        self.hangover_frames = max(1, hangover_ms // FRAME_MS)
+
+        self._pcm = np.zeros(0, dtype=np.int16)      # carried samples + current block, as 16-bit PCM
+        self._level = np.zeros(0, dtype=np.float32)  # the same samples as float, for the energy gate
+        self._carry = 0
+
+        self.speech_detected = False  # any speech so far in this answer
+        self.in_speech = False        # smoothed state of the latest frame
+        self.voiced_run = 0
+        self.unvoiced_run = 0
+        self.frames = 0
+        self.gated = 0
+        self.voiced = 0
+        self.pauses = deque(maxlen=100)  # seconds of each pause between stretches of speech
+
+    def _reserve(self, samples):
+        if len(self._pcm) < samples:
+            size = 1 << (samples - 1).bit_length()
+            pcm, level = np.zeros(size, dtype=np.int16), np.zeros(size, dtype=np.float32)
+            pcm[:self._carry] = self._pcm[:self._carry]
+            level[:self._carry] = self._level[:self._carry]
+            self._pcm, self._level = pcm, level
+
+    def process(self, block):
+        """Classify every complete frame in `block` (raw bytes in this monitor's sample format)."""
+        samples = np.frombuffer(block, dtype=self.dtype)
+        total = self._carry + len(samples)
+        self._reserve(total)
+        pcm, level = self._pcm[self._carry:total], self._level[self._carry:total]
+        if self.dtype == np.int16:
+            pcm[:] = samples
+            np.copyto(level, samples)
+        else:
+            np.multiply(samples, 32768.0, out=level)
+            np.minimum(np.maximum(level, -32768.0, out=level), 32767.0, out=level)
+            np.copyto(pcm, level, casting="unsafe")  # truncates, same as astype(np.int16)
+
+        count = total // self.frame_samples
+        used = count * self.frame_samples
+        if count:
+            frames = self._pcm[:used].reshape(count, self.frame_samples)
+            levels = self._level[:used].reshape(count, self.frame_samples)
+            energy = np.einsum("ij,ij->i", levels, levels)
+            # Only frames above the energy gate reach webrtcvad
+            for i, loud in enumerate((energy >= self.gate).tolist()):
+                if loud:
+                    self._update(self.vad.is_speech(frames[i].tobytes(), self.sample_rate))
+                else:
+                    self.gated += 1
+                    self._update(False)
+
+        # Keep the incomplete tail for the next block
+        self._carry = total - used
+        self._pcm[:self._carry] = self._pcm[used:total]
+        self._level[:self._carry] = self._level[used:total]
+
+    def _update(self, voiced):
+        self.frames += 1
+        if voiced:
+            self.voiced += 1
+            if self.speech_detected and self.unvoiced_run * FRAME_MS >= MIN_PAUSE_MS:
+                self.pauses.append(self.unvoiced_run * FRAME_MS / 1000)
+            self.voiced_run += 1
+            self.unvoiced_run = 0
+            if not self.in_speech and self.voiced_run >= self.onset_frames:
+                if not self.speech_detected:
+                    print("🗣️ Speech detected")
+                self.in_speech = True
+                self.speech_detected = True
+        else:
+            self.voiced_run = 0
+            self.unvoiced_run += 1
+            if self.in_speech and self.unvoiced_run >= self.hangover_frames:
+                self.in_speech = False
+
+    def silence_seconds(self):
+        """Audio time since the last voiced frame, once speech has started and ended."""
+        if not self.speech_detected or self.in_speech:
+            return 0.0
+        return self.unvoiced_run * FRAME_MS / 1000
+
+    def is_sustained_silence(self, duration):
+        return self.speech_detected and self.silence_seconds() >= duration
+
+    def stats(self):
+        return {
+            "frames": self.frames,
+            "gated": self.gated,
+            "voiced": self.voiced,
+            "audio_seconds": round(self.frames * FRAME_MS / 1000, 2),
+        }